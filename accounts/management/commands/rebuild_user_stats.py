@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from accounts import stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute the dashboard statistics of every user'
+
+    def handle(self, *args, **options):
+        count = stats.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt statistics for {count} users.'))
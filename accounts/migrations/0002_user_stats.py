@@ -0,0 +1,94 @@
+# Generated by Django 4.2.30 on 2026-10-18 15:35
+
+from django.conf import settings
+import django.core.serializers.json
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserStats",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="stats",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "profile_completion",
+                    models.PositiveSmallIntegerField(
+                        default=0, verbose_name="Profile Completion"
+                    ),
+                ),
+                (
+                    "has_cv",
+                    models.BooleanField(default=False, verbose_name="CV Uploaded"),
+                ),
+                (
+                    "applications_total",
+                    models.PositiveIntegerField(default=0, verbose_name="Applications"),
+                ),
+                (
+                    "applications_pending",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Pending Applications"
+                    ),
+                ),
+                (
+                    "application_counts",
+                    models.JSONField(
+                        default=dict, verbose_name="Applications by Status"
+                    ),
+                ),
+                (
+                    "documents_total",
+                    models.PositiveIntegerField(default=0, verbose_name="Documents"),
+                ),
+                (
+                    "documents_ready",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Ready Documents"
+                    ),
+                ),
+                (
+                    "emails_sent",
+                    models.PositiveIntegerField(default=0, verbose_name="Emails Sent"),
+                ),
+                (
+                    "emails_responded",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Emails Answered"
+                    ),
+                ),
+                (
+                    "resumes_total",
+                    models.PositiveIntegerField(default=0, verbose_name="Resumes"),
+                ),
+                (
+                    "recent_activity",
+                    models.JSONField(
+                        default=list,
+                        encoder=django.core.serializers.json.DjangoJSONEncoder,
+                        verbose_name="Recent Activity",
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "User Statistics",
+                "verbose_name_plural": "User Statistics",
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-18 16:14
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0002_user_stats"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="userstats",
+            name="recent_applications",
+            field=models.JSONField(
+                default=list,
+                encoder=django.core.serializers.json.DjangoJSONEncoder,
+                verbose_name="Recently Updated Applications",
+            ),
+        ),
+    ]
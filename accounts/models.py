@@ -1,4 +1,5 @@
 from django.contrib.auth.models import AbstractUser
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
@@ -116,4 +117,52 @@ class UserProfile(models.Model):
     
     class Meta:
         verbose_name = _('User Profile')
-        verbose_name_plural = _('User Profiles')
\ No newline at end of file
+        verbose_name_plural = _('User Profiles')
+
+
+class UserStats(models.Model):
+    """
+    Denormalized dashboard figures for one user, kept current by ``accounts.stats``
+    """
+    user = models.OneToOneField(KurdishUser, on_delete=models.CASCADE, primary_key=True, related_name='stats')
+    
+    # Profile
+    profile_completion = models.PositiveSmallIntegerField(default=0, verbose_name=_('Profile Completion'))
+    has_cv = models.BooleanField(default=False, verbose_name=_('CV Uploaded'))
+    
+    # Applications and their documents
+    applications_total = models.PositiveIntegerField(default=0, verbose_name=_('Applications'))
+    applications_pending = models.PositiveIntegerField(default=0, verbose_name=_('Pending Applications'))
+    application_counts = models.JSONField(default=dict, verbose_name=_('Applications by Status'))
+    recent_applications = models.JSONField(default=list, encoder=DjangoJSONEncoder,
+                                           verbose_name=_('Recently Updated Applications'))
+    documents_total = models.PositiveIntegerField(default=0, verbose_name=_('Documents'))
+    documents_ready = models.PositiveIntegerField(default=0, verbose_name=_('Ready Documents'))
+    
+    # Communication
+    emails_sent = models.PositiveIntegerField(default=0, verbose_name=_('Emails Sent'))
+    emails_responded = models.PositiveIntegerField(default=0, verbose_name=_('Emails Answered'))
+    
+    resumes_total = models.PositiveIntegerField(default=0, verbose_name=_('Resumes'))
+    recent_activity = models.JSONField(default=list, encoder=DjangoJSONEncoder, verbose_name=_('Recent Activity'))
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"Stats of {self.user_id}"
+    
+    @property
+    def document_readiness(self):
+        if not self.documents_total:
+            return None
+        return round(100 * self.documents_ready / self.documents_total)
+    
+    @property
+    def response_rate(self):
+        if not self.emails_sent:
+            return None
+        return round(100 * self.emails_responded / self.emails_sent)
+    
+    class Meta:
+        verbose_name = _('User Statistics')
+        verbose_name_plural = _('User Statistics')
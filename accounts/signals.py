@@ -0,0 +1,23 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import stats
+from .models import KurdishUser, UserProfile
+
+
+@receiver(post_save, sender=KurdishUser)
+def update_profile_stats(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    # Logging in only touches last_login
+    if raw or (update_fields and set(update_fields) <= {'last_login'}):
+        return
+    if created:
+        stats.refresh_on_commit([instance.pk])
+    else:
+        stats.refresh_on_commit([instance.pk], 'profile')
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def update_profile_stats_for_profile(sender, instance, raw=False, **kwargs):
+    if not raw:
+        stats.refresh_on_commit([instance.user_id], 'profile')
@@ -0,0 +1,297 @@
+"""
+Materialized per-user statistics for the dashboard.
+
+Each ``UserStats`` row is split into sections (``SECTIONS``), and each
+section is computed by one grouped query that works for one user or many.
+The signals of ``accounts``, ``communications`` and ``resume_builder`` call
+``refresh_on_commit`` with the user and the sections a write affects, so a
+saved email only recounts that user's emails. The refresh runs after the
+transaction commits and so always sees the rows other transactions
+committed as well. The dashboard then reads its figures from a single row.
+
+The dashboard's recently updated applications are stored with their
+university and country names, so renaming a university or country
+refreshes the applications section of the users who applied there.
+
+``bulk_create`` and ``update()`` send no signals; code using them for a
+user's rows calls ``refresh_on_commit`` itself. ``rebuild`` (the
+``rebuild_user_stats`` command) recomputes every row.
+"""
+import datetime
+from dataclasses import dataclass
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.translation import gettext as _
+
+from communications.dashboard import PENDING_STATUSES
+from communications.models import ApplicationDocument, ApplicationTracker, EmailLog
+from resume_builder.models import Resume
+
+from .models import KurdishUser, UserStats
+
+
+SECTIONS = ('profile', 'applications', 'documents', 'emails', 'resumes', 'activity')
+
+# Entries kept in UserStats.recent_activity and UserStats.recent_applications
+RECENT_ACTIVITY = 8
+RECENT_APPLICATIONS = 5
+
+READY_DOCUMENT_STATUSES = ('ready', 'submitted')
+
+BATCH_SIZE = 500
+
+
+def profile_completion(user):
+    """
+    Percentage of the ten important user and profile fields that are filled in
+    """
+    fields = [user.kurdish_name, user.region, user.field_of_study, user.phone_number, user.current_city]
+    profile = getattr(user, 'profile', None)
+    if profile is not None:
+        fields += [profile.biography, profile.cv_document, profile.work_experience, profile.technical_skills,
+                   profile.language_skills]
+    return sum(1 for value in fields if value) * 10
+
+
+def profile_section(user_ids):
+    sections = {}
+    for user in KurdishUser.objects.filter(pk__in=user_ids).select_related('profile'):
+        profile = getattr(user, 'profile', None)
+        sections[user.pk] = {
+            'profile_completion': profile_completion(user),
+            'has_cv': bool(profile is not None and profile.cv_document),
+        }
+    return sections
+
+
+def applications_section(user_ids):
+    statuses = [status for status, label in ApplicationTracker.APPLICATION_STATUS]
+    rows = (
+        ApplicationTracker.objects.filter(user_id__in=user_ids).order_by().values('user_id')
+        .annotate(**{status: Count('pk', filter=Q(status=status)) for status in statuses})
+    )
+    recent = {}
+    latest = _latest(
+        ApplicationTracker.objects.filter(user_id__in=user_ids), 'updated_at',
+        ['pk', 'application_title', 'status', 'application_deadline', 'university__name', 'university__city',
+         'university__country__name'],
+        limit=RECENT_APPLICATIONS,
+    )
+    for row in sorted(latest, key=lambda row: (row['updated_at'], row['pk']), reverse=True):
+        recent.setdefault(row['user_id'], []).append({
+            'pk': row['pk'], 'title': row['application_title'], 'status': row['status'],
+            'deadline': row['application_deadline'], 'university': row['university__name'],
+            'city': row['university__city'], 'country': row['university__country__name'],
+        })
+    sections = {}
+    for row in rows:
+        counts = {status: row[status] for status in statuses if row[status]}
+        sections[row['user_id']] = {
+            'applications_total': sum(counts.values()),
+            'applications_pending': sum(counts.get(status, 0) for status in PENDING_STATUSES),
+            'application_counts': counts,
+            'recent_applications': recent.get(row['user_id'], []),
+        }
+    return sections
+
+
+def documents_section(user_ids):
+    rows = (
+        ApplicationDocument.objects.filter(application__user_id__in=user_ids).order_by()
+        .values('application__user_id')
+        .annotate(total=Count('pk'), ready=Count('pk', filter=Q(status__in=READY_DOCUMENT_STATUSES)))
+    )
+    return {
+        row['application__user_id']: {'documents_total': row['total'], 'documents_ready': row['ready']} for row in rows
+    }
+
+
+def emails_section(user_ids):
+    rows = (
+        EmailLog.objects.filter(user_id__in=user_ids, status=EmailLog.STATUS_SENT).order_by().values('user_id')
+        .annotate(sent=Count('pk'), responded=Count('pk', filter=Q(response_received=True)))
+    )
+    return {row['user_id']: {'emails_sent': row['sent'], 'emails_responded': row['responded']} for row in rows}
+
+
+def resumes_section(user_ids):
+    rows = Resume.objects.filter(user_id__in=user_ids).order_by().values('user_id').annotate(total=Count('pk'))
+    return {row['user_id']: {'resumes_total': row['total']} for row in rows}
+
+
+def _latest(queryset, date_field, fields, limit=RECENT_ACTIVITY):
+    """
+    The ``limit`` newest rows of ``queryset`` per user, as dicts
+    """
+    return queryset.annotate(
+        position=Window(RowNumber(), partition_by=F('user_id'), order_by=[F(date_field).desc(), F('pk').desc()]),
+    ).filter(position__lte=limit).values('user_id', date_field, *fields)
+
+
+def activity_section(user_ids):
+    events = {user_id: [] for user_id in user_ids}
+    trackers = _latest(ApplicationTracker.objects.filter(user_id__in=user_ids), 'updated_at', ['application_title', 'status'])
+    for row in trackers:
+        events[row['user_id']].append({
+            'kind': 'application', 'title': row['application_title'], 'detail': row['status'], 'at': row['updated_at'],
+        })
+    emails = _latest(
+        EmailLog.objects.filter(user_id__in=user_ids, status=EmailLog.STATUS_SENT), 'sent_date',
+        ['subject', 'recipient_name', 'recipient_email'],
+    )
+    for row in emails:
+        events[row['user_id']].append({
+            'kind': 'email', 'title': row['subject'], 'detail': row['recipient_name'] or row['recipient_email'],
+            'at': row['sent_date'],
+        })
+    resumes = _latest(Resume.objects.filter(user_id__in=user_ids), 'updated_at', ['title'])
+    for row in resumes:
+        events[row['user_id']].append({'kind': 'resume', 'title': row['title'], 'detail': '', 'at': row['updated_at']})
+    return {
+        user_id: {'recent_activity': sorted(items, key=lambda item: item['at'], reverse=True)[:RECENT_ACTIVITY]}
+        for user_id, items in events.items()
+    }
+
+
+SECTION_BUILDERS = {
+    'profile': profile_section,
+    'applications': applications_section,
+    'documents': documents_section,
+    'emails': emails_section,
+    'resumes': resumes_section,
+    'activity': activity_section,
+}
+
+
+def _defaults(section):
+    """
+    Values of ``section``'s fields for a user without any rows
+    """
+    fields = {
+        'profile': ['profile_completion', 'has_cv'],
+        'applications': ['applications_total', 'applications_pending', 'application_counts', 'recent_applications'],
+        'documents': ['documents_total', 'documents_ready'],
+        'emails': ['emails_sent', 'emails_responded'],
+        'resumes': ['resumes_total'],
+        'activity': ['recent_activity'],
+    }[section]
+    return {name: UserStats._meta.get_field(name).get_default() for name in fields}
+
+
+def compute(user_ids, sections=SECTIONS):
+    """
+    Field values of ``sections`` for each of ``user_ids``
+    """
+    user_ids = list(user_ids)
+    values = {user_id: {} for user_id in user_ids}
+    for section in sections:
+        computed = SECTION_BUILDERS[section](user_ids)
+        defaults = _defaults(section)
+        for user_id in user_ids:
+            values[user_id].update(computed.get(user_id, defaults))
+    return values
+
+
+def refresh(user_ids, *sections):
+    """
+    Recompute ``sections`` (default: all) of the users' rows, creating missing rows
+    """
+    sections = sections or SECTIONS
+    user_ids = list(user_ids)
+    now = timezone.now()
+    for start in range(0, len(user_ids), BATCH_SIZE):
+        values = compute(user_ids[start:start + BATCH_SIZE], sections)
+        existing = set(UserStats.objects.filter(user_id__in=values).values_list('user_id', flat=True))
+        # Users deleted since the refresh was scheduled have no row to create
+        missing = list(KurdishUser.objects.filter(pk__in=[user_id for user_id in values if user_id not in existing])
+                       .values_list('pk', flat=True))
+        if missing:
+            # New rows need every section, not just the ones asked for
+            complete = compute(missing) if set(sections) != set(SECTIONS) else values
+            UserStats.objects.bulk_create(
+                [UserStats(user_id=user_id, updated_at=now, **complete[user_id]) for user_id in missing],
+                ignore_conflicts=True,
+            )
+        updates = [UserStats(user_id=user_id, updated_at=now, **values[user_id]) for user_id in existing]
+        if updates:
+            fields = list(next(iter(values.values())))
+            UserStats.objects.bulk_update(updates, fields + ['updated_at'])
+
+
+def refresh_on_commit(user_ids, *sections):
+    """
+    ``refresh`` once the current transaction commits (at once outside of one)
+    """
+    user_ids = {user_id for user_id in user_ids if user_id is not None}
+    if user_ids:
+        transaction.on_commit(lambda: refresh(user_ids, *sections))
+
+
+def rebuild():
+    """
+    Recompute the statistics of every user; returns the number of rows
+    """
+    user_ids = list(KurdishUser.objects.order_by('pk').values_list('pk', flat=True))
+    refresh(user_ids)
+    return len(user_ids)
+
+
+def for_user(user):
+    """
+    ``user``'s statistics, computed on first use for users created before they existed
+    """
+    stats = UserStats.objects.filter(user=user).first()
+    if stats is None:
+        refresh([user.pk])
+        stats = UserStats.objects.get(user=user)
+    return stats
+
+
+@dataclass(frozen=True)
+class Activity:
+    kind: str
+    title: str
+    detail: str
+    created_at: datetime.datetime
+
+    @property
+    def description(self):
+        if self.kind == 'application':
+            status = dict(ApplicationTracker.APPLICATION_STATUS).get(self.detail, self.detail)
+            return _('Application %(title)s: %(status)s') % {'title': self.title, 'status': status}
+        if self.kind == 'email':
+            return _('Email to %(recipient)s: %(subject)s') % {'recipient': self.detail, 'subject': self.title}
+        return _('Resume %(title)s updated') % {'title': self.title}
+
+
+def activities(stats):
+    return [
+        Activity(item['kind'], item['title'], item['detail'], parse_datetime(item['at']))
+        for item in stats.recent_activity
+    ]
+
+
+@dataclass(frozen=True)
+class RecentApplication:
+    pk: int
+    title: str
+    status: str
+    deadline: datetime.date
+    university: str
+    city: str
+    country: str
+
+    @property
+    def status_display(self):
+        return dict(ApplicationTracker.APPLICATION_STATUS).get(self.status, self.status)
+
+
+def recent_applications(stats):
+    return [
+        RecentApplication(**dict(item, deadline=parse_date(item['deadline']) if item['deadline'] else None))
+        for item in stats.recent_applications
+    ]
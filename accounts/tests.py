@@ -1,3 +1,120 @@
-from django.test import TestCase
+import datetime
+from io import StringIO
 
-# Create your tests here.
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+
+from communications.models import ApplicationDocument, ApplicationTracker, EmailLog
+from destinations import recommendations
+from destinations.models import Country, StudyProgram, University
+from resume_builder.models import Resume
+
+from . import stats
+from .models import KurdishUser, UserProfile, UserStats
+from .views import DashboardView
+
+
+def create_university():
+    country = Country.objects.create(
+        code='DEU', name='Germany', description='Germany', official_language='German', currency='EUR',
+    )
+    return University.objects.create(
+        country=country, name='University', city='Berlin', university_type='public', instruction_languages='German'
+    )
+
+
+class UserStatsTests(TestCase):
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user = KurdishUser.objects.create_user(
+                username='student', password='secret', region='bashur', field_of_study='Hydrology',
+            )
+        self.university = create_university()
+
+    def stats(self):
+        return UserStats.objects.get(user=self.user)
+
+    def test_created_with_the_user(self):
+        self.assertEqual(self.stats().profile_completion, 20)
+        self.assertEqual(self.stats().applications_total, 0)
+
+    def test_kept_current_by_signals(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            application = ApplicationTracker.objects.create(
+                user=self.user, university=self.university, application_title='MSc Hydrology',
+            )
+            ApplicationDocument.objects.create(application=application, document_type='cv', title='CV', status='ready')
+            ApplicationDocument.objects.create(application=application, document_type='transcript', title='Transcript')
+            EmailLog.objects.create(
+                user=self.user, application=application, email_type='inquiry', recipient_email='prof@example.com',
+                subject='PhD position', body='Hello', response_received=True,
+            )
+            UserProfile.objects.create(user=self.user, cv_document='cvs/cv.pdf')
+            Resume.objects.create(user=self.user, title='Main', full_name='Student', email='student@example.com')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            application.status = 'submitted'
+            application.save()
+
+        stats_row = self.stats()
+        self.assertEqual(stats_row.application_counts, {'submitted': 1})
+        self.assertEqual((stats_row.applications_total, stats_row.applications_pending), (1, 1))
+        self.assertEqual((stats_row.documents_total, stats_row.documents_ready, stats_row.document_readiness), (2, 1, 50))
+        self.assertEqual((stats_row.emails_sent, stats_row.response_rate), (1, 100))
+        self.assertEqual((stats_row.resumes_total, stats_row.has_cv, stats_row.profile_completion), (1, True, 30))
+        self.assertEqual(
+            sorted(activity.kind for activity in stats.activities(stats_row)), ['application', 'email', 'resume'],
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            application.delete()
+        stats_row = self.stats()
+        self.assertEqual((stats_row.applications_total, stats_row.documents_total, stats_row.emails_sent), (0, 0, 0))
+
+    def test_dashboard_reads_one_row(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            ApplicationTracker.objects.create(
+                user=self.user, university=self.university, application_title='MSc Hydrology', status='submitted',
+                application_deadline=datetime.date(2026, 12, 1),
+            )
+        recommendations.get_matrix()
+        request = RequestFactory().get(reverse('accounts:dashboard'))
+        request.user = self.user
+        # Only the statistics row; there are no programs to recommend
+        with self.assertNumQueries(1):
+            response = DashboardView.as_view()(request)
+        self.assertEqual(response.context_data['profile_completion'], 20)
+        recent, = response.context_data['recent_applications']
+        self.assertEqual((recent.title, recent.university, recent.country), ('MSc Hydrology', 'University', 'Germany'))
+        self.assertEqual((recent.status_display, recent.deadline), ('Application Submitted', datetime.date(2026, 12, 1)))
+        self.assertEqual(response.context_data['recommendations'], [])
+
+    def test_dashboard_recommends_programs_for_the_profile(self):
+        StudyProgram.objects.create(
+            university=self.university, name='MSc Water Engineering', level='master', field_of_study='Hydrology',
+            duration_months=24, language_of_instruction='English',
+        )
+        request = RequestFactory().get(reverse('accounts:dashboard'))
+        request.user = self.user
+        response = DashboardView.as_view()(request)
+        names = [entry['object'].name for entry in response.context_data['recommendations']]
+        self.assertEqual(names, ['MSc Water Engineering'])
+        self.assertContains(response.render(), 'MSc Water Engineering')
+
+    def test_renamed_university_refreshes_recent_applications(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            ApplicationTracker.objects.create(user=self.user, university=self.university, application_title='PhD')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.university.name = 'Free University'
+            self.university.save()
+        self.assertEqual(self.stats().recent_applications[0]['university'], 'Free University')
+
+    def test_rebuild(self):
+        UserStats.objects.all().delete()
+        ApplicationTracker.objects.bulk_create([
+            ApplicationTracker(user=self.user, university=self.university, application_title=f'Application {index}')
+            for index in range(3)
+        ])
+        call_command('rebuild_user_stats', stdout=StringIO())
+        self.assertEqual(self.stats().applications_total, 3)
@@ -7,6 +7,9 @@ from django.contrib import messages
 from django.utils.translation import gettext_lazy as _
 from django.urls import reverse_lazy
 
+from destinations import recommendations
+
+from . import stats
 from .models import KurdishUser, UserProfile
 from .forms import KurdishUserCreationForm, UserProfileForm
 
@@ -65,44 +68,16 @@ class DashboardView(LoginRequiredMixin, TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         user = self.request.user
+        user_stats = stats.for_user(user)
         
         context.update({
-            'recent_applications': [],  # TODO: Get user's recent applications
-            'profile_completion': self.calculate_profile_completion(user),
-            'recent_activities': [],  # TODO: Get recent activities
-            'recommendations': [],  # TODO: Get personalized recommendations
+            'stats': user_stats,
+            'recent_applications': stats.recent_applications(user_stats),
+            'profile_completion': user_stats.profile_completion,
+            'recent_activities': stats.activities(user_stats),
+            'recommendations': recommendations.for_user(user),
         })
         return context
-    
-    def calculate_profile_completion(self, user):
-        # Simple profile completion calculation
-        completion = 0
-        total_fields = 10  # Total important fields
-        
-        if user.kurdish_name:
-            completion += 1
-        if user.region:
-            completion += 1
-        if user.field_of_study:
-            completion += 1
-        if user.phone_number:
-            completion += 1
-        if user.current_city:
-            completion += 1
-        if hasattr(user, 'profile'):
-            profile = user.profile
-            if profile.biography:
-                completion += 1
-            if profile.cv_document:
-                completion += 1
-            if profile.work_experience:
-                completion += 1
-            if profile.technical_skills:
-                completion += 1
-            if profile.language_skills:
-                completion += 1
-        
-        return int((completion / total_fields) * 100)
 
 
 class ProfileView(LoginRequiredMixin, TemplateView):
@@ -0,0 +1,119 @@
+"""
+Data for a student's communications dashboard.
+
+``summary`` gathers everything the dashboard shows in a fixed number of
+queries: per-status application counts and email statistics come from one
+conditional aggregate each, and the recent and upcoming lists load the
+related rows their ``__str__`` and templates use. The result is cached per
+user and dropped by ``invalidate``, which the signals in
+``communications.signals`` call whenever one of the user's applications,
+documents or emails is written. Code writing with ``bulk_create`` or
+``update()`` calls it directly.
+"""
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .models import ApplicationDocument, ApplicationTracker, CommunicationTip, EmailLog
+
+
+CACHE_TIMEOUT = 60 * 10
+CACHE_KEY = 'communications:dashboard:{}:{}'
+
+RECENT_ITEMS = 5
+UPCOMING_ITEMS = 5
+TIPS = 3
+
+# Applications the student still has to act on or hear back about
+PENDING_STATUSES = ('preparing', 'submitted', 'under_review')
+# Applications whose deadlines are still worth showing
+OPEN_STATUSES = ('planning', 'preparing')
+
+
+def _key(user_id, today):
+    # Upcoming deadlines depend on the date, so each day starts a fresh entry
+    return CACHE_KEY.format(user_id, today.isoformat())
+
+
+def invalidate(*user_ids):
+    today = timezone.localdate()
+    cache.delete_many([_key(user_id, today) for user_id in set(user_ids)])
+
+
+def status_counts(user):
+    """
+    Number of the user's applications in each status, zero for unused ones
+    """
+    counts = ApplicationTracker.objects.filter(user=user).aggregate(**{
+        status: Count('pk', filter=Q(status=status)) for status, label in ApplicationTracker.APPLICATION_STATUS
+    })
+    counts['total'] = sum(counts.values())
+    return counts
+
+
+def email_stats(user):
+    """
+    Sent, answered and failed email counts with the response rate in percent (None before any email is sent)
+    """
+    stats = EmailLog.objects.filter(user=user).aggregate(
+        sent=Count('pk', filter=Q(status=EmailLog.STATUS_SENT)),
+        responses=Count('pk', filter=Q(status=EmailLog.STATUS_SENT, response_received=True)),
+        queued=Count('pk', filter=Q(status__in=[EmailLog.STATUS_QUEUED, EmailLog.STATUS_SENDING])),
+        failed=Count('pk', filter=Q(status=EmailLog.STATUS_FAILED)),
+    )
+    stats['response_rate'] = round(100 * stats['responses'] / stats['sent']) if stats['sent'] else None
+    return stats
+
+
+def upcoming_deadlines(user, today):
+    """
+    The nearest open application and document deadlines, as ``(deadline, kind, object)`` sorted by date
+    """
+    applications = (
+        ApplicationTracker.objects.with_related()
+        .filter(user=user, status__in=OPEN_STATUSES, application_deadline__gte=today)
+        .order_by('application_deadline', 'pk')[:UPCOMING_ITEMS]
+    )
+    documents = (
+        ApplicationDocument.objects.select_related('application__university')
+        .filter(
+            application__user=user, application__status__in=OPEN_STATUSES,
+            status__in=('draft', 'needs_update'), deadline__gte=today,
+        )
+        .order_by('deadline', 'pk')[:UPCOMING_ITEMS]
+    )
+    deadlines = [(application.application_deadline, 'application', application) for application in applications]
+    deadlines += [(document.deadline, 'document', document) for document in documents]
+    deadlines.sort(key=lambda item: (item[0], item[1]))
+    return deadlines[:UPCOMING_ITEMS]
+
+
+def build(user, today):
+    counts = status_counts(user)
+    return {
+        'status_counts': counts,
+        'pending_applications': sum(counts[status] for status in PENDING_STATUSES),
+        'email_stats': email_stats(user),
+        'upcoming_deadlines': upcoming_deadlines(user, today),
+        'recent_applications': list(
+            ApplicationTracker.objects.with_related().filter(user=user).order_by('-updated_at', '-pk')[:RECENT_ITEMS]
+        ),
+        'recent_emails': list(
+            EmailLog.objects.select_related('application__university').filter(user=user)
+            .order_by('-sent_date', '-pk')[:RECENT_ITEMS]
+        ),
+        'communication_tips': list(CommunicationTip.objects.filter(is_active=True)[:TIPS]),
+    }
+
+
+def summary(user):
+    """
+    The dashboard data for ``user``, from the cache when nothing changed since it was built
+    """
+    today = timezone.localdate()
+    key = _key(user.pk, today)
+    data = cache.get(key)
+    if data is None:
+        data = build(user, today)
+        cache.set(key, data, CACHE_TIMEOUT)
+    return data
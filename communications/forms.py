@@ -0,0 +1,64 @@
+from django import forms
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from crispy_forms.helper import FormHelper
+from crispy_forms.layout import Layout, Submit
+
+from . import mailmerge, rendering
+from .models import ApplicationTracker, EmailTemplate
+
+
+class BulkComposeForm(forms.Form):
+    template = forms.ModelChoiceField(queryset=EmailTemplate.objects.filter(is_active=True), label=_('Email Template'))
+    applications = forms.ModelMultipleChoiceField(
+        queryset=ApplicationTracker.objects.none(),
+        widget=forms.CheckboxSelectMultiple,
+        label=_('Supervisors'),
+    )
+    language = forms.ChoiceField(choices=settings.LANGUAGES, label=_('Language'))
+    
+    # Recipients per campaign, to keep one request's rendering and queueing bounded
+    MAX_RECIPIENTS = 200
+    
+    def __init__(self, *args, user, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.user = user
+        self.fields['applications'].queryset = (
+            ApplicationTracker.objects.filter(user=user)
+            .exclude(supervisor_email='')
+            .select_related('university', 'program')
+            .order_by('university__name', 'pk')
+        )
+        
+        self.helper = FormHelper()
+        self.helper.layout = Layout(
+            'template',
+            'language',
+            'applications',
+            Submit('submit', _('Send to Selected Supervisors'), css_class='btn btn-primary btn-lg mt-4')
+        )
+    
+    def clean_applications(self):
+        applications = self.cleaned_data['applications']
+        if len(applications) > self.MAX_RECIPIENTS:
+            raise forms.ValidationError(
+                _('Select at most %(count)d supervisors at once.'), params={'count': self.MAX_RECIPIENTS}
+            )
+        return applications
+    
+    def clean(self):
+        cleaned_data = super().clean()
+        template = cleaned_data.get('template')
+        language = cleaned_data.get('language')
+        if template and language:
+            try:
+                compiled = rendering.get_compiled(template, language)
+            except rendering.EmailTemplateError as error:
+                raise forms.ValidationError(str(error))
+            missing = compiled.variables - mailmerge.VARIABLES
+            if missing:
+                raise forms.ValidationError(
+                    _('This template needs values the bulk composer cannot fill: %(names)s'),
+                    params={'names': ', '.join(sorted(missing))},
+                )
+        return cleaned_data
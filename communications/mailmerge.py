@@ -0,0 +1,94 @@
+"""
+Mail merge: one ``EmailTemplate`` sent to the supervisors of many applications.
+
+``compose`` renders every message from the compiled template, stores them
+as ``EmailLog`` rows with one ``bulk_create`` and hands the rows to the
+outbox (``communications.outbox``), so a campaign of a hundred supervisors is a handful of
+queries and no SMTP traffic inside the request.
+"""
+from django.db import transaction
+from django.utils import timezone
+from django.utils.text import Truncator
+
+from . import dashboard, outbox
+from .models import EmailLog
+from .rendering import get_compiled
+
+
+# Template types mapped to the EmailLog type recorded for them
+EMAIL_TYPES = {
+    'initial_inquiry': 'inquiry',
+    'supervisor_introduction': 'inquiry',
+    'research_proposal': 'inquiry',
+    'scholarship_inquiry': 'inquiry',
+    'general_inquiry': 'inquiry',
+    'application_follow_up': 'follow_up',
+    'recommendation_request': 'application',
+    'interview_request': 'interview',
+    'acceptance_response': 'acceptance',
+    'visa_inquiry': 'visa',
+}
+
+
+# Every variable recipient_context() fills
+VARIABLES = frozenset([
+    'name', 'sender', 'email', 'professor', 'supervisor', 'recipient', 'university', 'program', 'field',
+    'research_area',
+])
+
+
+def recipient_context(user, application):
+    """
+    Template variables for writing to ``application``'s supervisor as ``user``
+    """
+    sender = user.get_full_name() or user.username
+    program = application.program
+    return {
+        'name': sender,
+        'sender': sender,
+        'email': user.email,
+        'professor': application.supervisor_name,
+        'supervisor': application.supervisor_name,
+        'recipient': application.supervisor_name,
+        'university': application.university.name,
+        'program': program.name if program else application.application_title,
+        'field': application.research_area or (program.field_of_study if program else user.field_of_study),
+        'research_area': application.research_area,
+    }
+
+
+def contexts(user, applications):
+    return [recipient_context(user, application) for application in applications]
+
+
+def compose(user, template, applications, language=None):
+    """
+    Render, log and queue one email per application; returns the created ``EmailLog`` rows
+    """
+    applications = list(applications)
+    compiled = get_compiled(template, language)
+    email_type = EMAIL_TYPES.get(template.template_type, 'other')
+    now = timezone.now()
+    # Filled-in names can make the subject longer than the column; bulk_create does not check
+    subject_length = EmailLog._meta.get_field('subject').max_length
+    logs = [
+        EmailLog(
+            user=user,
+            application=application,
+            email_type=email_type,
+            template_used=template,
+            recipient_email=application.supervisor_email,
+            recipient_name=application.supervisor_name,
+            subject=Truncator(email.subject).chars(subject_length, truncate='…'),
+            body=email.message,
+            status=EmailLog.STATUS_QUEUED,
+            next_attempt_at=now,
+        )
+        for application, email in zip(applications, compiled.render_many(contexts(user, applications)))
+    ]
+    with transaction.atomic():
+        logs = EmailLog.objects.bulk_create(logs)
+        dashboard.invalidate(user.pk)
+        # Workers must not look for the rows before they are committed
+        transaction.on_commit(outbox.wake)
+    return logs
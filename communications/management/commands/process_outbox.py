@@ -0,0 +1,22 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from communications import outbox
+
+
+class Command(BaseCommand):
+    help = 'Send queued emails; with --watch, keep polling the outbox like a worker'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--watch', action='store_true', help='Keep running and poll for due emails')
+        parser.add_argument('--interval', type=float, default=5, help='Seconds between polls with --watch')
+
+    def handle(self, *args, **options):
+        while True:
+            sent = outbox.run()
+            if sent:
+                self.stdout.write(f'Processed {sent} emails.')
+            if not options['watch']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,17 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+
+from communications import reminders
+
+
+class Command(BaseCommand):
+    help = 'Queue reminder digests for deadlines that entered a reminder window since the last run'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--today', type=datetime.date.fromisoformat,
+                            help='Run as if on this date (YYYY-MM-DD); defaults to today')
+
+    def handle(self, *args, **options):
+        count = reminders.run(today=options['today'])
+        self.stdout.write(self.style.SUCCESS(f'Queued {count} reminder emails.'))
@@ -0,0 +1,61 @@
+# Generated by Django 4.2.30 on 2026-10-18 15:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("communications", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="emaillog",
+            name="attempts",
+            field=models.PositiveSmallIntegerField(
+                default=0, verbose_name="Delivery Attempts"
+            ),
+        ),
+        migrations.AddField(
+            model_name="emaillog",
+            name="delivered_at",
+            field=models.DateTimeField(
+                blank=True, null=True, verbose_name="Delivered At"
+            ),
+        ),
+        migrations.AddField(
+            model_name="emaillog",
+            name="last_error",
+            field=models.TextField(blank=True, verbose_name="Last Delivery Error"),
+        ),
+        migrations.AddField(
+            model_name="emaillog",
+            name="next_attempt_at",
+            field=models.DateTimeField(
+                blank=True, null=True, verbose_name="Next Attempt"
+            ),
+        ),
+        migrations.AddField(
+            model_name="emaillog",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("queued", "Queued"),
+                    ("sending", "Sending"),
+                    ("sent", "Sent"),
+                    ("failed", "Failed"),
+                ],
+                default="sent",
+                max_length=10,
+                verbose_name="Delivery Status",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="emaillog",
+            index=models.Index(
+                fields=["status", "next_attempt_at"],
+                name="communicati_status_578c7d_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.30 on 2026-10-18 15:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("communications", "0002_email_outbox"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReminderWatermark",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(max_length=50, unique=True, verbose_name="Name"),
+                ),
+                ("horizon", models.DateField(verbose_name="Scanned Up To")),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Reminder Watermark",
+                "verbose_name_plural": "Reminder Watermarks",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="applicationdocument",
+            index=models.Index(
+                fields=["deadline"], name="communicati_deadlin_e4f2e8_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="applicationtracker",
+            index=models.Index(
+                fields=["application_deadline"], name="communicati_applica_408751_idx"
+            ),
+        ),
+    ]
@@ -1,8 +1,12 @@
+from django.conf import settings
+from django.core.exceptions import ValidationError
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 from accounts.models import KurdishUser
 from destinations.models import University, StudyProgram
 
+from . import rendering
+
 
 class EmailTemplate(models.Model):
     """
@@ -52,11 +56,33 @@ class EmailTemplate(models.Model):
     def __str__(self):
         return f"{self.name} ({self.get_template_type_display()})"
     
+    def clean(self):
+        super().clean()
+        for language in settings.MODELTRANSLATION_LANGUAGES:
+            try:
+                rendering.compile_template(self, language)
+            except rendering.EmailTemplateError as error:
+                raise ValidationError(str(error))
+    
+    def render(self, context, language=None):
+        """
+        Render the email for ``context``; see ``communications.rendering``
+        """
+        return rendering.render(self, context, language)
+    
     class Meta:
         verbose_name = _('Email Template')
         verbose_name_plural = _('Email Templates')
 
 
+class ApplicationTrackerQuerySet(models.QuerySet):
+    def with_related(self):
+        """
+        Load the university and program that ``__str__`` and the application pages show
+        """
+        return self.select_related('university', 'program')
+
+
 class ApplicationTracker(models.Model):
     """
     Model for tracking applications to different universities/programs
@@ -113,6 +139,8 @@ class ApplicationTracker(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = ApplicationTrackerQuerySet.as_manager()
+    
     def __str__(self):
         return f"{self.application_title} - {self.university.name}"
     
@@ -120,6 +148,7 @@ class ApplicationTracker(models.Model):
         verbose_name = _('Application Tracker')
         verbose_name_plural = _('Application Trackers')
         ordering = ['-priority', 'application_deadline']
+        indexes = [models.Index(fields=['application_deadline'])]
 
 
 class ApplicationDocument(models.Model):
@@ -172,12 +201,35 @@ class ApplicationDocument(models.Model):
     class Meta:
         verbose_name = _('Application Document')
         verbose_name_plural = _('Application Documents')
+        indexes = [models.Index(fields=['deadline'])]
+
+
+class EmailLogQuerySet(models.QuerySet):
+    def due(self, now):
+        """
+        Queued emails whose next attempt is due, and sends whose worker lease has expired
+        """
+        return self.filter(
+            status__in=[EmailLog.STATUS_QUEUED, EmailLog.STATUS_SENDING], next_attempt_at__lte=now
+        )
 
 
 class EmailLog(models.Model):
     """
     Model for logging sent emails and communication history
     """
+    STATUS_QUEUED = 'queued'
+    STATUS_SENDING = 'sending'
+    STATUS_SENT = 'sent'
+    STATUS_FAILED = 'failed'
+    
+    DELIVERY_STATUS = [
+        (STATUS_QUEUED, _('Queued')),
+        (STATUS_SENDING, _('Sending')),
+        (STATUS_SENT, _('Sent')),
+        (STATUS_FAILED, _('Failed')),
+    ]
+    
     EMAIL_TYPES = [
         ('inquiry', _('Initial Inquiry')),
         ('follow_up', _('Follow-up')),
@@ -207,6 +259,15 @@ class EmailLog(models.Model):
     
     notes = models.TextField(verbose_name=_('Notes'), blank=True)
     
+    # Outbox delivery (communications.outbox); emails logged by hand are already sent
+    status = models.CharField(max_length=10, choices=DELIVERY_STATUS, default=STATUS_SENT, verbose_name=_('Delivery Status'))
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name=_('Delivery Attempts'))
+    next_attempt_at = models.DateTimeField(null=True, blank=True, verbose_name=_('Next Attempt'))
+    delivered_at = models.DateTimeField(null=True, blank=True, verbose_name=_('Delivered At'))
+    last_error = models.TextField(blank=True, verbose_name=_('Last Delivery Error'))
+    
+    objects = EmailLogQuerySet.as_manager()
+    
     def __str__(self):
         return f"Email to {self.recipient_email} - {self.subject[:50]}"
     
@@ -214,6 +275,7 @@ class EmailLog(models.Model):
         verbose_name = _('Email Log')
         verbose_name_plural = _('Email Logs')
         ordering = ['-sent_date']
+        indexes = [models.Index(fields=['status', 'next_attempt_at'])]
 
 
 class CommunicationTip(models.Model):
@@ -254,4 +316,20 @@ class CommunicationTip(models.Model):
     class Meta:
         verbose_name = _('Communication Tip')
         verbose_name_plural = _('Communication Tips')
-        ordering = ['-priority', 'title']
\ No newline at end of file
+        ordering = ['-priority', 'title']
+
+
+class ReminderWatermark(models.Model):
+    """
+    How far ahead a periodic reminder job has already looked, so each run only scans new rows
+    """
+    name = models.CharField(max_length=50, unique=True, verbose_name=_('Name'))
+    horizon = models.DateField(verbose_name=_('Scanned Up To'))
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.name}: {self.horizon}"
+    
+    class Meta:
+        verbose_name = _('Reminder Watermark')
+        verbose_name_plural = _('Reminder Watermarks')
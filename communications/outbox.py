@@ -0,0 +1,270 @@
+"""
+Outbound email queue backed by ``EmailLog``.
+
+Requests never talk to the mail server: they store ``EmailLog`` rows with
+status ``queued`` and call ``wake()``, which schedules ``tasks.process_outbox``
+on the background worker. The worker claims due rows in batches and sends
+them over a pooled connection that stays open across batches, so a campaign
+pays for one SMTP handshake rather than one per message.
+
+Each recipient domain has a per-minute send limit (``OUTBOX_RATE_LIMITS``);
+messages over it wait for the next minute without using up an attempt.
+Temporary failures are retried with exponential backoff
+(``OUTBOX_RETRY_DELAY`` doubled per attempt) until ``OUTBOX_MAX_ATTEMPTS``;
+refused recipients fail at once. A claimed row is leased to its worker for
+``LEASE`` seconds, so rows left behind by a crashed worker are picked up again.
+"""
+import datetime
+import logging
+import random
+import smtplib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from accounts import stats
+
+from . import dashboard
+from .models import EmailLog
+
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 50
+MAX_ATTEMPTS = 5
+RETRY_DELAY = 60
+RATE_LIMITS = {'default': 300}
+
+# Seconds a worker owns the rows it claimed
+LEASE = 300
+
+# Reopen pooled connections after this many seconds or messages
+CONNECTION_MAX_AGE = 300
+CONNECTION_MAX_MESSAGES = 500
+
+# Errors that will not go away by trying again later
+PERMANENT_ERRORS = (smtplib.SMTPRecipientsRefused, smtplib.SMTPNotSupportedError, ValueError)
+
+
+def _setting(name, default):
+    return getattr(settings, f'OUTBOX_{name}', default)
+
+
+class ConnectionPool:
+    """
+    One open mail backend connection per thread, reused across batches
+    """
+    def __init__(self):
+        self._local = threading.local()
+
+    def get(self):
+        pooled = getattr(self._local, 'connection', None)
+        if pooled is not None:
+            connection, backend, opened_at, sent = pooled
+            if (
+                backend == settings.EMAIL_BACKEND
+                and time.monotonic() - opened_at < CONNECTION_MAX_AGE
+                and sent < CONNECTION_MAX_MESSAGES
+            ):
+                return connection
+            self.discard()
+        connection = get_connection(fail_silently=False)
+        connection.open()
+        self._local.connection = (connection, settings.EMAIL_BACKEND, time.monotonic(), 0)
+        return connection
+
+    def sent(self, count=1):
+        connection, backend, opened_at, sent = self._local.connection
+        self._local.connection = (connection, backend, opened_at, sent + count)
+
+    def discard(self):
+        """
+        Close this thread's connection, e.g. after the server dropped it
+        """
+        pooled = getattr(self._local, 'connection', None)
+        self._local.connection = None
+        if pooled is not None:
+            try:
+                pooled[0].close()
+            except Exception:
+                logger.debug('Error closing pooled mail connection', exc_info=True)
+
+
+pool = ConnectionPool()
+
+
+def wake():
+    """
+    Have the background worker process the outbox soon
+    """
+    from kurdish_apply.celery import run_in_background
+    from .tasks import process_outbox
+
+    run_in_background(process_outbox)
+
+
+def schedule_next(now=None):
+    """
+    Wake the worker again when the next deferred or retried email is due
+    """
+    from kurdish_apply.celery import run_later
+    from .tasks import process_outbox
+
+    due = next_due()
+    if due is None:
+        return None
+    delay = max((due - (now or timezone.now())).total_seconds(), 1)
+    # One pending wake-up at a time
+    if cache.add('outbox:scheduled', True, delay):
+        run_later(process_outbox, delay)
+    return due
+
+
+def is_permanent(error):
+    if isinstance(error, PERMANENT_ERRORS):
+        return True
+    # 5xx replies are permanent failures in SMTP
+    return isinstance(error, smtplib.SMTPResponseException) and 500 <= error.smtp_code < 600
+
+
+def domain(address):
+    return address.rpartition('@')[2].lower()
+
+
+def _rate_limit(domain_name):
+    limits = _setting('RATE_LIMITS', RATE_LIMITS)
+    return limits.get(domain_name, limits.get('default'))
+
+
+def _take_slot(domain_name, now):
+    """
+    Count one send against the domain's limit for this minute; False when it is used up
+    """
+    limit = _rate_limit(domain_name)
+    if not limit:
+        return True
+    key = f'outbox:rate:{domain_name}:{int(now.timestamp()) // 60}'
+    cache.add(key, 0, 120)
+    try:
+        return cache.incr(key) <= limit
+    except ValueError:
+        # Expired between add and incr
+        cache.add(key, 1, 120)
+        return True
+
+
+def backoff(attempts):
+    """
+    Delay before retry number ``attempts``, with jitter so retries do not arrive together
+    """
+    delay = _setting('RETRY_DELAY', RETRY_DELAY) * 2 ** max(attempts - 1, 0)
+    return datetime.timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+def message_for(log):
+    return EmailMessage(
+        subject=log.subject,
+        body=log.body,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[log.recipient_email],
+        reply_to=[log.user.email] if log.user.email else None,
+    )
+
+
+def claim(now, batch_size):
+    """
+    Lease a batch of due rows to this worker
+    """
+    with transaction.atomic():
+        batch = list(
+            EmailLog.objects.due(now)
+            .select_related('user')
+            .select_for_update(skip_locked=True, of=('self',))
+            .order_by('next_attempt_at', 'pk')[:batch_size]
+        )
+        EmailLog.objects.filter(pk__in=[log.pk for log in batch]).update(
+            status=EmailLog.STATUS_SENDING, next_attempt_at=now + datetime.timedelta(seconds=LEASE)
+        )
+    return batch
+
+
+def process(now=None, batch_size=None):
+    """
+    Send one batch of due emails; returns how many rows were claimed
+    """
+    now = now or timezone.now()
+    batch = claim(now, batch_size or _setting('BATCH_SIZE', BATCH_SIZE))
+    if not batch:
+        return 0
+
+    sent, deferred, failed = [], [], []
+    max_attempts = _setting('MAX_ATTEMPTS', MAX_ATTEMPTS)
+    next_minute = now.replace(second=0, microsecond=0) + datetime.timedelta(minutes=1)
+    for log in batch:
+        if not _take_slot(domain(log.recipient_email), now):
+            deferred.append(log.pk)
+            continue
+        try:
+            pool.get().send_messages([message_for(log)])
+        except Exception as error:
+            permanent = is_permanent(error)
+            if not permanent:
+                # The connection may be broken; start the next message on a fresh one
+                pool.discard()
+            log.attempts += 1
+            log.last_error = f'{type(error).__name__}: {error}'[:1000]
+            if permanent or log.attempts >= max_attempts:
+                log.status = EmailLog.STATUS_FAILED
+                log.next_attempt_at = None
+                logger.warning('Giving up on email %s to %s: %s', log.pk, log.recipient_email, log.last_error)
+            else:
+                log.status = EmailLog.STATUS_QUEUED
+                log.next_attempt_at = now + backoff(log.attempts)
+            failed.append(log)
+        else:
+            pool.sent()
+            sent.append(log.pk)
+
+    EmailLog.objects.filter(pk__in=sent).update(
+        status=EmailLog.STATUS_SENT, delivered_at=timezone.now(), next_attempt_at=None,
+        attempts=F('attempts') + 1, last_error='',
+    )
+    EmailLog.objects.filter(pk__in=deferred).update(status=EmailLog.STATUS_QUEUED, next_attempt_at=next_minute)
+    EmailLog.objects.bulk_update(failed, ['status', 'attempts', 'next_attempt_at', 'last_error'])
+    dashboard.invalidate(*(log.user_id for log in batch))
+    stats.refresh_on_commit({log.user_id for log in batch if log.pk in sent}, 'emails', 'activity')
+    return len(batch)
+
+
+def run(time_limit=60):
+    """
+    Process batches until nothing is due or ``time_limit`` seconds have passed
+    """
+    deadline = time.monotonic() + time_limit
+    total = 0
+    while time.monotonic() < deadline:
+        claimed = process()
+        if not claimed:
+            break
+        total += claimed
+    return total
+
+
+def next_due():
+    """
+    When the earliest queued email becomes due, or None
+    """
+    return (
+        EmailLog.objects.filter(
+            status__in=[EmailLog.STATUS_QUEUED, EmailLog.STATUS_SENDING], next_attempt_at__isnull=False
+        )
+        .order_by('next_attempt_at')
+        .values_list('next_attempt_at', flat=True)
+        .first()
+    )
@@ -0,0 +1,237 @@
+"""
+Deadline reminders for tracked applications, their documents, and the
+programs and scholarships behind them.
+
+A student is reminded ``lead`` days before each deadline, for every lead in
+``REMINDER_LEAD_DAYS``. Each lead has a ``ReminderWatermark`` holding the
+last date its window reached; a run only scans deadlines between that
+watermark and ``today + lead``, so the range queries (on indexed deadline
+columns) touch rows that became due since the previous run, never the whole
+table. Rows are read in keyset-paginated batches. All reminders of one run
+are grouped into a single digest email per student, queued on the outbox.
+
+If no run happened for a while, the next one catches up over the whole
+missed range, skipping deadlines that have already passed.
+"""
+import datetime
+from collections import defaultdict
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone, translation
+from django.utils.translation import gettext as _, ngettext
+
+from accounts.models import KurdishUser
+from destinations.models import Scholarship, StudyProgram
+
+from . import dashboard, outbox
+from .models import ApplicationDocument, ApplicationTracker, EmailLog, ReminderWatermark
+
+
+LEAD_DAYS = (14, 3, 1)
+BATCH_SIZE = 2000
+
+# Applications still being worked on, and documents that still need work
+OPEN_APPLICATION_STATUSES = ('planning', 'preparing')
+OPEN_DOCUMENT_STATUSES = ('draft', 'needs_update')
+ACTIVE_APPLICATION_STATUSES = ('planning', 'preparing', 'submitted', 'under_review', 'interview')
+
+KIND_ORDER = ('application', 'document', 'program', 'scholarship')
+
+
+@dataclass(frozen=True)
+class Reminder:
+    user_id: int
+    kind: str
+    object_id: int
+    title: str
+    deadline: datetime.date
+
+
+def batched(queryset, field, batch_size=BATCH_SIZE):
+    """
+    Iterate ``queryset.values()`` rows ordered by ``(field, pk)`` with keyset pagination
+    """
+    queryset = queryset.order_by(field, 'pk')
+    last = None
+    while True:
+        page = queryset
+        if last is not None:
+            page = page.filter(Q(**{f'{field}__gt': last[0]}) | Q(**{field: last[0], 'pk__gt': last[1]}))
+        rows = list(page[:batch_size])
+        if not rows:
+            return
+        yield from rows
+        last = (rows[-1][field], rows[-1]['pk'])
+
+
+def _chunks(values, size=BATCH_SIZE):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def application_reminders(start, end):
+    trackers = ApplicationTracker.objects.filter(
+        application_deadline__gt=start, application_deadline__lte=end, status__in=OPEN_APPLICATION_STATUSES,
+    ).values('pk', 'user_id', 'application_title', 'application_deadline')
+    for row in batched(trackers, 'application_deadline'):
+        yield Reminder(row['user_id'], 'application', row['pk'], row['application_title'], row['application_deadline'])
+
+
+def document_reminders(start, end):
+    documents = ApplicationDocument.objects.filter(
+        deadline__gt=start, deadline__lte=end, status__in=OPEN_DOCUMENT_STATUSES,
+        application__status__in=ACTIVE_APPLICATION_STATUSES,
+    ).values('pk', 'application__user_id', 'title', 'application__application_title', 'deadline')
+    for row in batched(documents, 'deadline'):
+        title = f"{row['title']} ({row['application__application_title']})"
+        yield Reminder(row['application__user_id'], 'document', row['pk'], title, row['deadline'])
+
+
+def program_reminders(start, end):
+    programs = StudyProgram.objects.filter(
+        is_active=True, application_deadline__gt=start, application_deadline__lte=end,
+    ).values('pk', 'name', 'university__name', 'application_deadline')
+    programs = {row['pk']: row for row in batched(programs, 'application_deadline')}
+    for ids in _chunks(programs):
+        trackers = ApplicationTracker.objects.filter(
+            program_id__in=ids, status__in=OPEN_APPLICATION_STATUSES,
+        ).values_list('user_id', 'program_id', 'application_deadline')
+        for user_id, program_id, own_deadline in trackers.iterator(chunk_size=BATCH_SIZE):
+            program = programs[program_id]
+            # Already reminded about through the tracker's own deadline
+            if own_deadline == program['application_deadline']:
+                continue
+            title = f"{program['name']}, {program['university__name']}"
+            yield Reminder(user_id, 'program', program_id, title, program['application_deadline'])
+
+
+def scholarship_reminders(start, end):
+    scholarships = Scholarship.objects.filter(
+        is_active=True, application_deadline__gt=start, application_deadline__lte=end,
+    ).values('pk', 'name', 'application_deadline', 'university_id', 'country_id')
+    scholarships = {row['pk']: row for row in batched(scholarships, 'application_deadline')}
+    if not scholarships:
+        return
+
+    # A scholarship is relevant to trackers for one of its programs, its university or its country
+    by_program = defaultdict(set)
+    through = Scholarship.eligible_programs.through
+    for ids in _chunks(scholarships):
+        for scholarship_id, program_id in through.objects.filter(scholarship_id__in=ids).values_list(
+            'scholarship_id', 'studyprogram_id'
+        ):
+            by_program[program_id].add(scholarship_id)
+    with_programs = set().union(*by_program.values())
+    by_university = defaultdict(set)
+    by_country = defaultdict(set)
+    for row in scholarships.values():
+        if row['university_id']:
+            by_university[row['university_id']].add(row['pk'])
+        elif row['country_id'] and row['pk'] not in with_programs:
+            by_country[row['country_id']].add(row['pk'])
+
+    trackers = ApplicationTracker.objects.filter(
+        Q(program_id__in=by_program) | Q(university_id__in=by_university) | Q(university__country_id__in=by_country),
+        status__in=OPEN_APPLICATION_STATUSES,
+    ).values_list('user_id', 'program_id', 'university_id', 'university__country_id')
+    for user_id, program_id, university_id, country_id in trackers.iterator(chunk_size=BATCH_SIZE):
+        matches = by_program.get(program_id, set()) | by_university.get(university_id, set()) | by_country.get(country_id, set())
+        for scholarship_id in matches:
+            scholarship = scholarships[scholarship_id]
+            yield Reminder(user_id, 'scholarship', scholarship_id, scholarship['name'], scholarship['application_deadline'])
+
+
+SOURCES = (application_reminders, document_reminders, program_reminders, scholarship_reminders)
+
+
+def collect(start, end):
+    """
+    Reminders for deadlines in ``(start, end]``
+    """
+    for source in SOURCES:
+        yield from source(start, end)
+
+
+def _kind_label(kind):
+    return {
+        'application': _('Application'),
+        'document': _('Document'),
+        'program': _('Program'),
+        'scholarship': _('Scholarship'),
+    }[kind]
+
+
+def digest(user, reminders, today):
+    """
+    Subject and body of one student's reminder email
+    """
+    reminders = sorted(reminders, key=lambda reminder: (reminder.deadline, KIND_ORDER.index(reminder.kind), reminder.title))
+    lines = []
+    for reminder in reminders:
+        days = (reminder.deadline - today).days
+        due = ngettext('due in %(days)d day', 'due in %(days)d days', days) % {'days': days}
+        lines.append(f'- {_kind_label(reminder.kind)}: {reminder.title} ({reminder.deadline.isoformat()}, {due})')
+    subject = ngettext('%(count)d upcoming deadline', '%(count)d upcoming deadlines', len(reminders)) % {
+        'count': len(reminders)
+    }
+    greeting = _('Hello %(name)s,') % {'name': user['first_name'] or user['username']}
+    body = '\n\n'.join([greeting, _('These deadlines are coming up:'), '\n'.join(lines)])
+    return subject, body
+
+
+def _windows(today, lead_days):
+    """
+    Lock each lead's watermark and yield ``(watermark, start, end)`` for the range still to scan
+    """
+    for lead in lead_days:
+        end = today + datetime.timedelta(days=lead)
+        watermark, created = ReminderWatermark.objects.select_for_update().get_or_create(
+            name=f'deadlines:{lead}d', defaults={'horizon': end - datetime.timedelta(days=1)},
+        )
+        start = max(watermark.horizon, today)
+        if start < end:
+            yield watermark, start, end
+
+
+def run(today=None):
+    """
+    Queue digests for deadlines newly inside a reminder window; returns the number of emails
+    """
+    today = today or timezone.localdate()
+    lead_days = getattr(settings, 'REMINDER_LEAD_DAYS', LEAD_DAYS)
+    with transaction.atomic():
+        reminders = {}
+        for watermark, start, end in _windows(today, lead_days):
+            for reminder in collect(start, end):
+                # A catch-up run can see a deadline through several leads; remind once
+                reminders.setdefault((reminder.user_id, reminder.kind, reminder.object_id), reminder)
+            watermark.horizon = end
+            watermark.save(update_fields=['horizon', 'updated_at'])
+
+        by_user = defaultdict(list)
+        for reminder in reminders.values():
+            by_user[reminder.user_id].append(reminder)
+
+        now = timezone.now()
+        logs = []
+        with translation.override(settings.LANGUAGE_CODE):
+            for ids in _chunks(by_user):
+                users = KurdishUser.objects.filter(pk__in=ids, is_active=True).exclude(email='').values(
+                    'pk', 'email', 'first_name', 'username'
+                )
+                for user in users:
+                    subject, body = digest(user, by_user[user['pk']], today)
+                    logs.append(EmailLog(
+                        user_id=user['pk'], email_type='other', recipient_email=user['email'],
+                        recipient_name=user['first_name'], subject=subject, body=body,
+                        status=EmailLog.STATUS_QUEUED, next_attempt_at=now,
+                    ))
+        EmailLog.objects.bulk_create(logs, batch_size=500)
+        if logs:
+            dashboard.invalidate(*(log.user_id for log in logs))
+            transaction.on_commit(outbox.wake)
+    return len(logs)
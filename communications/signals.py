@@ -0,0 +1,52 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from accounts import stats
+from destinations.models import Country, University
+
+from . import dashboard
+from .models import ApplicationDocument, ApplicationTracker, EmailLog
+
+
+@receiver(post_save, sender=ApplicationTracker)
+@receiver(post_save, sender=EmailLog)
+@receiver(post_delete, sender=ApplicationTracker)
+@receiver(post_delete, sender=EmailLog)
+def invalidate_dashboard(sender, instance, **kwargs):
+    dashboard.invalidate(instance.user_id)
+
+
+@receiver(post_save, sender=ApplicationDocument)
+@receiver(post_delete, sender=ApplicationDocument)
+def invalidate_dashboard_for_document(sender, instance, raw=False, **kwargs):
+    user_id = ApplicationTracker.objects.filter(pk=instance.application_id).values_list('user_id', flat=True).first()
+    if user_id is not None:
+        dashboard.invalidate(user_id)
+        if not raw:
+            stats.refresh_on_commit([user_id], 'documents')
+
+
+@receiver(post_save, sender=ApplicationTracker)
+@receiver(post_delete, sender=ApplicationTracker)
+def update_application_stats(sender, instance, raw=False, **kwargs):
+    # Deleting an application deletes its documents too
+    if not raw:
+        stats.refresh_on_commit([instance.user_id], 'applications', 'documents', 'activity')
+
+
+@receiver(post_save, sender=EmailLog)
+@receiver(post_delete, sender=EmailLog)
+def update_email_stats(sender, instance, raw=False, **kwargs):
+    if not raw:
+        stats.refresh_on_commit([instance.user_id], 'emails', 'activity')
+
+
+@receiver(post_save, sender=University)
+@receiver(post_save, sender=Country)
+def update_application_stats_for_destination(sender, instance, created, raw=False, **kwargs):
+    # The recent applications in UserStats carry university and country names
+    if raw or created:
+        return
+    lookup = 'university' if sender is University else 'university__country'
+    trackers = ApplicationTracker.objects.filter(**{lookup: instance}).order_by()
+    stats.refresh_on_commit(set(trackers.values_list('user_id', flat=True)), 'applications')
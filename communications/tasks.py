@@ -0,0 +1,17 @@
+from celery import shared_task
+
+from . import outbox, reminders
+
+
+@shared_task(ignore_result=True)
+def process_outbox():
+    """
+    Send due emails, then schedule the next run for deferred and retried ones
+    """
+    outbox.run()
+    outbox.schedule_next()
+
+
+@shared_task(ignore_result=True)
+def send_deadline_reminders():
+    reminders.run()
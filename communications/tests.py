@@ -1,3 +1,422 @@
-from django.test import TestCase
+import datetime
+import smtplib
 
-# Create your tests here.
+from django.contrib.auth.models import AnonymousUser
+from django.core import mail
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.mail.backends.locmem import EmailBackend as LocmemBackend
+from django.db import connection
+from django.http import Http404
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import KurdishUser
+from destinations.models import Country, Scholarship, StudyProgram, University
+
+from . import dashboard, outbox, reminders, rendering
+from .models import ApplicationDocument, ApplicationTracker, EmailLog, EmailTemplate
+from .views import BulkEmailComposeView, CommunicationsDashboard, EmailLogView, EmailTemplateDetailView
+
+
+def create_user(username='student'):
+    return KurdishUser.objects.create_user(username=username, password='secret', region='bashur')
+
+
+def create_university(name='University'):
+    country, _ = Country.objects.get_or_create(
+        code='DEU',
+        defaults={'name': 'Germany', 'description': 'Germany', 'official_language': 'German', 'currency': 'EUR'},
+    )
+    return University.objects.create(
+        country=country, name=name, city='Berlin', university_type='public', instruction_languages='German'
+    )
+
+
+class EmailLogViewTests(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        for index in range(7):
+            EmailLog.objects.create(
+                user=self.user, email_type='inquiry', recipient_email=f'prof{index}@example.com',
+                subject=f'Subject {index}', body='Hello',
+            )
+
+    def test_tampered_cursor_is_rejected(self):
+        request = RequestFactory().get(reverse('communications:email_log'), {'cursor': 'forged'})
+        request.user = self.user
+
+        with self.assertRaises(Http404):
+            EmailLogView.as_view()(request)
+
+    def test_email_log_view_pages_without_counting(self):
+        request = RequestFactory().get(reverse('communications:email_log'))
+        request.user = self.user
+
+        with self.assertNumQueries(1):
+            response = EmailLogView.as_view()(request)
+            emails = list(response.context_data['emails'])
+
+        self.assertEqual(len(emails), 7)
+        self.assertFalse(response.context_data['is_paginated'])
+
+
+def create_email_template(**kwargs):
+    defaults = {
+        'name': 'Supervisor inquiry',
+        'template_type': 'initial_inquiry',
+        'formality_level': 'formal',
+        'subject_line_en': 'PhD position in {field} at {university}',
+        'subject_line_ckb': 'دەرفەتی دکتۆرا لە {university}',
+        'greeting_en': 'Dear {professor},',
+        'body_en': 'I am applying with a 100% funded scholarship; see {{my CV}}.',
+        'closing_en': 'Kind regards,',
+        'signature_en': '{name}',
+        'signature_ckb': '{name}',
+        'variables': ['{name}', '{university}', '{professor}', 'field'],
+    }
+    defaults.update(kwargs)
+    return EmailTemplate.objects.create(**defaults)
+
+
+class EmailRenderingTests(TestCase):
+    context = {'name': 'Hana Aziz', 'university': 'TU Munich', 'professor': 'Professor Weber', 'field': 'Hydrology'}
+
+    def setUp(self):
+        rendering.clear()
+        self.template = create_email_template()
+
+    def test_render(self):
+        email = self.template.render(self.context, language='en')
+        self.assertEqual(email.subject, 'PhD position in Hydrology at TU Munich')
+        self.assertEqual(
+            email.message,
+            'Dear Professor Weber,\n\nI am applying with a 100% funded scholarship; see {my CV}.'
+            '\n\nKind regards,\nHana Aziz',
+        )
+
+        # Kurmanji is empty and falls back to the default language, Sorani
+        email = self.template.render(self.context, language='kmr')
+        self.assertEqual(email.subject, 'دەرفەتی دکتۆرا لە TU Munich')
+        self.assertEqual(email.signature, 'Hana Aziz')
+
+    def test_compiled_once_until_edited(self):
+        compiled = rendering.get_compiled(self.template, 'en')
+        self.assertIs(rendering.get_compiled(EmailTemplate.objects.get(pk=self.template.pk), 'en'), compiled)
+
+        self.template.greeting_en = 'Hello {professor},'
+        self.template.save()
+        self.assertEqual(self.template.render(self.context, 'en').greeting, 'Hello Professor Weber,')
+
+    def test_missing_variables(self):
+        with self.assertRaises(rendering.MissingVariables) as raised:
+            self.template.render({'name': 'Hana'}, 'en')
+        self.assertEqual(raised.exception.names, ['field', 'professor', 'university'])
+
+    def test_render_many(self):
+        contexts = [dict(self.context, name=f'Student {index}') for index in range(1000)]
+        emails = list(rendering.get_compiled(self.template, 'en').render_many(contexts))
+        self.assertEqual(emails[999].signature, 'Student 999')
+
+    def test_validation(self):
+        for kwargs in ({'greeting_kmr': 'Silav {department},'}, {'body_en': 'Unclosed {name'}):
+            template = create_email_template(**kwargs)
+            with self.assertRaises(ValidationError):
+                template.clean()
+
+
+    def test_detail_page_survives_a_malformed_template(self):
+        template = create_email_template(body_ckb='Unclosed {name', body_en='Unclosed {name')
+        request = RequestFactory().get(reverse('communications:template_detail', args=[template.pk]))
+        request.user = AnonymousUser()
+
+        response = EmailTemplateDetailView.as_view()(request, pk=template.pk)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.context_data['preview'])
+        self.assertIn('preview_error', response.context_data)
+
+
+@override_settings(CELERY_TASK_ALWAYS_EAGER=True)
+class BulkComposeTests(TestCase):
+    def setUp(self):
+        rendering.clear()
+        self.user = create_user()
+        self.user.first_name, self.user.last_name, self.user.email = 'Hana', 'Aziz', 'hana@example.com'
+        self.user.save()
+        self.template = create_email_template()
+        university = create_university('TU Munich')
+        self.applications = ApplicationTracker.objects.bulk_create([
+            ApplicationTracker(
+                user=self.user, university=university, application_title=f'PhD {index}',
+                supervisor_name=f'Professor {index}', supervisor_email=f'professor{index}@example.com',
+                research_area='Hydrology',
+            )
+            for index in range(100)
+        ])
+        # Without a supervisor address there is no one to write to
+        ApplicationTracker.objects.create(user=self.user, university=university, application_title='No supervisor')
+        self.client.force_login(self.user)
+
+    def post(self, **data):
+        data.setdefault('template', self.template.pk)
+        data.setdefault('language', 'en')
+        data.setdefault('applications', [application.pk for application in self.applications])
+        return self.client.post(reverse('communications:compose_bulk'), data)
+
+    def test_campaign_in_one_request(self):
+        with self.captureOnCommitCallbacks(execute=True), CaptureQueriesContext(connection) as queries:
+            response = self.post()
+        self.assertRedirects(response, reverse('communications:email_log'), fetch_redirect_response=False)
+        inserts = [query for query in queries.captured_queries if query['sql'].startswith('INSERT')]
+        # One bulk_create; SQLite splits it into batches at its variable limit
+        self.assertLessEqual(len(inserts), 2)
+        self.assertLess(len(queries.captured_queries), 15)
+
+        self.assertEqual(len(mail.outbox), 100)
+        log = EmailLog.objects.get(recipient_email='professor7@example.com')
+        self.assertEqual(log.subject, 'PhD position in Hydrology at TU Munich')
+        self.assertTrue(log.body.startswith('Dear Professor 7,'))
+        self.assertEqual(log.email_type, 'inquiry')
+        self.assertEqual(mail.outbox[7].reply_to, ['hana@example.com'])
+
+    def test_long_subjects_fit_the_log(self):
+        template = create_email_template(
+            subject_line_en='Inquiry about {program} at {university}',
+            variables=['name', 'university', 'professor', 'program'],
+        )
+        ApplicationTracker.objects.filter(pk=self.applications[0].pk).update(application_title='Hydrology ' * 30)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post(template=template.pk, applications=[self.applications[0].pk])
+        subject = EmailLog.objects.get().subject
+        self.assertEqual(len(subject), EmailLog._meta.get_field('subject').max_length)
+        self.assertTrue(subject.startswith('Inquiry about Hydrology Hydrology'))
+        self.assertTrue(subject.endswith('…'))
+
+    def test_rejects_unfillable_template(self):
+        template = create_email_template(greeting_en='Dear {title} {professor},', variables=['title', 'professor', 'field', 'university', 'name'])
+        request = RequestFactory().post(reverse('communications:compose_bulk'), {
+            'template': template.pk, 'language': 'en', 'applications': [self.applications[0].pk],
+        })
+        request.user = self.user
+        response = BulkEmailComposeView.as_view()(request)
+        self.assertFalse(EmailLog.objects.exists())
+        self.assertIn('title', str(response.context_data['form'].non_field_errors()))
+
+
+class FlakyBackend(LocmemBackend):
+    """
+    Local stand-in for an SMTP server that counts connections and fails on request
+    """
+    opened = 0
+    failures = {}
+
+    def open(self):
+        FlakyBackend.opened += 1
+        return True
+
+    def send_messages(self, messages):
+        for message in messages:
+            error = self.failures.get(message.to[0])
+            if error:
+                raise error
+        return super().send_messages(messages)
+
+
+@override_settings(
+    EMAIL_BACKEND='communications.tests.FlakyBackend',
+    OUTBOX_RATE_LIMITS={'default': None}, OUTBOX_BATCH_SIZE=10, OUTBOX_RETRY_DELAY=60,
+)
+class OutboxTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        FlakyBackend.opened = 0
+        FlakyBackend.failures = {}
+        outbox.pool.discard()
+        self.addCleanup(outbox.pool.discard)
+        self.user = create_user()
+        self.now = timezone.now()
+
+    def queue(self, *recipients, **kwargs):
+        return EmailLog.objects.bulk_create([
+            EmailLog(
+                user=self.user, email_type='inquiry', recipient_email=recipient, subject='PhD inquiry',
+                body='Dear professor', status=EmailLog.STATUS_QUEUED, next_attempt_at=self.now, **kwargs
+            )
+            for recipient in recipients
+        ])
+
+    def test_batches_share_a_connection(self):
+        self.queue(*[f'professor{index}@uni.example' for index in range(25)])
+        self.assertEqual(outbox.run(), 25)
+        self.assertEqual(len(mail.outbox), 25)
+        self.assertEqual(FlakyBackend.opened, 1)
+        self.assertFalse(EmailLog.objects.exclude(status=EmailLog.STATUS_SENT).exists())
+        self.assertFalse(EmailLog.objects.filter(delivered_at__isnull=True).exists())
+
+    @override_settings(OUTBOX_RATE_LIMITS={'default': None, 'tum.example': 2})
+    def test_rate_limit_per_domain(self):
+        self.queue('a@tum.example', 'b@tum.example', 'c@tum.example', 'd@lmu.example')
+        outbox.process(now=self.now)
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox), ['a@tum.example', 'b@tum.example', 'd@lmu.example'])
+
+        deferred = EmailLog.objects.get(recipient_email='c@tum.example')
+        self.assertEqual((deferred.status, deferred.attempts), (EmailLog.STATUS_QUEUED, 0))
+        self.assertGreater(deferred.next_attempt_at, self.now)
+        self.assertLessEqual(deferred.next_attempt_at, self.now + datetime.timedelta(minutes=1))
+
+    @override_settings(OUTBOX_MAX_ATTEMPTS=2)
+    def test_retries_with_backoff(self):
+        FlakyBackend.failures = {
+            'busy@uni.example': smtplib.SMTPServerDisconnected('Connection lost'),
+            'unknown@uni.example': smtplib.SMTPRecipientsRefused({'unknown@uni.example': (550, b'No such user')}),
+        }
+        self.queue('busy@uni.example', 'unknown@uni.example', 'ok@uni.example')
+        with self.assertLogs('communications.outbox', 'WARNING'):
+            outbox.process(now=self.now)
+
+        busy = EmailLog.objects.get(recipient_email='busy@uni.example')
+        self.assertEqual((busy.status, busy.attempts), (EmailLog.STATUS_QUEUED, 1))
+        self.assertGreaterEqual(busy.next_attempt_at, self.now + datetime.timedelta(seconds=48))
+        self.assertIn('Connection lost', busy.last_error)
+        # Refused recipients are not retried
+        self.assertEqual(EmailLog.objects.get(recipient_email='unknown@uni.example').status, EmailLog.STATUS_FAILED)
+        # The dropped connection was replaced for the remaining messages
+        self.assertEqual(EmailLog.objects.get(recipient_email='ok@uni.example').status, EmailLog.STATUS_SENT)
+        self.assertEqual(FlakyBackend.opened, 2)
+
+        self.assertEqual(outbox.process(now=self.now), 0)
+        with self.assertLogs('communications.outbox', 'WARNING'):
+            outbox.process(now=busy.next_attempt_at)
+        busy.refresh_from_db()
+        self.assertEqual((busy.status, busy.attempts, busy.next_attempt_at), (EmailLog.STATUS_FAILED, 2, None))
+
+    def test_expired_lease_is_reclaimed(self):
+        log, = self.queue('a@uni.example')
+        outbox.claim(self.now, 10)
+        self.assertEqual(outbox.process(now=self.now), 0)
+        outbox.process(now=self.now + datetime.timedelta(seconds=outbox.LEASE))
+        log.refresh_from_db()
+        self.assertEqual(log.status, EmailLog.STATUS_SENT)
+
+
+@override_settings(REMINDER_LEAD_DAYS=(14, 3, 1))
+class DeadlineReminderTests(TestCase):
+    def setUp(self):
+        self.today = datetime.date(2026, 3, 1)
+        self.user = create_user()
+        self.user.email = 'student@example.com'
+        self.user.save()
+        university = create_university('TU Munich')
+        self.program = StudyProgram.objects.create(
+            university=university, name='MSc Hydrology', level='master', field_of_study='Hydrology',
+            duration_months=24, language_of_instruction='English', application_deadline=self.day(14),
+        )
+        self.tracker = ApplicationTracker.objects.create(
+            user=self.user, university=university, program=self.program, application_title='Hydrology MSc',
+            application_deadline=self.day(3),
+        )
+        ApplicationDocument.objects.create(
+            application=self.tracker, document_type='cv', title='CV', deadline=self.day(1),
+        )
+        # Submitted documents need no reminder
+        ApplicationDocument.objects.create(
+            application=self.tracker, document_type='cv', title='Old CV', deadline=self.day(1), status='submitted',
+        )
+        scholarship = Scholarship.objects.create(
+            name='DAAD', provider='DAAD', scholarship_type='full', eligibility_criteria='Open to all',
+            application_deadline=self.day(14),
+        )
+        scholarship.eligible_programs.add(self.program)
+
+    def day(self, offset):
+        return self.today + datetime.timedelta(days=offset)
+
+    def test_one_digest_per_student(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.assertEqual(reminders.run(today=self.today), 1)
+        self.assertEqual(len(callbacks), 1)
+
+        log = EmailLog.objects.get()
+        self.assertEqual((log.status, log.recipient_email), (EmailLog.STATUS_QUEUED, 'student@example.com'))
+        for title in ('Hydrology MSc', 'CV (Hydrology MSc)', 'MSc Hydrology, TU Munich', 'DAAD'):
+            self.assertIn(title, log.body)
+        self.assertNotIn('Old CV', log.body)
+
+        # Nothing new became due
+        self.assertEqual(reminders.run(today=self.today), 0)
+
+    def test_later_runs_only_scan_new_deadlines(self):
+        reminders.run(today=self.today)
+        EmailLog.objects.all().delete()
+        self.assertEqual(reminders.run(today=self.day(1)), 0)
+
+        # Three days out, the tracker's deadline enters the 1-day window
+        reminders.run(today=self.day(2))
+        log = EmailLog.objects.get()
+        self.assertIn('Hydrology MSc', log.body)
+        self.assertNotIn('DAAD', log.body)
+
+    def test_closed_applications_are_skipped(self):
+        self.tracker.status = 'withdrawn'
+        self.tracker.save()
+        self.assertEqual(reminders.run(today=self.today), 0)
+
+
+class DashboardTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = create_user()
+        self.today = timezone.localdate()
+        for index, status in enumerate(['planning', 'preparing', 'submitted', 'submitted', 'rejected']):
+            ApplicationTracker.objects.create(
+                user=self.user, university=create_university(f'University {index}'), application_title=f'Application {index}',
+                status=status, application_deadline=self.today + datetime.timedelta(days=index + 1),
+            )
+        for index in range(4):
+            EmailLog.objects.create(
+                user=self.user, email_type='inquiry', recipient_email=f'prof{index}@example.com',
+                subject='Hello', body='Hello', response_received=index == 0,
+            )
+        EmailLog.objects.create(
+            user=self.user, email_type='inquiry', recipient_email='queued@example.com', subject='Hello', body='Hello',
+            status=EmailLog.STATUS_QUEUED,
+        )
+
+    def test_summary_in_a_fixed_number_of_queries(self):
+        with self.assertNumQueries(7):
+            data = dashboard.summary(self.user)
+            # Listing the applications does not load their universities one by one
+            [str(application) for application in data['recent_applications']]
+            [str(item) for deadline, kind, item in data['upcoming_deadlines']]
+
+        self.assertEqual(data['status_counts']['submitted'], 2)
+        self.assertEqual(data['status_counts']['total'], 5)
+        self.assertEqual(data['pending_applications'], 3)
+        self.assertEqual(data['email_stats']['response_rate'], 25)
+        self.assertEqual(data['email_stats']['queued'], 1)
+        # Rejected applications have no deadline to meet
+        self.assertEqual([item.application_title for deadline, kind, item in data['upcoming_deadlines']],
+                         ['Application 0', 'Application 1'])
+
+        with self.assertNumQueries(0):
+            dashboard.summary(self.user)
+
+    def test_writes_invalidate_the_cache(self):
+        dashboard.summary(self.user)
+        log = EmailLog.objects.filter(status=EmailLog.STATUS_SENT, response_received=False).first()
+        log.response_received = True
+        log.save()
+        self.assertEqual(dashboard.summary(self.user)['email_stats']['response_rate'], 50)
+
+        ApplicationTracker.objects.filter(status='planning').get().delete()
+        self.assertEqual(dashboard.summary(self.user)['status_counts']['total'], 4)
+
+    def test_view(self):
+        request = RequestFactory().get(reverse('communications:dashboard'))
+        request.user = self.user
+        response = CommunicationsDashboard.as_view()(request)
+        self.assertEqual(response.context_data['pending_applications'], 3)
+        self.assertEqual(len(response.context_data['recent_emails']), 5)
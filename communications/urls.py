@@ -8,6 +8,7 @@ urlpatterns = [
     path('templates/', views.EmailTemplateListView.as_view(), name='templates'),
     path('templates/<int:pk>/', views.EmailTemplateDetailView.as_view(), name='template_detail'),
     path('compose/', views.EmailComposeView.as_view(), name='compose'),
+    path('compose/bulk/', views.BulkEmailComposeView.as_view(), name='compose_bulk'),
     path('applications/', views.ApplicationTrackerListView.as_view(), name='applications'),
     path('applications/create/', views.ApplicationTrackerCreateView.as_view(), name='application_create'),
     path('applications/<int:pk>/', views.ApplicationTrackerDetailView.as_view(), name='application_detail'),
@@ -1,10 +1,14 @@
 from django.shortcuts import render, get_object_or_404, redirect
-from django.views.generic import ListView, DetailView, CreateView, UpdateView, TemplateView
+from django.views.generic import ListView, DetailView, CreateView, UpdateView, TemplateView, FormView
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib import messages
 from django.urls import reverse_lazy
-from django.utils.translation import gettext_lazy as _
+from django.utils.translation import get_language, gettext_lazy as _
 
+from kurdish_apply.pagination import CursorPaginationMixin
+
+from . import dashboard, mailmerge, rendering
+from .forms import BulkComposeForm
 from .models import EmailTemplate, ApplicationTracker, CommunicationTip, EmailLog, ApplicationDocument
 
 
@@ -13,16 +17,7 @@ class CommunicationsDashboard(LoginRequiredMixin, TemplateView):
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        user = self.request.user
-        
-        context.update({
-            'recent_applications': ApplicationTracker.objects.filter(user=user)[:5],
-            'recent_emails': EmailLog.objects.filter(user=user)[:5],
-            'pending_applications': ApplicationTracker.objects.filter(
-                user=user, status__in=['preparing', 'submitted', 'under_review']
-            ).count(),
-            'communication_tips': CommunicationTip.objects.filter(is_active=True)[:3],
-        })
+        context.update(dashboard.summary(self.request.user))
         return context
 
 
@@ -51,6 +46,17 @@ class EmailTemplateDetailView(DetailView):
             'program': 'Master of Science',
             'field': 'Computer Science',
         }
+        try:
+            compiled = rendering.get_compiled(self.object)
+        except rendering.EmailTemplateError as error:
+            # A template broken in the admin shows its raw text instead of a preview
+            context['preview'] = None
+            context['preview_error'] = str(error)
+            return context
+        # Variables without a sample value stay visible as placeholders
+        preview_values = {name: f'{{{name}}}' for name in compiled.variables}
+        preview_values.update(context['sample_variables'])
+        context['preview'] = compiled.render(preview_values)
         return context
 
 
@@ -72,6 +78,39 @@ class EmailComposeView(LoginRequiredMixin, TemplateView):
         return context
 
 
+class BulkEmailComposeView(LoginRequiredMixin, FormView):
+    """
+    Send one template to the supervisors of several tracked applications
+    """
+    template_name = 'communications/compose_bulk.html'
+    form_class = BulkComposeForm
+    success_url = reverse_lazy('communications:email_log')
+    
+    def get_form_kwargs(self):
+        kwargs = super().get_form_kwargs()
+        kwargs['user'] = self.request.user
+        return kwargs
+    
+    def get_initial(self):
+        initial = super().get_initial()
+        initial['language'] = get_language()
+        if self.request.GET.get('template'):
+            initial['template'] = self.request.GET['template']
+        if self.request.GET.get('applications'):
+            initial['applications'] = self.request.GET['applications'].split(',')
+        return initial
+    
+    def form_valid(self, form):
+        logs = mailmerge.compose(
+            self.request.user,
+            form.cleaned_data['template'],
+            form.cleaned_data['applications'],
+            form.cleaned_data['language'],
+        )
+        messages.success(self.request, _('%(count)d emails are being sent.') % {'count': len(logs)})
+        return super().form_valid(form)
+
+
 class ApplicationTrackerListView(LoginRequiredMixin, ListView):
     model = ApplicationTracker
     template_name = 'communications/applications.html'
@@ -79,7 +118,7 @@ class ApplicationTrackerListView(LoginRequiredMixin, ListView):
     paginate_by = 10
     
     def get_queryset(self):
-        return ApplicationTracker.objects.filter(user=self.request.user).order_by('-updated_at')
+        return ApplicationTracker.objects.with_related().filter(user=self.request.user).order_by('-updated_at')
 
 
 class ApplicationTrackerCreateView(LoginRequiredMixin, CreateView):
@@ -103,11 +142,11 @@ class ApplicationTrackerDetailView(LoginRequiredMixin, DetailView):
     context_object_name = 'application'
     
     def get_queryset(self):
-        return ApplicationTracker.objects.filter(user=self.request.user)
+        return ApplicationTracker.objects.with_related().filter(user=self.request.user)
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        application = self.get_object()
+        application = self.object
         
         context.update({
             'documents': application.documents.all(),
@@ -124,7 +163,7 @@ class ApplicationTrackerEditView(LoginRequiredMixin, UpdateView):
              'application_fee', 'notes', 'progress_notes']
     
     def get_queryset(self):
-        return ApplicationTracker.objects.filter(user=self.request.user)
+        return ApplicationTracker.objects.with_related().filter(user=self.request.user)
     
     def form_valid(self, form):
         messages.success(self.request, _('Application tracker updated successfully!'))
@@ -143,7 +182,7 @@ class CommunicationTipsView(ListView):
         return CommunicationTip.objects.filter(is_active=True).order_by('-priority', 'title')
 
 
-class EmailLogView(LoginRequiredMixin, ListView):
+class EmailLogView(LoginRequiredMixin, CursorPaginationMixin, ListView):
     model = EmailLog
     template_name = 'communications/email_log.html'
     context_object_name = 'emails'
@@ -0,0 +1,132 @@
+"""
+Page data caching for the public destination pages.
+
+The overview, country and university pages are read far more often than the
+catalogue changes. Each page belongs to a cache scope (``overview``,
+``country:<code>``, ``university:<pk>``) with a generation counter; the
+signals in ``destinations.signals`` bump the counters of every scope a saved
+or deleted object appears in, so stale entries are simply never read again.
+
+Model instances carry every translated column, so the cached page data is
+shared by all languages. Rendered fragments differ per language and are
+cached in the templates with ``{% cache %}``, keyed by ``LANGUAGE_CODE`` and
+the ``page_cache_version`` this module puts in the context.
+"""
+import hashlib
+from functools import lru_cache
+
+from django.core.cache import cache
+from django.http import Http404
+from django.template import TemplateDoesNotExist
+from django.template.loader import get_template
+
+from kurdish_apply import database
+
+
+PAGE_TIMEOUT = 60 * 15
+
+GENERATION_KEY = 'destinations:generation:{}'
+PAGE_KEY = 'destinations:page:{}:{}'
+
+OVERVIEW = 'overview'
+
+
+def country_scope(code):
+    return f'country:{code}'
+
+
+def university_scope(pk):
+    return f'university:{pk}'
+
+
+def bump(*scopes):
+    """
+    Invalidate every cached page in ``scopes``
+    """
+    for scope in set(scopes):
+        key = GENERATION_KEY.format(scope)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Unknown (or evicted) counters restart at a value no entry was stored under
+            cache.set(key, 1, None)
+
+
+def generation(scope):
+    return cache.get(GENERATION_KEY.format(scope), 0)
+
+
+@lru_cache(maxsize=None)
+def _digest(source):
+    return hashlib.md5(source.encode()).hexdigest()[:8]
+
+
+def template_version(template_name):
+    """
+    Short hash of a template's source, so a deploy that edits it starts a fresh cache
+    """
+    try:
+        template = get_template(template_name)
+    except TemplateDoesNotExist:
+        return ''
+    return _digest(template.template.source)
+
+
+class CachedPageMixin:
+    """
+    Cache the database-backed part of a page for anonymous and signed-in visitors alike
+
+    Subclasses return their data, fully evaluated, from ``get_page_data()``
+    and name their scope in ``get_cache_scope()``. Detail views also get their
+    object from the cache, so a hit does not touch the database.
+    """
+    page_timeout = PAGE_TIMEOUT
+
+    def get_cache_scope(self):
+        raise NotImplementedError
+
+    def get_page_data(self):
+        return {}
+
+    @property
+    def page_cache_version(self):
+        if not hasattr(self, '_page_cache_version'):
+            scope = self.get_cache_scope()
+            self._page_cache_version = f'{generation(scope)}.{template_version(self.template_name)}'
+        return self._page_cache_version
+
+    def page_data(self):
+        if not hasattr(self, '_page_data'):
+            key = PAGE_KEY.format(self.get_cache_scope(), self.page_cache_version)
+            data = cache.get(key)
+            if data is None:
+                # The entry is kept for the whole generation, so it is never built from a lagging replica
+                with database.primary():
+                    data = self.get_page_data()
+                cache.set(key, data, self.page_timeout)
+            self._page_data = data
+        return self._page_data
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context.update(self.page_data())
+        context['page_cache_version'] = self.page_cache_version
+        return context
+
+
+class CachedObjectMixin(CachedPageMixin):
+    """
+    ``CachedPageMixin`` for DetailViews: the object is part of the cached data
+    """
+    def get_page_data(self):
+        # Missing objects are not cached; the 404 is raised before anything is stored
+        self.object = super().get_object()
+        return {'object': self.object}
+
+    def get_object(self, queryset=None):
+        if queryset is not None:
+            return super().get_object(queryset)
+        obj = self.page_data().get('object')
+        if obj is None:
+            raise Http404
+        return obj
@@ -0,0 +1,179 @@
+"""
+Facet counts for the program catalogue.
+
+All counts come from one grouped aggregation over the listing before facet
+filters are applied. Each result row is a distinct combination of facet
+values with its program count, so the count shown for a facet value (under
+the other selected facets) is a sum over the matching rows, without one
+query per facet.
+"""
+from collections import Counter
+
+from django.conf import settings
+from django.db.models import Case, CharField, Count, Value, When
+from django.utils.translation import get_language, gettext_lazy as _
+from modeltranslation.utils import build_localized_fieldname
+
+from .models import StudyProgram
+
+
+# (key, label, exclusive upper bound) in ascending order; fees are compared
+# as stored, in the program's own currency
+TUITION_BUCKETS = (
+    ('free', _('Free'), None),
+    ('under_5000', _('Under 5,000'), 5000),
+    ('5000_15000', _('5,000 - 15,000'), 15000),
+    ('15000_30000', _('15,000 - 30,000'), 30000),
+    ('over_30000', _('Over 30,000'), None),
+    ('unknown', _('Not specified'), None),
+)
+
+
+def tuition_bucket():
+    """
+    Expression mapping ``tuition_fee`` onto a ``TUITION_BUCKETS`` key
+    """
+    whens = [
+        When(tuition_fee__isnull=True, then=Value('unknown')),
+        When(tuition_fee__lte=0, then=Value('free')),
+    ]
+    whens += [
+        When(tuition_fee__lt=upper, then=Value(key))
+        for key, label, upper in TUITION_BUCKETS if upper is not None
+    ]
+    return Case(*whens, default=Value('over_30000'), output_field=CharField())
+
+
+class Facet:
+    """
+    One filterable dimension of the program listing, exposed as ``?<name>=<value>``
+    """
+    def __init__(self, name, label, lookup, choices=None):
+        self.name = name
+        self.label = label
+        self.lookup = lookup
+        # Fixed choices keep their declared order; open-ended values sort by count
+        self.choices = dict(choices) if choices is not None else None
+
+    def value(self, row):
+        return str(row[self.lookup])
+
+    def value_label(self, value, row):
+        if self.choices is not None:
+            return self.choices.get(value, value)
+        return value
+
+    def filter(self, queryset, value):
+        return queryset.filter(**{self.lookup: value})
+
+
+class BooleanFacet(Facet):
+    def value(self, row):
+        return '1' if row[self.lookup] else '0'
+
+    def filter(self, queryset, value):
+        return queryset.filter(**{self.lookup: value == '1'})
+
+
+class CountryFacet(Facet):
+    def __init__(self, name, label):
+        super().__init__(name, label, 'university__country__code')
+
+    def label_lookups(self):
+        # Grouping by the localized names adds no rows: they depend on the code
+        languages = (get_language(), settings.MODELTRANSLATION_DEFAULT_LANGUAGE)
+        return list(dict.fromkeys(
+            f"university__country__{build_localized_fieldname('name', language)}"
+            for language in languages
+            if language in settings.MODELTRANSLATION_LANGUAGES
+        ))
+
+    def value_label(self, value, row):
+        for lookup in self.label_lookups():
+            if row.get(lookup):
+                return row[lookup]
+        return value
+
+
+PROGRAM_FACETS = (
+    Facet('level', _('Program Level'), 'level', StudyProgram.PROGRAM_LEVELS),
+    Facet('language', _('Language of Instruction'), 'language_of_instruction'),
+    CountryFacet('country', _('Country')),
+    BooleanFacet('scholarships', _('Scholarships Available'), 'scholarships_available',
+                 [('1', _('Yes')), ('0', _('No'))]),
+    Facet('tuition', _('Tuition Fee'), 'tuition_bucket',
+          [(key, label) for key, label, upper in TUITION_BUCKETS]),
+)
+
+
+def selected_facets(params, facets=PROGRAM_FACETS):
+    """
+    Pick the facet values selected in ``params`` (e.g. ``request.GET``)
+    """
+    return {facet.name: params[facet.name] for facet in facets if params.get(facet.name)}
+
+
+def apply_facets(queryset, selected, facets=PROGRAM_FACETS):
+    queryset = queryset.annotate(tuition_bucket=tuition_bucket())
+    for facet in facets:
+        if facet.name in selected:
+            queryset = facet.filter(queryset, selected[facet.name])
+    return queryset
+
+
+def count_facets(queryset, selected, facets=PROGRAM_FACETS):
+    """
+    Count programs per facet value in a single grouped query
+
+    ``queryset`` is the listing without facet filters. Each facet's counts
+    honour every other selected facet but not its own, so the sidebar shows
+    how many results picking a different value would give.
+
+    Returns ``[{'name', 'label', 'values': [{'value', 'label', 'count', 'selected'}]}]``.
+    """
+    lookups = [facet.lookup for facet in facets]
+    for facet in facets:
+        if isinstance(facet, CountryFacet):
+            lookups += facet.label_lookups()
+    rows = list(
+        queryset.annotate(tuition_bucket=tuition_bucket())
+        .order_by()
+        .values(*lookups)
+        .annotate(total=Count('pk'))
+    )
+
+    keyed_rows = [({facet.name: facet.value(row) for facet in facets}, row) for row in rows]
+    results = []
+    for facet in facets:
+        others = {name: value for name, value in selected.items() if name != facet.name}
+        counts = Counter()
+        labels = {}
+        for values, row in keyed_rows:
+            if all(values[name] == value for name, value in others.items()):
+                value = values[facet.name]
+                counts[value] += row['total']
+                labels.setdefault(value, facet.value_label(value, row))
+
+        if facet.choices is not None:
+            ordered = [value for value in facet.choices if value in counts]
+        else:
+            ordered = sorted(counts, key=lambda value: (-counts[value], str(labels[value])))
+        chosen = selected.get(facet.name)
+        if chosen and chosen not in counts:
+            ordered.append(chosen)
+            labels[chosen] = facet.choices.get(chosen, chosen) if facet.choices else chosen
+
+        results.append({
+            'name': facet.name,
+            'label': facet.label,
+            'values': [
+                {
+                    'value': value,
+                    'label': labels[value],
+                    'count': counts[value],
+                    'selected': value == chosen,
+                }
+                for value in ordered
+            ],
+        })
+    return results
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from destinations import similarity
+
+
+class Command(BaseCommand):
+    help = 'Recompute the similar-programs index for every active study program'
+
+    def handle(self, *args, **options):
+        links = similarity.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Stored {links} similar-program links.'))
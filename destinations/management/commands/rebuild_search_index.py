@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from destinations import search
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index for countries, universities, programs and scholarships'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        using = options['database']
+        if search.get_backend(connections[using]) is None:
+            self.stdout.write(self.style.WARNING(
+                'This database has no full-text support; searches use icontains lookups.'
+            ))
+            return
+
+        with transaction.atomic(using=using):
+            search.create_tables(connections[using])
+            for model in search.SEARCH_FIELDS:
+                search.rebuild(model, using=using)
+                self.stdout.write(f'Indexed {model._default_manager.using(using).count()} {model._meta.verbose_name_plural}')
+        self.stdout.write(self.style.SUCCESS('Search index rebuilt.'))
@@ -0,0 +1,60 @@
+from django.db import migrations
+
+# The search index as it was created here; destinations.search has moved on
+# since, so the SQL is kept with the migration.
+MODEL_TABLES = (
+    "destinations_country",
+    "destinations_university",
+    "destinations_studyprogram",
+    "destinations_scholarship",
+)
+
+SQLITE_CREATE = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS {table} "
+    "USING fts5(document, tokenize = 'unicode61 remove_diacritics 2')"
+)
+
+POSTGRES_CREATE = (
+    "CREATE TABLE IF NOT EXISTS {table} ("
+    "object_id bigint PRIMARY KEY, "
+    "document text NOT NULL, "
+    "vector tsvector GENERATED ALWAYS AS (to_tsvector('simple', document)) STORED)",
+    "CREATE INDEX IF NOT EXISTS {table}_vector ON {table} USING GIN (vector)",
+)
+
+
+def has_fts5(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA compile_options")
+        return any(row[0] == "ENABLE_FTS5" for row in cursor.fetchall())
+
+
+def create_statements(connection):
+    if connection.vendor == "postgresql":
+        return POSTGRES_CREATE
+    if connection.vendor == "sqlite" and has_fts5(connection):
+        return (SQLITE_CREATE,)
+    # No full-text support: searches fall back to icontains
+    return ()
+
+
+def create_search_tables(apps, schema_editor):
+    for table in MODEL_TABLES:
+        for statement in create_statements(schema_editor.connection):
+            schema_editor.execute(statement.format(table=f"{table}_fts"))
+
+
+def drop_search_tables(apps, schema_editor):
+    for table in MODEL_TABLES:
+        schema_editor.execute(f"DROP TABLE IF EXISTS {table}_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("destinations", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_tables, drop_search_tables),
+    ]
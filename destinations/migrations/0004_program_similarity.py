@@ -0,0 +1,103 @@
+# Generated by Django 4.2.30 on 2026-10-18 15:03
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("destinations", "0003_search_documents_per_language"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SimilarProgram",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("score", models.FloatField()),
+                (
+                    "program",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="similar_links",
+                        to="destinations.studyprogram",
+                    ),
+                ),
+                (
+                    "similar",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="similar_to_links",
+                        to="destinations.studyprogram",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Similar Program",
+                "verbose_name_plural": "Similar Programs",
+                "indexes": [
+                    models.Index(
+                        fields=["program", "-score"],
+                        name="destination_program_63107a_idx",
+                    )
+                ],
+                "unique_together": {("program", "similar")},
+            },
+        ),
+        migrations.CreateModel(
+            name="ProgramTerm",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "level",
+                    models.CharField(
+                        choices=[
+                            ("bachelor", "Bachelor's Degree"),
+                            ("master", "Master's Degree"),
+                            ("phd", "PhD"),
+                            ("postdoc", "Postdoctoral"),
+                            ("professional", "Professional Program"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("term", models.CharField(max_length=100)),
+                ("weight", models.FloatField()),
+                (
+                    "program",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="similarity_terms",
+                        to="destinations.studyprogram",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Program Term",
+                "verbose_name_plural": "Program Terms",
+                "indexes": [
+                    models.Index(
+                        fields=["level", "term"], name="destination_level_20784a_idx"
+                    )
+                ],
+                "unique_together": {("program", "term")},
+            },
+        ),
+    ]
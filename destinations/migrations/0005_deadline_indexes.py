@@ -0,0 +1,25 @@
+# Generated by Django 4.2.30 on 2026-10-18 15:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("destinations", "0004_program_similarity"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="scholarship",
+            index=models.Index(
+                fields=["application_deadline"], name="destination_applica_91741c_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="studyprogram",
+            index=models.Index(
+                fields=["application_deadline"], name="destination_applica_6de886_idx"
+            ),
+        ),
+    ]
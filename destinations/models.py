@@ -1,7 +1,42 @@
 from django.db import models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.utils.translation import gettext_lazy as _
 
 
+def _count_subquery(queryset, outer_field):
+    """
+    Correlated COUNT(*) of ``queryset`` rows whose ``outer_field`` points at the outer row
+    """
+    counts = (
+        queryset.filter(**{outer_field: OuterRef('pk')})
+        .order_by()
+        .values(outer_field)
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+class CountryQuerySet(models.QuerySet):
+    def with_counts(self):
+        """
+        Annotate active university, scholarship and program counts in the listing query
+        """
+        return self.annotate(
+            university_count=_count_subquery(
+                University.objects.filter(is_active=True), 'country'
+            ),
+            scholarship_count=_count_subquery(
+                Scholarship.objects.filter(is_active=True), 'country'
+            ),
+            program_count=_count_subquery(
+                StudyProgram.objects.filter(is_active=True, university__is_active=True),
+                'university__country'
+            ),
+        )
+
+
 class Country(models.Model):
     """
     Model for destination countries with study opportunities
@@ -44,6 +79,8 @@ class Country(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = CountryQuerySet.as_manager()
+    
     def __str__(self):
         return self.name
     
@@ -160,6 +197,7 @@ class StudyProgram(models.Model):
         verbose_name = _('Study Program')
         verbose_name_plural = _('Study Programs')
         ordering = ['university__name', 'level', 'name']
+        indexes = [models.Index(fields=['application_deadline'])]
 
 
 class Scholarship(models.Model):
@@ -208,4 +246,43 @@ class Scholarship(models.Model):
     class Meta:
         verbose_name = _('Scholarship')
         verbose_name_plural = _('Scholarships')
-        ordering = ['-application_deadline', 'name']
\ No newline at end of file
+        ordering = ['-application_deadline', 'name']
+        indexes = [models.Index(fields=['application_deadline'])]
+
+
+class ProgramTerm(models.Model):
+    """
+    Weighted term of a program's similarity vector, used as an inverted index
+    """
+    program = models.ForeignKey(StudyProgram, on_delete=models.CASCADE, related_name='similarity_terms')
+    # Copied from the program so candidate lookups stay within one level
+    level = models.CharField(max_length=20, choices=StudyProgram.PROGRAM_LEVELS)
+    term = models.CharField(max_length=100)
+    weight = models.FloatField()
+    
+    def __str__(self):
+        return f"{self.term} ({self.weight:.3f})"
+    
+    class Meta:
+        verbose_name = _('Program Term')
+        verbose_name_plural = _('Program Terms')
+        unique_together = [('program', 'term')]
+        indexes = [models.Index(fields=['level', 'term'])]
+
+
+class SimilarProgram(models.Model):
+    """
+    Precomputed neighbour of a program, kept as a top-K list per program
+    """
+    program = models.ForeignKey(StudyProgram, on_delete=models.CASCADE, related_name='similar_links')
+    similar = models.ForeignKey(StudyProgram, on_delete=models.CASCADE, related_name='similar_to_links')
+    score = models.FloatField()
+    
+    def __str__(self):
+        return f"{self.program_id} ~ {self.similar_id} ({self.score:.3f})"
+    
+    class Meta:
+        verbose_name = _('Similar Program')
+        verbose_name_plural = _('Similar Programs')
+        unique_together = [('program', 'similar')]
+        indexes = [models.Index(fields=['program', '-score'])]
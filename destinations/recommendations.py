@@ -0,0 +1,307 @@
+"""
+Destination recommendations for the quiz.
+
+Every active program (with its university and country) is flattened into one
+row of a NumPy feature matrix: ratings, estimated yearly cost, visa rules,
+Kurdish community presence and scholarship availability. Scoring a set of
+quiz answers is then a handful of vectorized operations over that matrix, and
+universities and countries are ranked by their best-scoring program.
+
+The matrix is built once per process and rebuilt when a destination model is
+saved (see ``invalidate``) or after ``MATRIX_TTL`` seconds.
+"""
+import bisect
+import re
+import threading
+import time
+from collections import defaultdict
+
+import numpy as np
+from django.core.cache import cache
+
+from .models import Country, University, StudyProgram
+from .search import normalize
+
+
+MATRIX_TTL = 300
+VERSION_KEY = 'destinations:recommendations:version'
+
+# Yearly budget answers in USD; None means no limit
+BUDGETS = {
+    'low': 10000,
+    'medium': 25000,
+    'high': 50000,
+    'any': None,
+}
+
+BASE_WEIGHTS = {
+    'field': 4.0,
+    'quality': 2.0,
+    'cost': 2.0,
+    'work': 1.0,
+    'community': 1.0,
+    'scholarship': 1.0,
+    'difficulty': 1.0,
+}
+
+# Regional adjustments: students with harder access to documents and
+# institutions gain more from easy applications, funding and community
+REGION_WEIGHTS = {
+    'rojava': {'difficulty': 2.0, 'scholarship': 2.0, 'community': 1.5},
+    'rojhelat': {'difficulty': 1.5, 'scholarship': 1.5},
+    'bakur': {'community': 1.5},
+    'bashur': {},
+    'diaspora': {'community': 0.5},
+}
+
+# Picking a priority in the quiz doubles its weight
+PRIORITIES = ('quality', 'cost', 'work', 'community', 'scholarship')
+
+LEVELS = [level for level, label in StudyProgram.PROGRAM_LEVELS]
+
+
+def _tokens(text):
+    return {token for token in re.findall(r'\w+', normalize(text)) if len(token) > 2}
+
+
+def _is_usd(currency):
+    return (currency or '').strip().upper() == 'USD'
+
+
+class CandidateMatrix:
+    """
+    Column-oriented features of every recommendable program
+    """
+    def __init__(self, rows):
+        count = len(rows)
+        self.program_ids = np.fromiter((row['pk'] for row in rows), dtype=np.int64, count=count)
+        self.university_ids = np.fromiter((row['university'] for row in rows), dtype=np.int64, count=count)
+        self.country_ids = np.fromiter((row['university__country'] for row in rows), dtype=np.int64, count=count)
+        self.levels = np.fromiter((LEVELS.index(row['level']) if row['level'] in LEVELS else -1 for row in rows),
+                                  dtype=np.int8, count=count)
+
+        def column(key, default=np.nan):
+            return np.fromiter(
+                (default if row[key] is None else float(row[key]) for row in rows),
+                dtype=np.float64, count=count,
+            )
+
+        # Ratings are 1-5; scale their mean to 0-1
+        ratings = np.vstack([
+            column('university__country__study_quality', 3),
+            column('university__academic_reputation', 3),
+            column('university__research_opportunities', 3),
+            column('university__international_support', 3),
+            column('university__country__living_quality', 3),
+        ])
+        self.quality = (ratings.mean(axis=0) - 1) / 4
+        self.difficulty = (column('university__country__application_difficulty', 3) - 1) / 4
+
+        # Fees in other currencies are not converted; the country's USD average stands in for them
+        tuition = np.fromiter(
+            (float(row['tuition_fee']) if row['tuition_fee'] is not None and _is_usd(row['currency']) else np.nan
+             for row in rows),
+            dtype=np.float64, count=count,
+        )
+        tuition = np.where(np.isnan(tuition), column('university__country__avg_tuition_usd'), tuition)
+        living = np.nan_to_num(column('university__country__avg_living_cost_usd'), nan=0.0)
+        self.cost = tuition + living
+
+        self.work = (column('university__country__work_permit_allowed', 0)
+                     + column('university__country__post_study_work_visa', 0)) / 2
+        self.community = np.fromiter((bool(row['university__country__kurdish_population']) for row in rows),
+                                     dtype=np.float64, count=count)
+        self.scholarship = column('scholarships_available', 0)
+
+        postings = defaultdict(list)
+        for index, row in enumerate(rows):
+            for token in _tokens(f"{row['field_of_study']} {row['name']}"):
+                postings[token].append(index)
+        self.postings = {token: np.array(indexes, dtype=np.int64) for token, indexes in postings.items()}
+        self.terms = sorted(self.postings)
+        self.built_at = time.monotonic()
+
+    def __len__(self):
+        return len(self.program_ids)
+
+    @classmethod
+    def build(cls):
+        rows = list(
+            StudyProgram.objects.filter(
+                is_active=True, university__is_active=True, university__country__is_active=True
+            ).order_by().values(
+                'pk', 'name', 'level', 'field_of_study', 'tuition_fee', 'currency', 'scholarships_available',
+                'university', 'university__country',
+                'university__academic_reputation', 'university__research_opportunities',
+                'university__international_support',
+                'university__country__study_quality', 'university__country__living_quality',
+                'university__country__application_difficulty',
+                'university__country__avg_tuition_usd', 'university__country__avg_living_cost_usd',
+                'university__country__work_permit_allowed', 'university__country__post_study_work_visa',
+                'university__country__kurdish_population',
+            )
+        )
+        return cls(rows)
+
+    def field_match(self, text):
+        """
+        Share of the query's tokens that occur in each program's field or name
+        """
+        tokens = _tokens(text)
+        matches = np.zeros(len(self), dtype=np.float64)
+        if not tokens:
+            return matches
+        for token in tokens:
+            # Prefix matching over the sorted vocabulary, so "comput" finds "computer" and "computing"
+            hits = np.zeros(len(self), dtype=bool)
+            position = bisect.bisect_left(self.terms, token)
+            while position < len(self.terms) and self.terms[position].startswith(token):
+                hits[self.postings[self.terms[position]]] = True
+                position += 1
+            matches += hits
+        return matches / len(tokens)
+
+    def cost_fit(self, budget):
+        if budget is None:
+            return np.full(len(self), 0.5)
+        fit = 1 - np.clip(self.cost / budget, 0, 2) / 2
+        # Unknown costs score as neutral rather than free
+        return np.where(np.isnan(self.cost), 0.5, fit)
+
+
+_matrix = None
+_matrix_version = None
+_lock = threading.Lock()
+
+
+def invalidate():
+    """
+    Mark every process's matrix stale; called when destinations change
+    """
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, 1, None)
+
+
+def _is_stale(matrix, built_version, version):
+    return matrix is None or built_version != version or time.monotonic() - matrix.built_at > MATRIX_TTL
+
+
+def get_matrix():
+    global _matrix, _matrix_version
+    version = cache.get(VERSION_KEY, 0)
+    matrix = _matrix
+    if _is_stale(matrix, _matrix_version, version):
+        with _lock:
+            # Another thread may have rebuilt it while we waited
+            if _is_stale(_matrix, _matrix_version, version):
+                _matrix = CandidateMatrix.build()
+                _matrix_version = version
+            matrix = _matrix
+    return matrix
+
+
+def quiz_preferences(answers, user=None):
+    """
+    Merge quiz ``answers`` over the user's profile into scoring preferences
+    """
+    profile = {}
+    if user is not None and user.is_authenticated:
+        profile = {
+            'study_level': user.preferred_study_level,
+            'field': ' '.join(filter(None, [user.field_of_study, user.research_interests])),
+            'region': user.region,
+        }
+    preferences = {key: answers.get(key) or profile.get(key) or '' for key in ('study_level', 'field', 'region')}
+    preferences['budget'] = BUDGETS.get(answers.get('budget'), None)
+    preferences['priority'] = answers.get('priority') if answers.get('priority') in PRIORITIES else ''
+    return preferences
+
+
+def score(matrix, preferences):
+    """
+    Score every program in ``matrix``; excluded programs get -inf
+    """
+    weights = dict(BASE_WEIGHTS)
+    for key, factor in REGION_WEIGHTS.get(preferences.get('region'), {}).items():
+        weights[key] *= factor
+    if preferences.get('priority'):
+        weights[preferences['priority']] *= 2
+
+    scores = (
+        weights['field'] * matrix.field_match(preferences.get('field', ''))
+        + weights['quality'] * matrix.quality
+        + weights['cost'] * matrix.cost_fit(preferences.get('budget'))
+        + weights['work'] * matrix.work
+        + weights['community'] * matrix.community
+        + weights['scholarship'] * matrix.scholarship
+        - weights['difficulty'] * matrix.difficulty
+    )
+    level = preferences.get('study_level')
+    if level in LEVELS:
+        scores = np.where(matrix.levels == LEVELS.index(level), scores, -np.inf)
+    return scores
+
+
+def _top(ids, scores, limit):
+    valid = np.isfinite(scores)
+    ids, scores = ids[valid], scores[valid]
+    if len(ids) > limit:
+        keep = np.argpartition(-scores, limit - 1)[:limit]
+        ids, scores = ids[keep], scores[keep]
+    order = np.lexsort((ids, -scores))
+    return [(int(ids[i]), float(scores[i])) for i in order]
+
+
+def _best_per_group(groups, scores):
+    """
+    Highest program score per university or country id
+    """
+    valid = np.isfinite(scores)
+    unique, inverse = np.unique(groups[valid], return_inverse=True)
+    best = np.full(len(unique), -np.inf)
+    np.maximum.at(best, inverse, scores[valid])
+    return unique, best
+
+
+def _with_objects(queryset, ranked):
+    objects = queryset.in_bulk([pk for pk, _ in ranked])
+    return [{'object': objects[pk], 'score': round(value, 3)} for pk, value in ranked if pk in objects]
+
+
+def _programs(ranked):
+    return _with_objects(StudyProgram.objects.select_related('university', 'university__country'), ranked)
+
+
+def for_user(user, limit=3):
+    """
+    Programs ranked for ``user``'s profile alone, for pages without quiz answers
+    """
+    matrix = get_matrix()
+    if not len(matrix):
+        return []
+    return _programs(_top(matrix.program_ids, score(matrix, quiz_preferences({}, user)), limit))
+
+
+def recommend(answers, user=None, limit=10):
+    """
+    Rank programs, universities and countries for quiz ``answers``
+
+    Returns ``{'programs': [...], 'universities': [...], 'countries': [...]}``
+    where each entry is ``{'object', 'score'}``, best first.
+    """
+    matrix = get_matrix()
+    if not len(matrix):
+        return {'programs': [], 'universities': [], 'countries': []}
+
+    scores = score(matrix, quiz_preferences(answers, user))
+    return {
+        'programs': _programs(_top(matrix.program_ids, scores, limit)),
+        'universities': _with_objects(
+            University.objects.select_related('country'),
+            _top(*_best_per_group(matrix.university_ids, scores), limit),
+        ),
+        'countries': _with_objects(Country.objects.all(), _top(*_best_per_group(matrix.country_ids, scores), limit)),
+    }
+
@@ -0,0 +1,391 @@
+"""
+Full-text search index for destination listings.
+
+Every searchable model gets one companion ``<db_table>_fts_<language>`` table
+per language in ``MODELTRANSLATION_LANGUAGES``, keyed by the object's primary
+key. Each row holds the object's normalized text in that language, so a query
+is answered by a single lookup against the active language's table. SQLite
+stores the tables as FTS5 virtual tables, PostgreSQL as regular tables with a
+generated ``tsvector`` column and a GIN index. Other backends fall back to
+``icontains`` lookups over the same fields.
+"""
+import re
+import sqlite3
+import unicodedata
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.exceptions import EmptyResultSet
+from django.db import connections
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.utils.translation import get_language
+from modeltranslation.translator import NotRegistered, translator
+from modeltranslation.utils import build_localized_fieldname
+
+from .models import Country, University, StudyProgram, Scholarship
+
+
+# Fields concatenated into each model's search document. Lookups across
+# relations are denormalized, so the related object's save reindexes us.
+SEARCH_FIELDS = {
+    Country: ('name', 'description'),
+    University: ('name', 'city', 'country__name'),
+    StudyProgram: ('name', 'field_of_study', 'description', 'university__name'),
+    Scholarship: ('name', 'provider', 'description'),
+}
+
+# Untranslated columns that only belong in one language's document
+LANGUAGE_FIELDS = {
+    Country: {'ckb': ('name_sorani',), 'kmr': ('name_kurmanji',)},
+}
+
+# Upper bound on ranked matches returned to a listing
+MAX_RESULTS = 500
+
+# Queries longer than this are truncated rather than rejected
+MAX_TERMS = 8
+
+BATCH_SIZE = 500
+
+
+# Sorani typed on Arabic or Persian keyboards uses look-alike code points;
+# fold them onto the Kurdish letters and drop marks that never distinguish
+# words.
+ARABIC_SCRIPT_FOLDING = str.maketrans({
+    '\u064a': '\u06cc',  # Arabic yeh -> Farsi yeh
+    '\u0649': '\u06cc',  # Alef maksura -> Farsi yeh
+    '\u0643': '\u06a9',  # Arabic kaf -> keheh
+    '\u0629': '\u06d5',  # Teh marbuta -> ae
+    '\u0640': None,  # Tatweel
+    '\u200c': None,  # Zero-width non-joiner
+    '\u200d': None,  # Zero-width joiner
+    '\u0670': None,  # Superscript alef
+    **{chr(code): None for code in range(0x064b, 0x0653)},  # Harakat
+    **{chr(0x0660 + digit): str(digit) for digit in range(10)},
+    **{chr(0x06f0 + digit): str(digit) for digit in range(10)},
+})
+
+# Vowel letters typed as a base letter plus a small v above
+SORANI_COMPOSITIONS = (
+    ('\u06cc\u065a', '\u06ce'),  # yeh -> yeh with small v
+    ('\u0648\u065a', '\u06c6'),  # waw -> oe
+)
+
+# Word-final Arabic heh is the Sorani vowel ae, elsewhere it is heh doachashmee
+FINAL_HEH = re.compile('\u0647(?!\\w)')
+
+
+def fold_arabic_script(text):
+    """
+    Apply Sorani letter folding to any Arabic-script text in ``text``
+    """
+    text = text.translate(ARABIC_SCRIPT_FOLDING)
+    for sequence, letter in SORANI_COMPOSITIONS:
+        text = text.replace(sequence, letter)
+    text = FINAL_HEH.sub('\u06d5', text)
+    return text.replace('\u0647', '\u06be')
+
+
+def strip_latin_diacritics(text):
+    """
+    Drop combining marks on Latin letters, e.g. Kurmanji ê, î, û, ç and ş
+
+    Marks on other scripts are kept, so Sorani hamza-on-yeh survives.
+    """
+    characters = []
+    base = ''
+    for character in unicodedata.normalize('NFD', text):
+        if not unicodedata.combining(character):
+            base = character
+        elif base < '\u0250':  # End of the Latin blocks
+            continue
+        characters.append(character)
+    return unicodedata.normalize('NFC', ''.join(characters)).replace('\u0131', 'i')
+
+
+def normalize(text):
+    """
+    Normalize document or query text for indexing
+
+    Documents mix scripts (a Sorani program description still names its
+    university in Latin letters), so both the Sorani and Kurmanji rules run
+    on every language and only touch characters of their own script.
+    """
+    text = unicodedata.normalize('NFKC', text or '').casefold()
+    return strip_latin_diacritics(fold_arabic_script(text))
+
+
+def index_table(model, language):
+    return f'{model._meta.db_table}_fts_{language}'
+
+
+def resolve_language(language=None):
+    """
+    Map ``language`` (default: the active language) onto an indexed language
+    """
+    language = (language or get_language() or '').split('-')[0]
+    if language in settings.MODELTRANSLATION_LANGUAGES:
+        return language
+    return settings.MODELTRANSLATION_DEFAULT_LANGUAGE
+
+
+def query_terms(query):
+    """
+    Split free text into normalized word tokens safe to embed in a match expression
+    """
+    return re.findall(r'\w+', normalize(query))[:MAX_TERMS]
+
+
+def _translated_fields(model):
+    try:
+        return translator.get_options_for_model(model).fields
+    except NotRegistered:
+        return {}
+
+
+def _field_value(obj, lookup, language):
+    *path, field_name = lookup.split('__')
+    for attr in path:
+        obj = getattr(obj, attr, None)
+        if obj is None:
+            return ''
+
+    if field_name not in _translated_fields(type(obj)):
+        return getattr(obj, field_name)
+    # Mirror modeltranslation's fallback to the default language
+    for candidate in (language, settings.MODELTRANSLATION_DEFAULT_LANGUAGE):
+        value = getattr(obj, build_localized_fieldname(field_name, candidate))
+        if value:
+            return value
+    return ''
+
+
+def build_document(obj, language):
+    model = type(obj)
+    lookups = SEARCH_FIELDS[model] + LANGUAGE_FIELDS.get(model, {}).get(language, ())
+    values = (_field_value(obj, lookup, language) for lookup in lookups)
+    return normalize('\n'.join(str(value) for value in values if value))
+
+
+def _related(model):
+    return [lookup.rsplit('__', 1)[0] for lookup in SEARCH_FIELDS[model] if '__' in lookup]
+
+
+class SQLiteBackend:
+    """
+    FTS5 virtual tables ranked with bm25
+    """
+    def __init__(self, connection):
+        self.connection = connection
+
+    def create(self, table):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {table} "
+                f"USING fts5(document, tokenize = 'unicode61 remove_diacritics 0')"
+            )
+
+    def drop(self, table):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE IF EXISTS {table}')
+
+    def clear(self, table):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {table}')
+
+    def upsert(self, table, rows):
+        with self.connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {table} WHERE rowid = %s', [(pk,) for pk, _ in rows])
+            cursor.executemany(f'INSERT INTO {table} (rowid, document) VALUES (%s, %s)', rows)
+
+    def delete(self, table, pks):
+        with self.connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {table} WHERE rowid = %s', [(pk,) for pk in pks])
+
+    def match(self, table, terms, limit, within=None):
+        expression = ' '.join(f'"{term}"*' for term in terms)
+        sql, params = within or ('', ())
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT rowid FROM {table} WHERE {table} MATCH %s '
+                f'{f"AND rowid IN ({sql}) " if sql else ""}ORDER BY rank LIMIT %s',
+                [expression, *params, limit],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+
+class PostgresBackend:
+    """
+    tsvector columns with GIN indexes ranked with ts_rank
+    """
+    # Text is normalized before it reaches the database, so no stemming
+    config = 'simple'
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def create(self, table):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                f"object_id bigint PRIMARY KEY, "
+                f"document text NOT NULL, "
+                f"vector tsvector GENERATED ALWAYS AS (to_tsvector('{self.config}', document)) STORED)"
+            )
+            cursor.execute(f'CREATE INDEX IF NOT EXISTS {table}_vector ON {table} USING GIN (vector)')
+
+    def drop(self, table):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE IF EXISTS {table}')
+
+    def clear(self, table):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'TRUNCATE {table}')
+
+    def upsert(self, table, rows):
+        with self.connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {table} (object_id, document) VALUES (%s, %s) '
+                f'ON CONFLICT (object_id) DO UPDATE SET document = EXCLUDED.document',
+                rows,
+            )
+
+    def delete(self, table, pks):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {table} WHERE object_id = ANY(%s)', [list(pks)])
+
+    def match(self, table, terms, limit, within=None):
+        expression = ' & '.join(f'{term}:*' for term in terms)
+        sql, params = within or ('', ())
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT object_id FROM {table}, to_tsquery('{self.config}', %s) query "
+                f"WHERE vector @@ query {f'AND object_id IN ({sql}) ' if sql else ''}"
+                f"ORDER BY ts_rank(vector, query) DESC LIMIT %s",
+                [expression, *params, limit],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+
+@lru_cache(maxsize=None)
+def _has_fts5():
+    # Compile options belong to the linked library, not to a database file
+    probe = sqlite3.connect(':memory:')
+    try:
+        return any(row[0] == 'ENABLE_FTS5' for row in probe.execute('PRAGMA compile_options'))
+    finally:
+        probe.close()
+
+
+def get_backend(connection):
+    """
+    Return the index backend for ``connection``, or None when it has no full-text support
+    """
+    if connection.vendor == 'postgresql':
+        return PostgresBackend(connection)
+    if connection.vendor == 'sqlite' and _has_fts5():
+        return SQLiteBackend(connection)
+    return None
+
+
+def _tables():
+    for model in SEARCH_FIELDS:
+        for language in settings.MODELTRANSLATION_LANGUAGES:
+            yield index_table(model, language)
+
+
+def create_tables(connection):
+    backend = get_backend(connection)
+    if backend is not None:
+        for table in _tables():
+            backend.create(table)
+
+
+def drop_tables(connection):
+    backend = get_backend(connection)
+    if backend is not None:
+        for table in _tables():
+            backend.drop(table)
+
+
+def index_objects(model, objects, using='default'):
+    backend = get_backend(connections[using])
+    if backend is None or not objects:
+        return
+    for language in settings.MODELTRANSLATION_LANGUAGES:
+        rows = [(obj.pk, build_document(obj, language)) for obj in objects]
+        backend.upsert(index_table(model, language), rows)
+
+
+def index_queryset(model, queryset):
+    """
+    Reindex every object in ``queryset`` in batches
+    """
+    queryset = queryset.select_related(*_related(model)).order_by('pk')
+    batch = []
+    for obj in queryset.iterator(chunk_size=BATCH_SIZE):
+        batch.append(obj)
+        if len(batch) >= BATCH_SIZE:
+            index_objects(model, batch, using=queryset.db)
+            batch = []
+    index_objects(model, batch, using=queryset.db)
+
+
+def remove_objects(model, pks, using='default'):
+    backend = get_backend(connections[using])
+    if backend is None or not pks:
+        return
+    for language in settings.MODELTRANSLATION_LANGUAGES:
+        backend.delete(index_table(model, language), pks)
+
+
+def rebuild(model, using='default'):
+    backend = get_backend(connections[using])
+    if backend is None:
+        return
+    for language in settings.MODELTRANSLATION_LANGUAGES:
+        backend.clear(index_table(model, language))
+    index_queryset(model, model._default_manager.using(using).all())
+
+
+def _fallback_filter(model, terms):
+    condition = Q()
+    for term in terms:
+        term_condition = Q()
+        for lookup in SEARCH_FIELDS[model]:
+            term_condition |= Q(**{f'{lookup}__icontains': term})
+        condition &= term_condition
+    return condition
+
+
+def search(queryset, query, language=None, limit=MAX_RESULTS):
+    """
+    Filter ``queryset`` to objects matching ``query`` and annotate ``search_rank``
+
+    ``language`` defaults to the active language. Lower ``search_rank``
+    values are better matches, so listings order by it ascending before
+    their usual ordering.
+    """
+    model = queryset.model
+    terms = query_terms(query)
+    if not terms:
+        return queryset.annotate(search_rank=Value(0)).none()
+
+    backend = get_backend(connections[queryset.db])
+    if backend is None:
+        return queryset.filter(_fallback_filter(model, terms)).annotate(search_rank=Value(0))
+
+    # Rank only the rows the listing's filters allow, so the limit never drops a visible match
+    try:
+        within = queryset.order_by().values('pk').query.sql_with_params()
+    except EmptyResultSet:
+        return queryset.annotate(search_rank=Value(0)).none()
+    pks = backend.match(index_table(model, resolve_language(language)), terms, limit, within)
+    if not pks:
+        return queryset.annotate(search_rank=Value(0)).none()
+    return queryset.filter(pk__in=pks).annotate(
+        search_rank=Case(
+            *[When(pk=pk, then=Value(position)) for position, pk in enumerate(pks)],
+            output_field=IntegerField(),
+        )
+    )
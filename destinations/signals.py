@@ -0,0 +1,93 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import caching, recommendations, search, similarity
+from .models import Country, University, StudyProgram, Scholarship
+
+
+@receiver(post_save, sender=Country)
+@receiver(post_save, sender=University)
+@receiver(post_save, sender=StudyProgram)
+@receiver(post_save, sender=Scholarship)
+def update_search_index(sender, instance, raw=False, using='default', **kwargs):
+    # Fixtures may arrive before their relations; rebuild_search_index covers them
+    if raw:
+        return
+    search.index_objects(sender, [instance], using=using)
+
+    # Related names are denormalized into the documents that reference them
+    if sender is Country:
+        search.index_queryset(University, instance.universities.using(using))
+    elif sender is University:
+        search.index_queryset(StudyProgram, instance.programs.using(using))
+
+
+@receiver(post_delete, sender=Country)
+@receiver(post_delete, sender=University)
+@receiver(post_delete, sender=StudyProgram)
+@receiver(post_delete, sender=Scholarship)
+def remove_from_search_index(sender, instance, using='default', **kwargs):
+    search.remove_objects(sender, [instance.pk], using=using)
+
+
+@receiver(post_save, sender=StudyProgram)
+def update_similar_programs(sender, instance, raw=False, **kwargs):
+    # Fixtures are covered by build_program_similarity
+    if not raw:
+        similarity.refresh_program(instance)
+
+
+@receiver(post_save, sender=Country)
+@receiver(post_save, sender=University)
+@receiver(post_save, sender=StudyProgram)
+@receiver(post_delete, sender=Country)
+@receiver(post_delete, sender=University)
+@receiver(post_delete, sender=StudyProgram)
+def invalidate_recommendations(sender, **kwargs):
+    recommendations.invalidate()
+
+
+def _page_scopes(sender, instance):
+    """
+    Cache scopes of every public page showing ``instance``
+    """
+    scopes = [caching.OVERVIEW]
+    if sender is Country:
+        scopes.append(caching.country_scope(instance.code))
+    elif sender is University:
+        scopes += [caching.university_scope(instance.pk), caching.country_scope(instance.country.code)]
+    else:
+        university_ids = [instance.university_id] if instance.university_id else []
+        country_codes = []
+        if sender is Scholarship and instance.country_id:
+            country_codes.append(instance.country.code)
+        country_codes += University.objects.filter(pk__in=university_ids).values_list('country__code', flat=True)
+        scopes += [caching.university_scope(pk) for pk in university_ids]
+        scopes += [caching.country_scope(code) for code in country_codes]
+    return scopes
+
+
+@receiver(pre_save, sender=Country)
+def invalidate_renamed_country_page(sender, instance, raw=False, **kwargs):
+    # The page under the old code would otherwise live on until it expires
+    if raw or instance.pk is None:
+        return
+    old_code = Country.objects.filter(pk=instance.pk).values_list('code', flat=True).first()
+    if old_code and old_code != instance.code:
+        caching.bump(caching.country_scope(old_code))
+
+
+@receiver(post_save, sender=Country)
+@receiver(post_save, sender=University)
+@receiver(post_save, sender=StudyProgram)
+@receiver(post_save, sender=Scholarship)
+@receiver(post_delete, sender=Country)
+@receiver(post_delete, sender=University)
+@receiver(post_delete, sender=StudyProgram)
+@receiver(post_delete, sender=Scholarship)
+def invalidate_page_cache(sender, instance, raw=False, **kwargs):
+    if raw:
+        # Relations may not be loaded yet; pages expire after caching.PAGE_TIMEOUT
+        caching.bump(caching.OVERVIEW)
+        return
+    caching.bump(*_page_scopes(sender, instance))
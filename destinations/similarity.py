@@ -0,0 +1,206 @@
+"""
+Precomputed "similar programs" index.
+
+Each active program is reduced to a short TF-IDF vector over its field of
+study, name and description (normalized like the search index). Vectors are
+stored as ``ProgramTerm`` rows, which double as an inverted index, and every
+program keeps its top ``NEIGHBOURS`` cosine matches within the same level as
+``SimilarProgram`` rows, so a detail page reads its neighbours in one query.
+
+``rebuild()`` recomputes everything (run ``build_program_similarity`` after
+bulk imports). Saving a program calls ``refresh_program()``, which rewrites
+that program's vector and neighbour list and offers it to its neighbours'
+lists, using document frequencies as currently stored.
+"""
+import heapq
+import math
+import re
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, Count, F, FloatField, Min, Sum, Value, When
+from modeltranslation.utils import build_localized_fieldname
+
+from .models import StudyProgram, ProgramTerm, SimilarProgram
+from .search import _translated_fields, normalize
+
+
+# Neighbours stored per program; detail pages show the first few
+NEIGHBOURS = 10
+
+# Terms kept per vector, highest weight first
+MAX_TERMS = 30
+
+# Field weights: a shared field of study says more than a shared word in a description
+FIELD_WEIGHTS = (
+    ('field_of_study', 3.0),
+    ('name', 2.0),
+    ('description', 1.0),
+)
+
+# Terms in more than this share of a level's programs carry no signal
+MAX_DOCUMENT_RATIO = 0.5
+
+STOP_WORDS = frozenset(
+    'and the for with from into this that are was were will your you our their its '
+    'program programme course degree study studies master masters phd bachelor'.split()
+)
+
+BATCH_SIZE = 1000
+
+
+def _column(field):
+    # Translated text is compared in the default language so vectors agree
+    if field in _translated_fields(StudyProgram):
+        return build_localized_fieldname(field, settings.MODELTRANSLATION_DEFAULT_LANGUAGE)
+    return field
+
+
+def program_terms(values):
+    """
+    Weighted term frequencies for a program given its ``FIELD_WEIGHTS`` column values
+    """
+    counts = Counter()
+    for field, weight in FIELD_WEIGHTS:
+        for token in re.findall(r'\w+', normalize(values.get(_column(field)) or '')):
+            if len(token) > 2 and token not in STOP_WORDS and not token.isdigit():
+                counts[token[:100]] += weight
+    return counts
+
+
+def build_vector(counts, document_frequency, total):
+    """
+    Turn term counts into a unit-length TF-IDF vector of at most ``MAX_TERMS`` terms
+
+    ``document_frequency`` counts the programs containing each term, this one included.
+    """
+    weights = {}
+    for term, count in counts.items():
+        frequency = max(document_frequency.get(term, 0), 1)
+        if total > 2 and frequency / total > MAX_DOCUMENT_RATIO:
+            continue
+        weights[term] = (1 + math.log(count)) * math.log((total + 1) / frequency)
+    top = heapq.nlargest(MAX_TERMS, weights.items(), key=lambda item: item[1])
+    norm = math.sqrt(sum(weight * weight for _, weight in top))
+    if not norm:
+        return {}
+    return {term: weight / norm for term, weight in top}
+
+
+def _program_values(queryset):
+    fields = ['pk', 'level'] + [_column(field) for field, _ in FIELD_WEIGHTS]
+    return queryset.values(*fields).order_by('pk').iterator(chunk_size=BATCH_SIZE)
+
+
+def rebuild():
+    """
+    Recompute every vector and neighbour list from scratch
+    """
+    by_level = defaultdict(dict)
+    for values in _program_values(StudyProgram.objects.filter(is_active=True)):
+        by_level[values['level']][values['pk']] = program_terms(values)
+
+    terms = []
+    links = []
+    for level, programs in by_level.items():
+        document_frequency = Counter(term for counts in programs.values() for term in counts)
+        vectors = {
+            pk: build_vector(counts, document_frequency, len(programs))
+            for pk, counts in programs.items()
+        }
+
+        postings = defaultdict(list)
+        for pk, vector in vectors.items():
+            for term, weight in vector.items():
+                postings[term].append((pk, weight))
+                terms.append(ProgramTerm(program_id=pk, level=level, term=term, weight=weight))
+
+        for pk, vector in vectors.items():
+            scores = defaultdict(float)
+            for term, weight in vector.items():
+                for other, other_weight in postings[term]:
+                    if other != pk:
+                        scores[other] += weight * other_weight
+            for other, score in heapq.nlargest(NEIGHBOURS, scores.items(), key=lambda item: item[1]):
+                links.append(SimilarProgram(program_id=pk, similar_id=other, score=score))
+
+    with transaction.atomic():
+        ProgramTerm.objects.all().delete()
+        SimilarProgram.objects.all().delete()
+        ProgramTerm.objects.bulk_create(terms, batch_size=BATCH_SIZE)
+        SimilarProgram.objects.bulk_create(links, batch_size=BATCH_SIZE)
+    return len(links)
+
+
+def _offer(program_id, candidate_id, score):
+    """
+    Add ``candidate_id`` to ``program_id``'s neighbours if it makes the top-K
+    """
+    links = SimilarProgram.objects.filter(program_id=program_id)
+    stats = links.exclude(similar_id=candidate_id).aggregate(count=Count('pk'), lowest=Min('score'))
+    if stats['count'] >= NEIGHBOURS and score <= stats['lowest']:
+        links.filter(similar_id=candidate_id).delete()
+        return
+    SimilarProgram.objects.update_or_create(
+        program_id=program_id, similar_id=candidate_id, defaults={'score': score}
+    )
+    overflow = links.order_by('-score', 'pk').values_list('pk', flat=True)[NEIGHBOURS:]
+    SimilarProgram.objects.filter(pk__in=list(overflow)).delete()
+
+
+@transaction.atomic
+def refresh_program(program):
+    """
+    Recompute one program's vector and neighbours after it changed
+    """
+    ProgramTerm.objects.filter(program=program).delete()
+    SimilarProgram.objects.filter(program=program).delete()
+    if not program.is_active:
+        SimilarProgram.objects.filter(similar=program).delete()
+        return
+
+    counts = program_terms({
+        _column(field): getattr(program, _column(field)) for field, _ in FIELD_WEIGHTS
+    })
+    level_terms = ProgramTerm.objects.filter(level=program.level)
+    # Other programs' stored terms, plus this program itself
+    document_frequency = {
+        term: frequency + 1
+        for term, frequency in level_terms.filter(term__in=list(counts)).values('term')
+        .annotate(frequency=Count('pk')).values_list('term', 'frequency')
+    }
+    total = StudyProgram.objects.filter(level=program.level, is_active=True).count()
+    vector = build_vector(counts, document_frequency, total)
+    if not vector:
+        SimilarProgram.objects.filter(similar=program).delete()
+        return
+
+    ProgramTerm.objects.bulk_create([
+        ProgramTerm(program=program, level=program.level, term=term, weight=weight)
+        for term, weight in vector.items()
+    ])
+
+    # Dot products against every stored vector sharing a term, in one aggregation
+    score = Sum(
+        Case(
+            *[When(term=term, then=Value(weight)) for term, weight in vector.items()],
+            default=Value(0.0),
+            output_field=FloatField(),
+        ) * F('weight')
+    )
+    neighbours = [
+        (row['program'], row['score'])
+        for row in level_terms.filter(term__in=list(vector)).exclude(program=program)
+        .values('program').annotate(score=score).order_by('-score', 'program')[:NEIGHBOURS]
+    ]
+    SimilarProgram.objects.bulk_create([
+        SimilarProgram(program=program, similar_id=other, score=score)
+        for other, score in neighbours
+    ])
+
+    # Old links from programs that no longer resemble us are dropped
+    neighbour_ids = [other for other, _ in neighbours]
+    SimilarProgram.objects.filter(similar=program).exclude(program_id__in=neighbour_ids).delete()
+    for other, score in neighbours:
+        _offer(other, program.pk, score)
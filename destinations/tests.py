@@ -1,3 +1,546 @@
-from django.test import TestCase
+import datetime
 
-# Create your tests here.
+from django.contrib.auth.models import AnonymousUser
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.http import Http404
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import translation
+from django.urls import reverse
+
+from accounts.models import KurdishUser
+from kurdish_apply import benchmark, instrumentation, synthetic
+
+from . import caching, facets, recommendations, search, similarity
+from .models import Country, University, StudyProgram, Scholarship, SimilarProgram
+from .views import CountryDetailView, DestinationQuizView, ProgramDetailView, ProgramListView, UniversityDetailView
+
+
+def create_country(code, **kwargs):
+    defaults = {
+        'name': f'Country {code}',
+        'description': 'A destination country',
+        'official_language': 'English',
+        'currency': 'EUR',
+    }
+    defaults.update(kwargs)
+    return Country.objects.create(code=code, **defaults)
+
+
+def create_university(country, name='University', **kwargs):
+    defaults = {
+        'city': 'Capital',
+        'university_type': 'public',
+        'instruction_languages': 'English',
+    }
+    defaults.update(kwargs)
+    return University.objects.create(country=country, name=name, **defaults)
+
+
+def create_program(university, name='Program', **kwargs):
+    defaults = {
+        'level': 'master',
+        'field_of_study': 'Computer Science',
+        'duration_months': 24,
+        'language_of_instruction': 'English',
+    }
+    defaults.update(kwargs)
+    return StudyProgram.objects.create(university=university, name=name, **defaults)
+
+
+def create_scholarship(name='Scholarship', **kwargs):
+    defaults = {
+        'provider': 'Provider',
+        'scholarship_type': 'full',
+        'eligibility_criteria': 'Open to all',
+        'description': 'Funding',
+    }
+    defaults.update(kwargs)
+    return Scholarship.objects.create(name=name, **defaults)
+
+
+class CountryCountsTests(TestCase):
+    def test_with_counts_only_counts_active_rows(self):
+        country = create_country('DEU')
+        active = create_university(country, 'Active University')
+        inactive = create_university(country, 'Closed University', is_active=False)
+        create_program(active, 'Active Program')
+        create_program(active, 'Retired Program', is_active=False)
+        create_program(inactive, 'Orphaned Program')
+        create_scholarship('Open Scholarship', country=country)
+        create_scholarship('Closed Scholarship', country=country, is_active=False)
+        create_country('NOR')
+
+        countries = {c.code: c for c in Country.objects.with_counts()}
+
+        self.assertEqual(countries['DEU'].university_count, 1)
+        self.assertEqual(countries['DEU'].scholarship_count, 1)
+        self.assertEqual(countries['DEU'].program_count, 1)
+        self.assertEqual(countries['NOR'].university_count, 0)
+        self.assertEqual(countries['NOR'].scholarship_count, 0)
+        self.assertEqual(countries['NOR'].program_count, 0)
+
+    def test_country_list_query_budget_is_independent_of_page_size(self):
+        url = reverse('destinations:countries')
+
+        create_country('AAA')
+        # Paginator COUNT plus the annotated listing query
+        with self.assertNumQueries(2):
+            self.client.get(url)
+
+        for index in range(11):
+            country = create_country(f'B{index:02d}')
+            create_university(country, f'University {index}')
+            create_scholarship(f'Scholarship {index}', country=country)
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+
+        self.assertEqual(len(response.context['countries']), 12)
+
+    def test_destinations_overview_query_budget(self):
+        for index in range(8):
+            country = create_country(f'C{index:02d}')
+            university = create_university(country, f'University {index}')
+            create_program(university, f'Program {index}')
+            create_scholarship(f'Scholarship {index}', country=country)
+
+        with self.assertNumQueries(4):
+            self.client.get(reverse('destinations:list'))
+
+
+class PageCacheTests(TestCase):
+    def setUp(self):
+        self.country = create_country('DEU')
+        self.university = create_university(self.country, 'Munich')
+        self.factory = RequestFactory()
+
+    def render(self, view, **kwargs):
+        request = self.factory.get('/')
+        request.user = AnonymousUser()
+        return view.as_view()(request, **kwargs).context_data
+
+    def test_overview_hits_skip_the_database_in_every_language(self):
+        url = reverse('destinations:list')
+        self.client.get(url)
+
+        with self.assertNumQueries(0):
+            self.client.get(url)
+
+        # Page data is shared by languages; only the rendered fragment is per language
+        with translation.override('en'):
+            english_url = reverse('destinations:list')
+        with self.assertNumQueries(0):
+            response = self.client.get(english_url)
+        self.assertEqual(response.wsgi_request.LANGUAGE_CODE, 'en')
+        self.assertContains(response, 'Munich')
+
+    def test_detail_pages_are_invalidated_by_related_saves(self):
+        self.render(CountryDetailView, code='DEU')
+        self.render(UniversityDetailView, pk=self.university.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.render(CountryDetailView, code='DEU')['universities'], [self.university])
+            self.render(UniversityDetailView, pk=self.university.pk)
+
+        program = create_program(self.university, 'Machine Learning')
+
+        self.assertEqual(self.render(CountryDetailView, code='DEU')['programs'], [program])
+        self.assertEqual(self.render(UniversityDetailView, pk=self.university.pk)['programs'], [program])
+
+    def test_renamed_country_leaves_no_page_behind(self):
+        self.render(CountryDetailView, code='DEU')
+
+        self.country.code = 'GER'
+        self.country.save()
+
+        with self.assertRaises(Http404):
+            self.render(CountryDetailView, code='DEU')
+        self.assertEqual(self.render(CountryDetailView, code='GER')['country'], self.country)
+
+    def test_template_changes_start_a_fresh_cache(self):
+        self.assertEqual(caching.template_version('destinations/missing.html'), '')
+        self.assertRegex(caching.template_version('destinations/list.html'), r'^[0-9a-f]{8}$')
+
+
+@override_settings(QUERY_BUDGET_RAISE=True)
+class QueryBudgetTests(TestCase):
+    def setUp(self):
+        instrumentation.stats.reset()
+        country = create_country('DEU')
+        self.university = create_university(country, 'Munich')
+        for index in range(3):
+            create_program(self.university, f'Program {index}')
+
+    def view_report(self, name):
+        return next(row for row in instrumentation.stats.report() if row['view'] == name)
+
+    def test_public_pages_stay_within_their_budgets(self):
+        self.client.get(reverse('destinations:list'))
+        self.client.get(reverse('destinations:countries'))
+        self.client.get(reverse('destinations:countries'), {'search': 'Germany'})
+        self.client.force_login(KurdishUser.objects.create_user(username='student', password='secret', region='bashur'))
+        self.client.get(reverse('destinations:list'))
+
+        report = self.view_report('destinations:list')
+        self.assertEqual(report['requests'], 2)
+        self.assertEqual(report['budget'], 6)
+        self.assertEqual(report['over_budget'], 0)
+        self.assertEqual(self.view_report('destinations:countries')['duplicates'], 0)
+
+    def test_requests_over_budget_fail(self):
+        with override_settings(QUERY_BUDGETS={'destinations:list': 1}):
+            with self.assertRaises(instrumentation.QueryBudgetExceeded):
+                self.client.get(reverse('destinations:list'))
+        self.assertEqual(self.view_report('destinations:list')['over_budget'], 1)
+
+    def test_duplicate_queries_are_reported(self):
+        recorder = instrumentation.QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            for program in StudyProgram.objects.order_by('pk'):
+                program.university.name
+        self.assertEqual(recorder.count, 4)
+        self.assertEqual(recorder.duplicates()[0], 2)
+        self.assertIn('destinations_university', recorder.duplicates()[1])
+
+    @override_settings(DEBUG=True)
+    def test_debug_headers_and_staff_report(self):
+        response = self.client.get(reverse('destinations:list'))
+        self.assertEqual(response['X-View-Name'], 'destinations:list')
+        self.assertEqual(response['X-Query-Count'], '4')
+        self.assertEqual(response['X-Query-Budget'], '6')
+        self.assertIn('X-Template-Render-Ms', response)
+
+        url = reverse('instrumentation')
+        self.assertEqual(self.client.get(url).status_code, 302)
+        staff = KurdishUser.objects.create_user(username='staff', password='secret', region='bashur', is_staff=True)
+        self.client.force_login(staff)
+        views = {row['view']: row for row in self.client.get(url).json()['views']}
+        self.assertEqual(views['destinations:list']['max_queries'], 4)
+        self.assertGreater(views['destinations:list']['avg_render_ms'], 0)
+
+
+class SearchIndexTests(TestCase):
+    def setUp(self):
+        self.country = create_country('DEU', name='Germany', description='Engineering powerhouse')
+        self.university = create_university(self.country, 'Technical University of Munich', city='Munich')
+
+    def search_names(self, queryset, query):
+        return [obj.name for obj in search.search(queryset, query).order_by('search_rank')]
+
+    def test_saved_objects_are_searchable_by_prefix(self):
+        create_program(self.university, 'Data Science', field_of_study='Statistics')
+
+        self.assertEqual(self.search_names(StudyProgram.objects.all(), 'statis'), ['Data Science'])
+        self.assertEqual(self.search_names(Country.objects.all(), 'engineer'), ['Germany'])
+
+    def test_better_matches_rank_first(self):
+        create_scholarship('Research Grant', description='Funding for research in research labs')
+        create_scholarship('Travel Grant', description='Covers one research trip')
+
+        self.assertEqual(
+            self.search_names(Scholarship.objects.all(), 'research'),
+            ['Research Grant', 'Travel Grant'],
+        )
+
+    def test_related_names_are_reindexed(self):
+        create_program(self.university, 'Robotics')
+
+        self.university.name = 'Ludwig Maximilian University'
+        self.university.save()
+
+        self.assertEqual(self.search_names(StudyProgram.objects.all(), 'maximilian'), ['Robotics'])
+        self.assertEqual(self.search_names(StudyProgram.objects.all(), 'technical'), [])
+
+    def test_deleted_objects_leave_the_index(self):
+        self.university.delete()
+
+        self.assertEqual(self.search_names(University.objects.all(), 'munich'), [])
+
+    def test_limit_applies_after_the_listing_filters(self):
+        norway = create_country('NOR', name='Norway')
+        for number in range(3):
+            create_program(self.university, f'Physics {number}', description='physics physics physics')
+        create_program(create_university(norway, 'Oslo'), 'Applied Physics')
+
+        matches = search.search(StudyProgram.objects.filter(university__country=norway), 'physics', limit=2)
+
+        self.assertEqual([program.name for program in matches], ['Applied Physics'])
+
+    def test_queries_without_words_match_nothing(self):
+        self.assertEqual(self.search_names(Country.objects.all(), '"*-'), [])
+
+    def test_listing_views_use_the_index(self):
+        create_country('NOR', name='Norway', description='Fjords')
+
+        response = self.client.get(reverse('destinations:countries'), {'search': 'fjord'})
+
+        self.assertEqual([c.name for c in response.context['countries']], ['Norway'])
+
+    def test_cursor_pages_follow_the_search_ranking(self):
+        for number in range(7):
+            create_program(self.university, f'Water {number}', description=' '.join(['hydrology'] * (number % 4 + 1)))
+        create_program(self.university, 'Robotics')
+        expected = [program.pk for program in search.search(StudyProgram.objects.all(), 'hydrology').order_by('search_rank')]
+
+        view = ProgramListView.as_view(paginate_by=3)
+        pages, params = [], {'search': 'hydrology'}
+        while True:
+            request = RequestFactory().get(reverse('destinations:programs'), params)
+            request.user = AnonymousUser()
+            page = view(request).context_data['page_obj']
+            pages.append([program.pk for program in page])
+            if not page.has_next():
+                break
+            params['cursor'] = page.next_cursor
+
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        self.assertEqual([pk for page in pages for pk in page], expected)
+        self.assertEqual(len(expected), 7)
+
+
+class MultilingualSearchTests(TestCase):
+    def search_codes(self, query, language):
+        return [c.code for c in search.search(Country.objects.all(), query, language=language)]
+
+    def test_sorani_queries_fold_arabic_keyboard_letters(self):
+        # Stored with Arabic yeh and kaf, searched with the Kurdish letters
+        create_country('DEU', name='Germany', name_ckb='ئەلمانيا', description_ckb='وڵاتێكی پێشكەوتوو')
+
+        self.assertEqual(self.search_codes('ئەلمانیا', 'ckb'), ['DEU'])
+        self.assertEqual(self.search_codes('پێشکەوتوو', 'ckb'), ['DEU'])
+
+    def test_kurmanji_queries_ignore_diacritics(self):
+        create_country('DEU', name='Germany', description_kmr='Welatê pîşesaziyê')
+
+        self.assertEqual(self.search_codes('welate pisesaziye', 'kmr'), ['DEU'])
+        self.assertEqual(self.search_codes('Welatê', 'kmr'), ['DEU'])
+
+    def test_each_language_only_matches_its_own_document(self):
+        create_country('DEU', name='Germany', description_ckb='وڵات', description_kmr='Welat', description_en='Land')
+        create_country('NOR', name='Norway', name_kurmanji='Norwêc', description='Fjords')
+
+        self.assertEqual(self.search_codes('welat', 'kmr'), ['DEU'])
+        self.assertEqual(self.search_codes('welat', 'en'), [])
+        self.assertEqual(self.search_codes('norwec', 'kmr'), ['NOR'])
+        self.assertEqual(self.search_codes('norwec', 'ckb'), [])
+
+    def test_missing_translations_fall_back_to_the_default_language(self):
+        create_country('DEU', name='Germany', description_ckb='زانکۆ')
+
+        self.assertEqual(self.search_codes('زانکۆ', 'en'), ['DEU'])
+
+    def test_active_language_selects_the_document(self):
+        create_country('DEU', name='Germany', description_kmr='Welat')
+
+        with translation.override('kmr'):
+            self.assertEqual(self.search_codes('welat', None), ['DEU'])
+        with translation.override('en'):
+            self.assertEqual(self.search_codes('welat', None), [])
+
+    def test_normalize(self):
+        self.assertEqual(search.normalize('Çiyayê ŞÎN'), 'ciyaye sin')
+        self.assertEqual(search.normalize('كوردستانه'), 'کوردستانە')
+        self.assertEqual(search.normalize('ئاسۆ ١٢'), 'ئاسۆ 12')
+
+
+class ProgramFacetTests(TestCase):
+    def setUp(self):
+        germany = create_country('DEU', name='Germany')
+        norway = create_country('NOR', name='Norway')
+        munich = create_university(germany, 'Munich')
+        oslo = create_university(norway, 'Oslo')
+        create_program(munich, 'Informatics', level='master', tuition_fee=0, scholarships_available=True)
+        create_program(munich, 'Physics', level='phd', tuition_fee=0)
+        create_program(oslo, 'Energy', level='master', tuition_fee=12000, language_of_instruction='Norwegian')
+        create_program(oslo, 'Arctic Studies', level='master')
+        create_program(oslo, 'Closed', level='master', is_active=False)
+
+    def counts(self, results, name):
+        facet = next(facet for facet in results if facet['name'] == name)
+        return {value['value']: value['count'] for value in facet['values']}
+
+    def test_counts_every_facet(self):
+        results = facets.count_facets(StudyProgram.objects.filter(is_active=True), {})
+
+        self.assertEqual(self.counts(results, 'level'), {'master': 3, 'phd': 1})
+        self.assertEqual(self.counts(results, 'language'), {'English': 3, 'Norwegian': 1})
+        self.assertEqual(self.counts(results, 'country'), {'DEU': 2, 'NOR': 2})
+        self.assertEqual(self.counts(results, 'scholarships'), {'1': 1, '0': 3})
+        self.assertEqual(self.counts(results, 'tuition'), {'free': 2, '5000_15000': 1, 'unknown': 1})
+
+    def test_selected_facet_narrows_the_others_but_not_itself(self):
+        results = facets.count_facets(StudyProgram.objects.filter(is_active=True), {'country': 'NOR'})
+
+        self.assertEqual(self.counts(results, 'country'), {'DEU': 2, 'NOR': 2})
+        self.assertEqual(self.counts(results, 'level'), {'master': 2})
+        self.assertEqual(self.counts(results, 'tuition'), {'5000_15000': 1, 'unknown': 1})
+
+    def test_program_list_filters_and_counts_in_one_aggregation(self):
+        request = RequestFactory().get(reverse('destinations:programs'), {'level': 'master', 'tuition': 'free'})
+
+        # Facet aggregation and the keyset-paginated listing query
+        with self.assertNumQueries(2):
+            response = ProgramListView.as_view()(request)
+            programs = [p.name for p in response.context_data['programs']]
+
+        self.assertEqual(programs, ['Informatics'])
+        level = self.counts(response.context_data['facets'], 'level')
+        self.assertEqual(level, {'master': 1, 'phd': 1})
+
+
+class SimilarProgramTests(TestCase):
+    def setUp(self):
+        university = create_university(create_country('DEU'), 'Munich')
+        self.ml = create_program(university, 'Machine Learning', field_of_study='Computer Science',
+                                 description='Neural networks and statistics')
+        self.ai = create_program(university, 'Artificial Intelligence', field_of_study='Computer Science',
+                                 description='Neural networks and robotics')
+        self.history = create_program(university, 'Medieval History', field_of_study='History',
+                                      description='Archives and manuscripts')
+        self.phd = create_program(university, 'Computer Science Research', level='phd',
+                                  field_of_study='Computer Science')
+        self.empty = create_program(university, 'Untitled', field_of_study='')
+
+    def neighbours(self, program):
+        return list(
+            SimilarProgram.objects.filter(program=program).order_by('-score').values_list('similar', flat=True)
+        )
+
+    def test_saving_programs_keeps_neighbour_lists_current(self):
+        self.assertEqual(self.neighbours(self.ml)[0], self.ai.pk)
+        self.assertEqual(self.neighbours(self.ai)[0], self.ml.pk)
+        self.assertNotIn(self.phd.pk, self.neighbours(self.ml))
+
+    def test_rebuild_matches_same_level_programs_by_content(self):
+        SimilarProgram.objects.all().delete()
+
+        similarity.rebuild()
+
+        self.assertEqual(self.neighbours(self.ml)[0], self.ai.pk)
+        self.assertNotIn(self.history.pk, self.neighbours(self.ml))
+        self.assertNotIn(self.phd.pk, self.neighbours(self.ml))
+
+    def test_deactivated_programs_leave_the_index(self):
+        self.ai.is_active = False
+        self.ai.save()
+
+        self.assertEqual(self.neighbours(self.ai), [])
+        self.assertNotIn(self.ai.pk, self.neighbours(self.ml))
+
+    def test_detail_view_reads_neighbours_in_one_query(self):
+        request = RequestFactory().get(reverse('destinations:program_detail', args=[self.empty.pk]))
+
+        # Program lookup plus the neighbour query; an empty field of study is fine
+        with self.assertNumQueries(2):
+            response = ProgramDetailView.as_view()(request, pk=self.empty.pk)
+            similar = list(response.context_data['similar_programs'])
+        self.assertEqual(similar, [])
+
+        request = RequestFactory().get(reverse('destinations:program_detail', args=[self.ml.pk]))
+        response = ProgramDetailView.as_view()(request, pk=self.ml.pk)
+        self.assertEqual(list(response.context_data['similar_programs'])[0], self.ai)
+
+
+class RecommendationTests(TestCase):
+    def setUp(self):
+        cheap = create_country('DEU', avg_living_cost_usd=9000, work_permit_allowed=True,
+                               post_study_work_visa=True, kurdish_population='Large community')
+        expensive = create_country('GBR', avg_living_cost_usd=15000, application_difficulty=5)
+        self.munich = create_university(cheap, 'Munich', academic_reputation=4)
+        self.london = create_university(expensive, 'London', academic_reputation=5)
+        self.ml = create_program(self.munich, 'Machine Learning', tuition_fee=0)
+        self.history = create_program(self.munich, 'Medieval History', field_of_study='History', tuition_fee=0)
+        self.london_cs = create_program(self.london, 'Computer Science', tuition_fee=30000)
+        self.phd = create_program(self.london, 'Computing Research', level='phd', scholarships_available=True)
+
+    def ids(self, results):
+        return [entry['object'].pk for entry in results]
+
+    def test_level_is_a_hard_filter_and_field_ranks_first(self):
+        result = recommendations.recommend({'study_level': 'master', 'field': 'computer', 'budget': 'low'})
+
+        programs = self.ids(result['programs'])
+        self.assertNotIn(self.phd.pk, programs)
+        self.assertEqual(programs[0], self.ml.pk)
+        self.assertEqual(programs[-1], self.history.pk)
+        self.assertEqual(self.ids(result['countries'])[0], self.munich.country_id)
+
+    def test_priority_and_profile_shift_the_ranking(self):
+        answers = {'field': 'computer science', 'budget': 'any'}
+        self.assertEqual(self.ids(recommendations.recommend(answers)['programs'])[0], self.ml.pk)
+
+        # A Rojava profile weighs funding up; the answer doubles it again
+        user = KurdishUser.objects.create_user(username='student', password='secret', region='rojava')
+        answers['priority'] = 'scholarship'
+        self.assertEqual(self.ids(recommendations.recommend(answers, user=user)['programs'])[0], self.phd.pk)
+        self.assertEqual(self.ids(recommendations.recommend(answers)['programs'])[0], self.ml.pk)
+
+        # Explicit answers win over the profile
+        answers['region'] = 'bashur'
+        self.assertEqual(self.ids(recommendations.recommend(answers, user=user)['programs'])[0], self.ml.pk)
+
+    def test_fees_in_other_currencies_use_the_country_average(self):
+        iraq = create_country('IRQ', avg_tuition_usd=3000, avg_living_cost_usd=4000)
+        program = create_program(create_university(iraq, 'Erbil'), tuition_fee=4500000, currency='IQD')
+
+        matrix = recommendations.CandidateMatrix.build()
+
+        index = list(matrix.program_ids).index(program.pk)
+        self.assertEqual(matrix.cost[index], 7000)
+        self.assertEqual(matrix.cost[list(matrix.program_ids).index(self.london_cs.pk)], 45000)
+
+    def test_matrix_is_rebuilt_after_destinations_change(self):
+        matrix = recommendations.get_matrix()
+        self.assertIs(recommendations.get_matrix(), matrix)
+
+        create_program(self.munich, 'Data Science')
+
+        rebuilt = recommendations.get_matrix()
+        self.assertIsNot(rebuilt, matrix)
+        self.assertEqual(len(rebuilt), len(matrix) + 1)
+
+    def test_quiz_view_scores_submitted_answers(self):
+        request = RequestFactory().get(reverse('destinations:quiz'), {'study_level': 'phd'})
+        request.user = AnonymousUser()
+
+        response = DestinationQuizView.as_view()(request)
+
+        self.assertEqual(self.ids(response.context_data['recommendations']['programs']), [self.phd.pk])
+
+        request = RequestFactory().get(reverse('destinations:quiz'))
+        request.user = AnonymousUser()
+        self.assertNotIn('recommendations', DestinationQuizView.as_view()(request).context_data)
+
+
+class SyntheticDataTests(TestCase):
+    def snapshot(self):
+        return list(StudyProgram.objects.order_by('name', 'tuition_fee').values_list(
+            'name', 'level', 'tuition_fee', 'university__name', 'university__country__code',
+        ))
+
+    def test_generation_is_deterministic_and_clearable(self):
+        base_date = datetime.date(2026, 1, 1)
+        counts = synthetic.generate(seed=7, base_date=base_date)
+        self.assertEqual(counts['destinations.StudyProgram'], synthetic.SCALES['small']['programs'])
+        self.assertTrue(Country.objects.get(code='XDE').name_kmr)
+        self.assertTrue(search.search(StudyProgram.objects.all(), 'Computer Science').exists())
+        first = self.snapshot()
+
+        synthetic.clear()
+        self.assertFalse(synthetic.exists())
+        self.assertEqual(StudyProgram.objects.count(), 0)
+
+        synthetic.generate(seed=7, base_date=base_date)
+        self.assertEqual(self.snapshot(), first)
+
+    def test_benchmark_urls_are_filled_from_sample_objects(self):
+        create_program(create_university(create_country('DEU')))
+        patterns = {name: (pattern, view) for name, pattern, view in benchmark._patterns()}
+
+        self.assertNotIn('admin:index', patterns)
+        self.assertEqual(benchmark._url_kwargs(*patterns['destinations:country_detail'], None), {'code': 'DEU'})
+        self.assertIsNone(benchmark._url_kwargs(*patterns['resources:guide_detail'], None))
+        self.assertEqual(benchmark._url_kwargs(*patterns['destinations:programs'], None), {})
+
+    def test_benchmarks_need_at_least_one_repeat(self):
+        with self.assertRaisesMessage(CommandError, 'must be at least 1'):
+            call_command('run_benchmarks', '--repeat', '0')
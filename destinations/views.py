@@ -1,42 +1,47 @@
 from django.shortcuts import render, get_object_or_404
 from django.views.generic import ListView, DetailView, TemplateView
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Q
 from django.utils.translation import gettext_lazy as _
 
+from kurdish_apply.pagination import CursorPaginationMixin
+
+from . import caching, facets, recommendations, search
+from .caching import CachedObjectMixin, CachedPageMixin
 from .models import Country, University, StudyProgram, Scholarship
 
 
-class DestinationsView(TemplateView):
+class DestinationsView(CachedPageMixin, TemplateView):
     template_name = 'destinations/list.html'
+    query_budget = 6
     
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        context.update({
-            'countries': Country.objects.filter(is_active=True)[:8],
-            'featured_universities': University.objects.filter(is_active=True)[:6],
-            'recent_programs': StudyProgram.objects.filter(is_active=True)[:8],
-            'scholarships': Scholarship.objects.filter(is_active=True)[:4],
-        })
-        return context
+    def get_cache_scope(self):
+        return caching.OVERVIEW
+    
+    def get_page_data(self):
+        return {
+            'countries': list(Country.objects.filter(is_active=True).with_counts()[:8]),
+            'featured_universities': list(University.objects.filter(is_active=True).select_related('country')[:6]),
+            'recent_programs': list(StudyProgram.objects.filter(is_active=True).select_related('university')[:8]),
+            'scholarships': list(Scholarship.objects.filter(is_active=True)[:4]),
+        }
 
 
 class CountryListView(ListView):
     model = Country
     template_name = 'destinations/countries.html'
+    query_budget = 4
     context_object_name = 'countries'
     paginate_by = 12
     
     def get_queryset(self):
-        queryset = Country.objects.filter(is_active=True)
+        queryset = Country.objects.filter(is_active=True).with_counts()
+        ordering = ['name']
         
         # Search functionality
         search_query = self.request.GET.get('search')
         if search_query:
-            queryset = queryset.filter(
-                Q(name__icontains=search_query) |
-                Q(description__icontains=search_query)
-            )
+            queryset = search.search(queryset, search_query)
+            ordering.insert(0, 'search_rank')
         
         # Filter by region (if applicable)
         region = self.request.GET.get('region')
@@ -44,47 +49,50 @@ class CountryListView(ListView):
             # Add region filtering logic if needed
             pass
             
-        return queryset.order_by('name')
+        return queryset.order_by(*ordering)
 
 
-class CountryDetailView(DetailView):
+class CountryDetailView(CachedObjectMixin, DetailView):
     model = Country
     template_name = 'destinations/country_detail.html'
+    query_budget = 6
     context_object_name = 'country'
     slug_field = 'code'
     slug_url_kwarg = 'code'
     
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        country = self.get_object()
+    def get_cache_scope(self):
+        return caching.country_scope(self.kwargs['code'])
+    
+    def get_page_data(self):
+        data = super().get_page_data()
+        country = self.object
         
-        context.update({
-            'universities': country.universities.filter(is_active=True)[:10],
-            'scholarships': country.scholarships.filter(is_active=True)[:5],
-            'programs': StudyProgram.objects.filter(
+        data.update({
+            'universities': list(country.universities.filter(is_active=True)[:10]),
+            'scholarships': list(country.scholarships.filter(is_active=True)[:5]),
+            'programs': list(StudyProgram.objects.filter(
                 university__country=country, is_active=True
-            )[:10],
+            ).select_related('university')[:10]),
         })
-        return context
+        return data
 
 
 class UniversityListView(ListView):
     model = University
     template_name = 'destinations/universities.html'
+    query_budget = 4
     context_object_name = 'universities'
     paginate_by = 15
     
     def get_queryset(self):
         queryset = University.objects.filter(is_active=True).select_related('country')
+        ordering = ['name']
         
         # Search functionality
         search_query = self.request.GET.get('search')
         if search_query:
-            queryset = queryset.filter(
-                Q(name__icontains=search_query) |
-                Q(city__icontains=search_query) |
-                Q(country__name__icontains=search_query)
-            )
+            queryset = search.search(queryset, search_query)
+            ordering.insert(0, 'search_rank')
         
         # Filter by country
         country_code = self.request.GET.get('country')
@@ -96,71 +104,83 @@ class UniversityListView(ListView):
         if university_type:
             queryset = queryset.filter(university_type=university_type)
             
-        return queryset.order_by('name')
+        return queryset.order_by(*ordering)
 
 
-class UniversityDetailView(DetailView):
+class UniversityDetailView(CachedObjectMixin, DetailView):
     model = University
     template_name = 'destinations/university_detail.html'
+    query_budget = 5
     context_object_name = 'university'
     
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        university = self.get_object()
+    def get_queryset(self):
+        return University.objects.select_related('country')
+    
+    def get_cache_scope(self):
+        return caching.university_scope(self.kwargs['pk'])
+    
+    def get_page_data(self):
+        data = super().get_page_data()
+        university = self.object
         
-        context.update({
-            'programs': university.programs.filter(is_active=True),
-            'scholarships': university.scholarships.filter(is_active=True),
+        data.update({
+            'programs': list(university.programs.filter(is_active=True)),
+            'scholarships': list(university.scholarships.filter(is_active=True)),
         })
-        return context
+        return data
 
 
-class ProgramListView(ListView):
+class ProgramListView(CursorPaginationMixin, ListView):
     model = StudyProgram
     template_name = 'destinations/programs.html'
+    query_budget = 5
     context_object_name = 'programs'
     paginate_by = 20
+    cursor_total = True
     
     def get_queryset(self):
         queryset = StudyProgram.objects.filter(is_active=True).select_related('university', 'university__country')
+        ordering = ['university__name', 'name']
         
         # Search functionality
         search_query = self.request.GET.get('search')
         if search_query:
-            queryset = queryset.filter(
-                Q(name__icontains=search_query) |
-                Q(field_of_study__icontains=search_query) |
-                Q(university__name__icontains=search_query)
-            )
-        
-        # Filter by level
-        level = self.request.GET.get('level')
-        if level:
-            queryset = queryset.filter(level=level)
+            queryset = search.search(queryset, search_query)
+            ordering.insert(0, 'search_rank')
             
         # Filter by field
         field = self.request.GET.get('field')
         if field:
             queryset = queryset.filter(field_of_study__icontains=field)
+        
+        # Sidebar facets (level, language, country, scholarships, tuition)
+        selected = facets.selected_facets(self.request.GET)
+        self.facets = facets.count_facets(queryset, selected)
+        queryset = facets.apply_facets(queryset, selected)
             
-        return queryset.order_by('university__name', 'name')
+        return queryset.order_by(*ordering)
+    
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['facets'] = self.facets
+        return context
 
 
 class ProgramDetailView(DetailView):
     model = StudyProgram
     template_name = 'destinations/program_detail.html'
+    query_budget = 4
     context_object_name = 'program'
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        program = self.get_object()
+        program = self.object
         
-        # Find similar programs
+        # Neighbours are precomputed by destinations.similarity
         similar_programs = StudyProgram.objects.filter(
-            field_of_study__icontains=program.field_of_study.split()[0],
-            level=program.level,
+            similar_to_links__program=program,
             is_active=True
-        ).exclude(pk=program.pk)[:5]
+        ).select_related('university').order_by('-similar_to_links__score')[:5]
         
         context['similar_programs'] = similar_programs
         return context
@@ -169,20 +189,19 @@ class ProgramDetailView(DetailView):
 class ScholarshipListView(ListView):
     model = Scholarship
     template_name = 'destinations/scholarships.html'
+    query_budget = 4
     context_object_name = 'scholarships'
     paginate_by = 15
     
     def get_queryset(self):
         queryset = Scholarship.objects.filter(is_active=True)
+        ordering = ['-application_deadline', 'name']
         
         # Search functionality
         search_query = self.request.GET.get('search')
         if search_query:
-            queryset = queryset.filter(
-                Q(name__icontains=search_query) |
-                Q(provider__icontains=search_query) |
-                Q(description__icontains=search_query)
-            )
+            queryset = search.search(queryset, search_query)
+            ordering.insert(0, 'search_rank')
         
         # Filter by type
         scholarship_type = self.request.GET.get('type')
@@ -194,7 +213,7 @@ class ScholarshipListView(ListView):
         if kurdish_only:
             queryset = queryset.filter(kurdish_specific=True)
             
-        return queryset.order_by('-application_deadline', 'name')
+        return queryset.order_by(*ordering)
 
 
 class DestinationCompareView(LoginRequiredMixin, TemplateView):
@@ -222,9 +241,9 @@ class DestinationQuizView(TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         
-        # Quiz questions and logic would be implemented here
         context['quiz_questions'] = [
             {
+                'name': 'current_level',
                 'question': _('What is your current education level?'),
                 'options': [
                     {'value': 'bachelor', 'text': _("Bachelor's Degree")},
@@ -233,6 +252,7 @@ class DestinationQuizView(TemplateView):
                 ]
             },
             {
+                'name': 'study_level',
                 'question': _('What is your preferred study level?'),
                 'options': [
                     {'value': 'master', 'text': _("Master's Degree")},
@@ -241,10 +261,12 @@ class DestinationQuizView(TemplateView):
                 ]
             },
             {
+                'name': 'field',
                 'question': _('What is your field of study?'),
                 'type': 'text'
             },
             {
+                'name': 'region',
                 'question': _('Which region are you from?'),
                 'options': [
                     {'value': 'rojhelat', 'text': _('Rojhelat')},
@@ -254,6 +276,36 @@ class DestinationQuizView(TemplateView):
                     {'value': 'diaspora', 'text': _('Diaspora')},
                 ]
             },
+            {
+                'name': 'budget',
+                'question': _('What is your yearly budget for tuition and living costs?'),
+                'options': [
+                    {'value': 'low', 'text': _('Under $10,000')},
+                    {'value': 'medium', 'text': _('Under $25,000')},
+                    {'value': 'high', 'text': _('Under $50,000')},
+                    {'value': 'any', 'text': _('No limit')},
+                ]
+            },
+            {
+                'name': 'priority',
+                'question': _('What matters most to you?'),
+                'options': [
+                    {'value': 'quality', 'text': _('Academic quality')},
+                    {'value': 'cost', 'text': _('Low cost')},
+                    {'value': 'work', 'text': _('Work rights during and after study')},
+                    {'value': 'community', 'text': _('Kurdish community')},
+                    {'value': 'scholarship', 'text': _('Scholarship availability')},
+                ]
+            },
         ]
         
+        # Answers are submitted with GET so results can be bookmarked and shared
+        answers = {
+            question['name']: self.request.GET.get(question['name'], '').strip()
+            for question in context['quiz_questions']
+        }
+        context['answers'] = answers
+        if any(answers.values()):
+            context['recommendations'] = recommendations.recommend(answers, user=self.request.user)
+        
         return context
\ No newline at end of file
@@ -0,0 +1,186 @@
+"""
+Time every page of the site against the current database.
+
+``run()`` requests each URL of the local apps in every language with the
+test client, signed in as a synthetic student (see ``kurdish_apply.synthetic``)
+so private pages show real data. Each URL is warmed up once and then timed
+``repeat`` times; the report records wall-clock statistics, query counts,
+status codes and response sizes next to the dataset size and git commit, so
+reports from different commits can be diffed directly.
+"""
+import json
+import platform
+import statistics
+import subprocess
+import time
+
+import django
+from django.apps import apps
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count
+from django.test import Client, override_settings
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+from django.utils import timezone, translation
+
+from accounts.models import KurdishUser
+
+from .instrumentation import QueryRecorder
+from .synthetic import SYNTHETIC
+
+
+LOCAL_APPS = ('accounts', 'destinations', 'resume_builder', 'communications', 'resources')
+
+# Requests with side effects on the signed-in session
+SKIP = {'accounts:logout'}
+
+
+def _patterns(patterns=None, namespace=None):
+    """
+    Yield ``(url name, pattern, view)`` for every named pattern of the local apps
+    """
+    if patterns is None:
+        patterns = get_resolver().url_patterns
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            ns = pattern.namespace or namespace
+            yield from _patterns(pattern.url_patterns, ns if ns else None)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            module = pattern.callback.__module__.split('.')[0]
+            if module in LOCAL_APPS or (namespace is None and module == 'django' and pattern.name == 'home'):
+                name = f'{namespace}:{pattern.name}' if namespace else pattern.name
+                yield name, pattern, getattr(pattern.callback, 'view_class', None)
+
+
+def _sample(model, user):
+    queryset = model._default_manager.all()
+    if any(field.name == 'user' for field in model._meta.get_fields()):
+        queryset = queryset.filter(user=user)
+    return queryset.order_by('pk').first()
+
+
+def _url_kwargs(pattern, view_class, user):
+    """
+    Fill a pattern's arguments from a sample object, or return None when there is none
+    """
+    names = list(pattern.pattern.converters)
+    if not names:
+        return {}
+    model = getattr(view_class, 'model', None)
+    kwargs = {}
+    for name in names:
+        if model is not None and name.endswith('_id') and hasattr(model, name[:-3]):
+            obj = _sample(model._meta.get_field(name[:-3]).related_model, user)
+            value = obj.pk if obj else None
+        elif model is not None:
+            obj = _sample(model, user)
+            field = getattr(view_class, 'slug_field', 'pk') if name != 'pk' else 'pk'
+            value = getattr(obj, field) if obj else None
+        else:
+            value = None
+        if value is None:
+            return None
+        kwargs[name] = value
+    return kwargs
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=settings.BASE_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def dataset_counts():
+    counts = {}
+    for app_label in LOCAL_APPS:
+        for model in apps.get_app_config(app_label).get_models():
+            counts[model._meta.label] = model._default_manager.count()
+    return counts
+
+
+def benchmark_user(username=None):
+    users = KurdishUser.objects.all()
+    if username:
+        return users.get(username=username)
+    # The busiest synthetic student exercises the heaviest private pages
+    return (
+        users.filter(username__startswith=f'{SYNTHETIC}_')
+        .annotate(application_count=Count('applications'))
+        .order_by('-application_count', 'pk')
+        .first()
+    )
+
+
+def time_url(client, url, repeat):
+    client.get(url)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = client.get(url)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    recorder = QueryRecorder()
+    with connection.execute_wrapper(recorder):
+        client.get(url)
+
+    timings.sort()
+    return {
+        'status': response.status_code,
+        'bytes': len(response.content) if not response.streaming else None,
+        'queries': recorder.count,
+        'duplicate_queries': recorder.duplicates()[0],
+        'min_ms': round(timings[0], 2),
+        'median_ms': round(statistics.median(timings), 2),
+        'p95_ms': round(timings[max(0, int(len(timings) * 0.95) - 1)], 2),
+        'max_ms': round(timings[-1], 2),
+    }
+
+
+def run(repeat=5, languages=None, username=None, stdout=None):
+    """
+    Benchmark every page; returns the report as a dict
+    """
+    languages = languages or [code for code, name in settings.LANGUAGES]
+    user = benchmark_user(username)
+    client = Client(raise_request_exception=False)
+    if user is not None:
+        client.force_login(user)
+
+    results = []
+    with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+        for name, pattern, view_class in sorted(_patterns(), key=lambda item: item[0]):
+            if name in SKIP:
+                continue
+            kwargs = _url_kwargs(pattern, view_class, user)
+            if kwargs is None:
+                results.append({'name': name, 'skipped': 'no sample object'})
+                continue
+            for language in languages:
+                with translation.override(language):
+                    url = reverse(name, kwargs=kwargs)
+                result = {'name': name, 'language': language, 'url': url, **time_url(client, url, repeat)}
+                results.append(result)
+                if stdout is not None:
+                    stdout.write(f"{result['median_ms']:>9.2f} ms {result['queries']:>4} q  {result['status']}  {url}")
+
+    return {
+        'created_at': timezone.now().isoformat(),
+        'commit': _git_commit(),
+        'environment': {
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+        },
+        'repeat': repeat,
+        'user': user.username if user else None,
+        'dataset': dataset_counts(),
+        'results': results,
+    }
+
+
+def write_report(report, path):
+    with open(path, 'w', encoding='utf-8') as handle:
+        json.dump(report, handle, indent=2, ensure_ascii=False, sort_keys=True)
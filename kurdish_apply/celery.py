@@ -0,0 +1,69 @@
+"""
+Celery application and background job dispatch.
+
+With ``CELERY_BROKER_URL`` set, jobs go to the broker and run on Celery
+workers (``celery -A kurdish_apply worker``). Without one, as in local
+development, they run on a small thread pool inside the web process, so
+slow work still happens outside the request. ``CELERY_TASK_ALWAYS_EAGER``
+runs them inline, which tests rely on.
+"""
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from celery import Celery
+from django.conf import settings
+
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'kurdish_apply.settings')
+
+app = Celery('kurdish_apply')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
+
+logger = logging.getLogger(__name__)
+
+LOCAL_WORKERS = 2
+
+_local_pool = None
+
+
+def _run_locally(task, args, kwargs):
+    from django.db import close_old_connections
+
+    try:
+        task.apply(args=args, kwargs=kwargs, throw=True)
+    except Exception:
+        logger.exception('Background task %s failed', task.name)
+    finally:
+        # The pool thread keeps its own connection; don't leave it open between jobs
+        close_old_connections()
+
+
+def run_in_background(task, *args, **kwargs):
+    """
+    Queue ``task`` on Celery, or on the local worker pool when no broker is configured
+    """
+    global _local_pool
+    if getattr(settings, 'CELERY_TASK_ALWAYS_EAGER', False):
+        return task.apply(args=args, kwargs=kwargs, throw=True)
+    if getattr(settings, 'CELERY_BROKER_URL', ''):
+        return task.apply_async(args=args, kwargs=kwargs)
+    if _local_pool is None:
+        _local_pool = ThreadPoolExecutor(max_workers=LOCAL_WORKERS, thread_name_prefix='local-worker')
+    return _local_pool.submit(_run_locally, task, args, kwargs)
+
+
+def run_later(task, delay, *args, **kwargs):
+    """
+    Queue ``task`` to run in ``delay`` seconds; eager mode does not wait and skips it
+    """
+    if getattr(settings, 'CELERY_TASK_ALWAYS_EAGER', False):
+        return None
+    if getattr(settings, 'CELERY_BROKER_URL', ''):
+        return task.apply_async(args=args, kwargs=kwargs, countdown=delay)
+    timer = threading.Timer(delay, run_in_background, args=(task, *args), kwargs=kwargs)
+    timer.daemon = True
+    timer.start()
+    return timer
@@ -0,0 +1,114 @@
+"""
+Write-coalescing counters for hot, read-mostly pages.
+
+Incrementing a column on every page view costs a write per request, and on
+SQLite every write takes the database-wide lock. A ``BufferedCounter`` keeps
+increments in process memory instead and writes them in batches, at most
+every ``COUNTER_FLUSH_INTERVAL`` seconds, as ``UPDATE ... SET col = col + n``
+statements (one per distinct increment, covering every row that received
+it). Flushes run from ``request_finished``, after the response has been
+handed to the client, and once more when the process exits.
+
+Counts shown to visitors add the process's pending increments to the stored
+value, so they stay current while the database catches up.
+"""
+import atexit
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.signals import request_finished
+from django.db import DatabaseError, transaction
+from django.db.models import F
+
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = 10
+
+# Flush early once this many rows are waiting, to bound memory and loss on a crash
+MAX_PENDING = 1000
+
+_counters = []
+
+
+class BufferedCounter:
+    def __init__(self, model, field):
+        self.model = model
+        self.field = field
+        self._pending = defaultdict(int)
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        _counters.append(self)
+
+    def __repr__(self):
+        return f'<BufferedCounter {self.model._meta.label}.{self.field}>'
+
+    def increment(self, pk, amount=1):
+        with self._lock:
+            self._pending[pk] += amount
+
+    def pending(self, pk):
+        with self._lock:
+            return self._pending.get(pk, 0)
+
+    def current(self, obj):
+        """
+        ``obj``'s stored count plus increments not yet written
+        """
+        return getattr(obj, self.field) + self.pending(obj.pk)
+
+    def discard(self):
+        with self._lock:
+            self._pending.clear()
+
+    def due(self):
+        interval = getattr(settings, 'COUNTER_FLUSH_INTERVAL', FLUSH_INTERVAL)
+        with self._lock:
+            if not self._pending:
+                return False
+            return len(self._pending) >= MAX_PENDING or time.monotonic() - self._last_flush >= interval
+
+    def flush(self):
+        """
+        Write pending increments; returns the number of rows updated
+        """
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(int)
+            self._last_flush = time.monotonic()
+        if not pending:
+            return 0
+
+        by_amount = defaultdict(list)
+        for pk, amount in pending.items():
+            by_amount[amount].append(pk)
+        updated = 0
+        try:
+            with transaction.atomic(using=self.model.objects.db):
+                for amount, pks in by_amount.items():
+                    updated += self.model.objects.filter(pk__in=pks).update(
+                        **{self.field: F(self.field) + amount}
+                    )
+        except DatabaseError:
+            logger.exception('Could not flush %r; keeping %d pending rows', self, len(pending))
+            with self._lock:
+                for pk, amount in pending.items():
+                    self._pending[pk] += amount
+            return 0
+        return updated
+
+
+def flush_all(force=True):
+    for counter in _counters:
+        if force or counter.due():
+            counter.flush()
+
+
+def _flush_due(**kwargs):
+    flush_all(force=False)
+
+
+request_finished.connect(_flush_due, dispatch_uid='kurdish_apply.counters.flush')
+atexit.register(flush_all)
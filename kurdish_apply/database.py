@@ -0,0 +1,183 @@
+"""
+Database configuration from the environment, and read-replica routing.
+
+``databases`` builds ``settings.DATABASES`` from ``DATABASE_*`` variables
+(read by python-decouple, so a ``.env`` file works too). Without
+``DATABASE_ENGINE=postgresql`` the project keeps using ``db.sqlite3``.
+PostgreSQL connections are persistent (``DATABASE_CONN_MAX_AGE``) and
+checked before reuse, so a restarted server or a dropped connection costs
+one reconnect instead of a failed request. Behind a transaction-pooling
+PgBouncer (``DATABASE_POOLER=pgbouncer``) server-side cursors are turned off,
+because a cursor cannot outlive the transaction that the pooler hands its
+server connection back after.
+
+Setting ``DATABASE_REPLICA_HOST`` adds a ``replica`` alias. ``ReplicaRouter``
+sends reads of the ``REPLICA_APPS`` models there, but only while
+``ReplicaMiddleware`` has marked the request as a read-only request to one
+of those apps' views; admin pages and commands keep reading the primary.
+The first write routed during a marked request ends its replica reads, so
+signal handlers and anything else after a write read the primary too.
+With a replica, browsers that just sent a write are pinned to the primary for
+``REPLICA_PIN_SECONDS``, so they see their own changes even while the
+replica lags.
+"""
+import contextvars
+import time
+from contextlib import contextmanager
+
+
+REPLICA = 'replica'
+
+REPLICA_APPS = ('destinations', 'resources')
+
+REPLICA_PIN_SECONDS = 10
+PIN_COOKIE = 'db_primary_until'
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_replica_reads = contextvars.ContextVar('replica_reads', default=False)
+
+
+def _postgres(config, prefix, defaults=None):
+    defaults = defaults or {}
+
+    def value(name, default='', cast=str):
+        return config(f'{prefix}_{name}', default=defaults.get(name, default), cast=cast)
+
+    pooled = config('DATABASE_POOLER', default='') == 'pgbouncer'
+    options = {
+        'connect_timeout': config('DATABASE_CONNECT_TIMEOUT', default=5, cast=int),
+        'sslmode': config('DATABASE_SSLMODE', default='prefer'),
+        'application_name': config('DATABASE_APPLICATION_NAME', default='kurdish_apply'),
+    }
+    statement_timeout = config('DATABASE_STATEMENT_TIMEOUT', default=0, cast=int)
+    if statement_timeout and not pooled:
+        # PgBouncer rejects startup parameters it does not know
+        options['options'] = f'-c statement_timeout={statement_timeout}'
+    return {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': value('NAME', 'kurdish_apply'),
+        'USER': value('USER'),
+        'PASSWORD': value('PASSWORD'),
+        'HOST': value('HOST', 'localhost'),
+        'PORT': value('PORT', '5432'),
+        'CONN_MAX_AGE': config('DATABASE_CONN_MAX_AGE', default=600, cast=int),
+        'CONN_HEALTH_CHECKS': config('DATABASE_HEALTH_CHECKS', default=True, cast=bool),
+        'DISABLE_SERVER_SIDE_CURSORS': pooled,
+        'OPTIONS': options,
+    }
+
+
+def databases(config, base_dir):
+    """
+    ``settings.DATABASES`` for the environment ``config`` (``decouple.config``) describes
+    """
+    if config('DATABASE_ENGINE', default='sqlite') != 'postgresql':
+        return {
+            'default': {
+                'ENGINE': 'django.db.backends.sqlite3',
+                'NAME': config('DATABASE_NAME', default=str(base_dir / 'db.sqlite3')),
+            }
+        }
+
+    default = _postgres(config, 'DATABASE')
+    default['TEST'] = {'NAME': config('DATABASE_TEST_NAME', default=None)}
+    result = {'default': default}
+    if config('DATABASE_REPLICA_HOST', default=''):
+        # Anything not set for the replica is the same as for the primary
+        inherited = {name: default[name] for name in ('NAME', 'USER', 'PASSWORD', 'PORT')}
+        replica = _postgres(config, 'DATABASE_REPLICA', inherited)
+        # Tests run against one database; the replica alias reads it too
+        replica['TEST'] = {'MIRROR': 'default'}
+        result[REPLICA] = replica
+    return result
+
+
+@contextmanager
+def use_replica(enabled=True):
+    """
+    Let reads of the ``REPLICA_APPS`` models go to the replica (or, with ``enabled=False``, not)
+    """
+    token = _replica_reads.set(enabled)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def primary():
+    """
+    Read from the primary inside the block, e.g. to fill a cache that must not hold lagging data
+    """
+    return use_replica(False)
+
+
+def has_replica():
+    from django.db import connections
+
+    return REPLICA in connections.settings
+
+
+class ReplicaRouter:
+    """
+    Route reads of the read-only apps to the ``replica`` alias inside ``use_replica``
+    """
+    def db_for_read(self, model, **hints):
+        from django.db import connections
+
+        if not _replica_reads.get() or model._meta.app_label not in REPLICA_APPS:
+            return None
+        if not has_replica() or connections['default'].in_atomic_block:
+            # Inside a transaction the primary has rows the replica has not seen yet
+            return None
+        return REPLICA
+
+    def db_for_write(self, model, **hints):
+        # The replica has not seen this write yet; read the primary for the rest of the request
+        if _replica_reads.get():
+            _replica_reads.set(False)
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary
+        if {obj1._state.db, obj2._state.db} <= {'default', REPLICA}:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != REPLICA
+
+
+class ReplicaMiddleware:
+    """
+    Serve read-only requests to the ``REPLICA_APPS`` views from the replica
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request._replica_token = None
+        try:
+            response = self.get_response(request)
+        finally:
+            if request._replica_token is not None:
+                _replica_reads.reset(request._replica_token)
+
+        if request.method not in SAFE_METHODS and has_replica():
+            until = int(time.time()) + REPLICA_PIN_SECONDS
+            response.set_cookie(PIN_COOKIE, str(until), max_age=REPLICA_PIN_SECONDS, httponly=True, samesite='Lax')
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if request.method not in SAFE_METHODS or self.pinned(request):
+            return None
+        app_label = view_func.__module__.partition('.')[0]
+        if app_label in REPLICA_APPS:
+            request._replica_token = _replica_reads.set(True)
+        return None
+
+    def pinned(self, request):
+        try:
+            return int(request.COOKIES.get(PIN_COOKIE, 0)) > time.time()
+        except ValueError:
+            return False
@@ -0,0 +1,98 @@
+"""
+The project's translation memory.
+
+Curated translations live in one file, ``locale/glossary.json``, holding a
+``msgid -> translation`` map per language. ``Glossary.read`` loads it,
+after which lookups are dict accesses. The glossary is applied to the gettext catalogs with
+``export_po``, which makes a single pass over each catalog, and
+``import_po`` takes translators' work from a catalog back into the
+glossary.
+
+Keys are plain msgids, or ``msgctxt + "\\x04" + msgid`` for messages with a
+context, as in ``.mo`` files. Values are strings, or lists of forms for
+plural messages.
+"""
+import json
+from pathlib import Path
+
+from . import pofile
+
+
+DEFAULT_PATH = Path(__file__).resolve().parent.parent / 'locale' / 'glossary.json'
+
+CONTEXT_SEPARATOR = '\x04'
+
+
+def catalog_key(key):
+    """
+    The ``pofile.Catalog`` key for a glossary key
+    """
+    context, separator, msgid = key.rpartition(CONTEXT_SEPARATOR)
+    return (context, msgid) if separator else key
+
+
+class Glossary:
+    def __init__(self, languages=None, path=None):
+        self.languages = {language: dict(entries) for language, entries in (languages or {}).items()}
+        self.path = path
+
+    @classmethod
+    def read(cls, path=DEFAULT_PATH):
+        try:
+            with open(path, encoding='utf-8') as handle:
+                return cls(json.load(handle), path)
+        except FileNotFoundError:
+            return cls(path=path)
+
+    def __contains__(self, language):
+        return language in self.languages
+
+    def get(self, language, msgid, default=None):
+        return self.languages.get(language, {}).get(msgid, default)
+
+    def translations(self, language):
+        """
+        Every translation for ``language``, as a ``msgid -> translation`` dict
+        """
+        return self.languages.get(language, {})
+
+    def update(self, language, translations, overwrite=True):
+        """
+        Add ``translations`` for ``language``; returns how many were added or changed
+        """
+        entries = self.languages.setdefault(language, {})
+        changed = 0
+        for msgid, translation in translations.items():
+            if not translation or (msgid in entries and not overwrite) or entries.get(msgid) == translation:
+                continue
+            entries[msgid] = translation
+            changed += 1
+        return changed
+
+    def import_po(self, path, language, overwrite=False):
+        """
+        Take the translated, non-fuzzy messages of the catalog at ``path`` into the glossary
+        """
+        translations = {}
+        for entry in pofile.Catalog.load(path):
+            if entry.fuzzy or not entry.translated:
+                continue
+            key = entry.msgid if entry.msgctxt is None else f'{entry.msgctxt}{CONTEXT_SEPARATOR}{entry.msgid}'
+            if entry.msgid_plural is not None:
+                translations[key] = [entry.msgstr_plural[index] for index in sorted(entry.msgstr_plural)]
+            else:
+                translations[key] = entry.msgstr
+        return self.update(language, translations, overwrite=overwrite)
+
+    def export_po(self, path, language, overwrite=False):
+        """
+        Fill the catalog at ``path`` from the glossary; returns the changed entries
+        """
+        translations = {catalog_key(key): value for key, value in self.translations(language).items()}
+        return pofile.update_file(path, translations, overwrite=overwrite)
+
+    def save(self, path=None):
+        path = path or self.path or DEFAULT_PATH
+        data = json.dumps(self.languages, ensure_ascii=False, indent=1, sort_keys=True) + '\n'
+        pofile.write_atomic(path, data.encode('utf-8'))
+
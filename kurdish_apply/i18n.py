@@ -0,0 +1,346 @@
+"""
+Incremental compilation and live reloading of the gettext catalogs.
+
+``compile_catalogs`` compiles each ``django.po`` under ``LOCALE_PATHS`` to
+its ``django.mo`` only when the ``.po`` changed: the SHA-256 of the source is
+stored in the ``.mo`` header (``X-Source-Hash``) and compared on the next
+run. Changed catalogs are compiled in parallel worker processes. Before a
+catalog is written, every translation is checked against its msgid's format
+placeholders, because a translation with a placeholder the code does not
+pass breaks the page at render time; a catalog with errors keeps its
+previous ``.mo``.
+
+After compiling, ``announce_reload`` bumps a version counter in the cache.
+``TranslationReloadMiddleware`` looks at that counter at most every
+``RELOAD_CHECK_INTERVAL`` seconds and drops the process's loaded catalogs
+when it moved, so new translations reach running servers without a restart
+(with a shared cache backend such as Redis; the local-memory cache only
+reaches the compiling process).
+
+``warm_up`` (called from ``wsgi.py`` and ``asgi.py``) loads the catalogs of
+every language in ``LANGUAGES`` before the server forks its workers, and
+resolves every known msgid once per language into a ``PrecompiledCatalog``
+table. ``gettext``, ``{% trans %}`` and lazy strings then resolve with one
+dict lookup instead of walking Django's merged catalogs and fallbacks, and
+the tables are built once in the parent and shared by forked workers.
+Lookups are counted in ``catalog_stats`` (shown in the instrumentation
+report).
+"""
+import gc
+import gettext as gettext_module
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .pofile import Catalog, POError, mo_data, write_atomic
+
+
+DOMAIN = 'django'
+HASH_HEADER = 'X-Source-Hash'
+
+VERSION_KEY = 'i18n:catalog-version'
+RELOAD_CHECK_INTERVAL = 5
+
+PYTHON_FORMAT = re.compile(r'%(?:\((?P<name>[^)]*)\))?[#0 +-]*(?:\*|\d+)?(?:\.(?:\*|\d+))?[hlL]?(?P<type>[diouxXeEfFgGcrsa%])')
+BRACE_FORMAT = re.compile(r'(?<!\{)\{(?P<name>[^{}!:]*)(?:![rsa])?(?::[^{}]*)?\}(?!\})')
+
+
+@dataclass
+class Result:
+    po_path: str
+    compiled: bool = False
+    messages: int = 0
+    errors: tuple = ()
+
+
+def source_hash(path):
+    with open(path, 'rb') as handle:
+        return hashlib.sha256(handle.read()).hexdigest()
+
+
+def compiled_hash(mo_path):
+    """
+    The source hash recorded in a compiled catalog, or None
+    """
+    try:
+        with open(mo_path, 'rb') as handle:
+            return gettext_module.GNUTranslations(handle).info().get(HASH_HEADER.lower())
+    except (OSError, UnicodeDecodeError):
+        # Missing, unreadable or corrupt files are simply recompiled
+        return None
+
+
+def catalog_paths(locale_paths=None, locales=None):
+    """
+    Every ``(po_path, mo_path)`` under the locale directories, optionally only for ``locales``
+    """
+    for locale_path in locale_paths or settings.LOCALE_PATHS:
+        for po_path in sorted(Path(locale_path).glob(f'*/LC_MESSAGES/{DOMAIN}.po')):
+            if locales and po_path.parts[-3] not in locales:
+                continue
+            yield po_path, po_path.with_suffix('.mo')
+
+
+def _placeholders(text, flags):
+    if 'python-brace-format' in flags:
+        return [('{}', match.group('name')) for match in BRACE_FORMAT.finditer(text)]
+    return [
+        (match.group('type'), match.group('name'))
+        for match in PYTHON_FORMAT.finditer(text) if match.group('type') != '%'
+    ]
+
+
+def check_format(entry):
+    """
+    Problems with the placeholders of ``entry``'s translations, as messages
+    """
+    if 'python-format' not in entry.flags and 'python-brace-format' not in entry.flags:
+        return []
+    if entry.msgid_plural is not None:
+        pairs = [(entry.msgid_plural, text) for text in entry.msgstr_plural.values()]
+    else:
+        pairs = [(entry.msgid, entry.msgstr)]
+
+    problems = []
+    for source, translation in pairs:
+        if not translation:
+            continue
+        expected = _placeholders(source, entry.flags)
+        found = _placeholders(translation, entry.flags)
+        expected_names = {name for kind, name in expected if name}
+        found_names = {name for kind, name in found if name}
+        if found_names - expected_names:
+            problems.append(f'unknown placeholders {sorted(found_names - expected_names)}')
+        positional = [kind for kind, name in expected if not name]
+        if positional and [kind for kind, name in found if not name] != positional:
+            problems.append('positional placeholders do not match')
+    return [f'{entry.msgid!r}: {problem}' for problem in problems]
+
+
+def compile_catalog(po_path, mo_path, digest=None):
+    """
+    Check and compile one catalog; runs in a worker process
+    """
+    result = Result(str(po_path))
+    try:
+        catalog = Catalog.load(po_path)
+    except POError as error:
+        result.errors = (str(error),)
+        return result
+    errors = [problem for entry in catalog if not entry.fuzzy for problem in check_format(entry)]
+    if errors:
+        result.errors = tuple(errors)
+        return result
+
+    messages = catalog.messages()
+    header = messages.get('', '')
+    if header and not header.endswith('\n'):
+        header += '\n'
+    messages[''] = f'{header}{HASH_HEADER}: {digest or source_hash(po_path)}\n'
+    write_atomic(mo_path, mo_data(messages))
+    result.compiled = True
+    result.messages = len(messages) - 1
+    return result
+
+
+def stale_catalogs(locale_paths=None, locales=None, force=False):
+    """
+    ``(po_path, mo_path, digest)`` of every catalog whose ``.mo`` does not match its ``.po``
+    """
+    stale = []
+    for po_path, mo_path in catalog_paths(locale_paths, locales):
+        digest = source_hash(po_path)
+        if force or compiled_hash(mo_path) != digest:
+            stale.append((po_path, mo_path, digest))
+    return stale
+
+
+def compile_catalogs(locale_paths=None, locales=None, force=False, workers=None):
+    """
+    Compile the catalogs that changed; returns a ``Result`` per compiled or failed catalog
+    """
+    stale = stale_catalogs(locale_paths, locales, force)
+    if len(stale) <= 1 or workers == 1:
+        return [compile_catalog(*arguments) for arguments in stale]
+    with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count() or 1, len(stale))) as executor:
+        return list(executor.map(compile_catalog, *zip(*stale)))
+
+
+def announce_reload():
+    """
+    Tell every process to reload its catalogs
+    """
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, 1, None)
+
+
+def reset_translations():
+    """
+    Drop this process's loaded catalogs; the next ``activate()`` reads the ``.mo`` files again
+    """
+    from django.utils.translation import trans_real
+
+    gettext_module._translations = {}
+    trans_real._translations = {}
+    trans_real._default = None
+    if _preloaded:
+        preload(_preloaded)
+
+
+# Messages resolved after warm-up that are remembered per language
+MAX_LATE_MESSAGES = 5000
+
+
+class CatalogStats:
+    """
+    Lookup counts and resolution time per language; approximate when threads race
+    """
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.hits = defaultdict(int)
+        self.misses = defaultdict(int)
+        self.untranslated = defaultdict(int)
+        self.resolve_seconds = defaultdict(float)
+        self.preload_seconds = 0.0
+
+    def report(self):
+        languages = sorted(set(self.hits) | set(self.misses))
+        return {
+            'preload_ms': round(self.preload_seconds * 1000, 3),
+            'languages': {
+                language: {
+                    'hits': self.hits[language],
+                    'misses': self.misses[language],
+                    'untranslated': self.untranslated[language],
+                    'resolve_ms': round(self.resolve_seconds[language] * 1000, 3),
+                }
+                for language in languages
+            },
+        }
+
+
+catalog_stats = CatalogStats()
+
+
+class PrecompiledCatalog:
+    """
+    ``gettext`` for one language from a table of already-resolved messages
+
+    Messages the table does not know (built at run time, or added to the
+    code after warm-up) are resolved through the original catalog once and
+    remembered, up to ``MAX_LATE_MESSAGES``.
+    """
+    def __init__(self, translation_object, language, msgids):
+        self.language = language
+        self.resolve = translation_object.gettext
+        self.table = {msgid: self.resolve(msgid) for msgid in msgids}
+        self.late = {}
+
+    def gettext(self, message):
+        result = self.table.get(message)
+        if result is None:
+            result = self.late.get(message)
+        if result is not None:
+            catalog_stats.hits[self.language] += 1
+            return result
+
+        started = time.perf_counter()
+        result = self.resolve(message)
+        catalog_stats.resolve_seconds[self.language] += time.perf_counter() - started
+        catalog_stats.misses[self.language] += 1
+        if result == message:
+            catalog_stats.untranslated[self.language] += 1
+        if len(self.late) < MAX_LATE_MESSAGES:
+            self.late[message] = result
+        return result
+
+
+_preloaded = ()
+
+
+def preload(languages=None):
+    """
+    Load the catalogs of ``languages`` (default: ``LANGUAGES``) and precompile their messages
+    """
+    global _preloaded
+    from django.utils.translation import trans_real
+
+    started = time.perf_counter()
+    languages = tuple(languages or [code for code, name in settings.LANGUAGES])
+    objects = {language: trans_real.translation(language) for language in languages}
+    msgids = {
+        key for translation_object in objects.values()
+        for key in translation_object._catalog.keys() if isinstance(key, str) and key
+    }
+    for language, translation_object in objects.items():
+        if not isinstance(getattr(translation_object.gettext, '__self__', None), PrecompiledCatalog):
+            translation_object.gettext = PrecompiledCatalog(translation_object, language, msgids).gettext
+    trans_real._default = objects.get(settings.LANGUAGE_CODE) or trans_real.translation(settings.LANGUAGE_CODE)
+    _preloaded = languages
+    catalog_stats.preload_seconds = time.perf_counter() - started
+    return objects
+
+
+def warm_up():
+    """
+    Preload the catalogs in the server process, before it forks workers (``PRELOAD_TRANSLATIONS``)
+    """
+    if not getattr(settings, 'PRELOAD_TRANSLATIONS', True) or not settings.USE_I18N:
+        return
+    preload()
+    # Keep the garbage collector from touching, and so copying, the pages forked workers share
+    gc.freeze()
+
+
+class _ReloadState:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.version = None
+        self.checked_at = 0.0
+
+    def check(self, now=None):
+        now = time.monotonic() if now is None else now
+        if now - self.checked_at < RELOAD_CHECK_INTERVAL:
+            return False
+        with self.lock:
+            if now - self.checked_at < RELOAD_CHECK_INTERVAL:
+                return False
+            self.checked_at = now
+            version = cache.get(VERSION_KEY, 0)
+            if self.version is None:
+                # Catalogs loaded at startup are current
+                self.version = version
+                return False
+            if version == self.version:
+                return False
+            self.version = version
+        reset_translations()
+        return True
+
+
+reload_state = _ReloadState()
+
+
+class TranslationReloadMiddleware:
+    """
+    Reload the catalogs when ``compile_translations`` announced new ones; place before LocaleMiddleware
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        reload_state.check()
+        return self.get_response(request)
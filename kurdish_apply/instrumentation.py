@@ -0,0 +1,223 @@
+"""
+Per-view query and render instrumentation.
+
+``QueryBudgetMiddleware`` wraps every database connection for the duration
+of a request and records, per resolved view name, how many queries ran, how
+long they took, how many were exact repeats of an earlier query (the usual
+sign of an N+1 loop) and how long the template took to render. Aggregates
+are kept in process memory and served to staff by ``report_view``; with
+``DEBUG`` on, each response also carries its own figures as ``X-Query-*``
+headers.
+
+Views declare a budget with a ``query_budget`` attribute (or in the
+``QUERY_BUDGETS`` setting, keyed by view name) covering the whole request,
+including the session and user lookups of a signed-in visitor. Requests over budget are
+logged, or raise ``QueryBudgetExceeded`` when ``QUERY_BUDGET_RAISE`` is set,
+which makes a test fail on the offending request.
+"""
+import logging
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.db import connections
+from django.http import JsonResponse
+
+from . import i18n
+
+
+logger = logging.getLogger(__name__)
+
+UNRESOLVED = '<unresolved>'
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryRecorder:
+    """
+    ``execute_wrapper`` callable collecting the SQL, parameters and duration of each query
+    """
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, _freeze(params), time.perf_counter() - start))
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    @property
+    def duration(self):
+        return sum(duration for _, _, duration in self.queries)
+
+    def duplicates(self):
+        """
+        ``(repeats, most repeated SQL)``; repeats counts every execution after the first
+        """
+        counts = Counter((sql, params) for sql, params, _ in self.queries)
+        repeats = sum(count - 1 for count in counts.values())
+        if not repeats:
+            return 0, None
+        (sql, _), _ = counts.most_common(1)[0]
+        return repeats, sql
+
+
+def _freeze(params):
+    if isinstance(params, (list, tuple)):
+        return tuple(_freeze(param) for param in params)
+    if isinstance(params, dict):
+        return tuple(sorted((key, _freeze(value)) for key, value in params.items()))
+    try:
+        hash(params)
+    except TypeError:
+        return repr(params)
+    return params
+
+
+class ViewStats:
+    """
+    Running totals per view name, shared by every thread of the process
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = {}
+
+    def record(self, view_name, queries, sql_time, duplicates, duplicate_sql, render_time):
+        with self._lock:
+            stats = self._views.setdefault(view_name, {
+                'requests': 0,
+                'queries': 0,
+                'max_queries': 0,
+                'sql_time': 0.0,
+                'duplicates': 0,
+                'render_time': 0.0,
+                'over_budget': 0,
+                'duplicate_sql': None,
+            })
+            stats['requests'] += 1
+            stats['queries'] += queries
+            stats['max_queries'] = max(stats['max_queries'], queries)
+            stats['sql_time'] += sql_time
+            stats['duplicates'] += duplicates
+            stats['render_time'] += render_time
+            if duplicate_sql:
+                stats['duplicate_sql'] = duplicate_sql
+
+    def over_budget(self, view_name):
+        with self._lock:
+            if view_name in self._views:
+                self._views[view_name]['over_budget'] += 1
+
+    def report(self):
+        """
+        Per-view averages and totals, worst average query count first
+        """
+        with self._lock:
+            views = {name: dict(stats) for name, stats in self._views.items()}
+        report = []
+        for name, stats in views.items():
+            requests = stats['requests']
+            report.append({
+                'view': name,
+                'budget': budget_for(name),
+                'requests': requests,
+                'avg_queries': round(stats['queries'] / requests, 2),
+                'max_queries': stats['max_queries'],
+                'avg_sql_ms': round(stats['sql_time'] * 1000 / requests, 2),
+                'avg_render_ms': round(stats['render_time'] * 1000 / requests, 2),
+                'duplicates': stats['duplicates'],
+                'over_budget': stats['over_budget'],
+                'duplicate_sql': stats['duplicate_sql'],
+            })
+        return sorted(report, key=lambda row: (-row['avg_queries'], row['view']))
+
+    def reset(self):
+        with self._lock:
+            self._views.clear()
+
+
+stats = ViewStats()
+
+# Budgets declared by views, keyed by view name as requests resolve them
+_declared_budgets = {}
+
+
+def budget_for(view_name, view_func=None):
+    budgets = getattr(settings, 'QUERY_BUDGETS', {})
+    if view_name in budgets:
+        return budgets[view_name]
+    view_class = getattr(view_func, 'view_class', None)
+    budget = getattr(view_class or view_func, 'query_budget', None)
+    if budget is not None:
+        _declared_budgets[view_name] = budget
+    return _declared_budgets.get(view_name)
+
+
+class QueryBudgetMiddleware:
+    """
+    Record queries and render time per view; keep it first in ``MIDDLEWARE``
+    so session and authentication queries are counted too
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        request._render_time = 0.0
+        with ExitStack() as stack:
+            # Every alias, so queries routed to another database are counted too
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+
+        match = request.resolver_match
+        view_name = match.view_name if match else UNRESOLVED
+        duplicates, duplicate_sql = recorder.duplicates()
+        stats.record(view_name, recorder.count, recorder.duration, duplicates, duplicate_sql,
+                     request._render_time)
+
+        budget = budget_for(view_name, match.func if match else None)
+        if budget is not None and recorder.count > budget:
+            stats.over_budget(view_name)
+            message = f'{view_name} ran {recorder.count} queries, over its budget of {budget}'
+            if getattr(settings, 'QUERY_BUDGET_RAISE', False):
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+
+        if settings.DEBUG:
+            response['X-View-Name'] = view_name
+            response['X-Query-Count'] = str(recorder.count)
+            response['X-Query-Time-Ms'] = f'{recorder.duration * 1000:.2f}'
+            response['X-Query-Duplicates'] = str(duplicates)
+            response['X-Template-Render-Ms'] = f'{request._render_time * 1000:.2f}'
+            if budget is not None:
+                response['X-Query-Budget'] = str(budget)
+        return response
+
+    def process_template_response(self, request, response):
+        # Being first in MIDDLEWARE, this hook runs last, right before rendering
+        start = time.perf_counter()
+
+        def rendered(response):
+            request._render_time += time.perf_counter() - start
+
+        response.add_post_render_callback(rendered)
+        return response
+
+
+@staff_member_required
+def report_view(request):
+    """
+    Aggregated per-view figures and translation lookups since the process started, as JSON
+    """
+    return JsonResponse({'views': stats.report(), 'translations': i18n.catalog_stats.report()})
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from kurdish_apply import i18n
+
+
+class Command(BaseCommand):
+    help = 'Compile the .po catalogs that changed since their .mo was built and have running servers reload them'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--locale', '-l', action='append', dest='locales',
+                            help='Only compile this locale; may be given several times')
+        parser.add_argument('--force', action='store_true', help='Compile every catalog, changed or not')
+        parser.add_argument('--workers', type=int, help='Worker processes; defaults to one per CPU')
+        parser.add_argument('--no-reload', action='store_true', help='Do not tell running processes to reload')
+
+    def handle(self, *args, **options):
+        results = i18n.compile_catalogs(locales=options['locales'], force=options['force'], workers=options['workers'])
+        failed = [result for result in results if result.errors]
+        compiled = [result for result in results if result.compiled]
+        for result in compiled:
+            self.stdout.write(f'Compiled {result.messages} messages from {result.po_path}')
+        for result in failed:
+            self.stderr.write(f'{result.po_path}:')
+            for error in result.errors:
+                self.stderr.write(f'  {error}')
+
+        if compiled and not options['no_reload']:
+            i18n.announce_reload()
+        if not results:
+            self.stdout.write('All catalogs are up to date.')
+        if failed:
+            raise CommandError(f'{len(failed)} catalogs have errors and were not compiled.')
+        if compiled:
+            self.stdout.write(self.style.SUCCESS(f'Compiled {len(compiled)} catalogs.'))
@@ -0,0 +1,28 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from kurdish_apply import synthetic
+
+
+class Command(BaseCommand):
+    help = 'Fill the database with a deterministic synthetic dataset for profiling and benchmarks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', choices=sorted(synthetic.SCALES), default='small')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--base-date', type=datetime.date.fromisoformat,
+                            help='Date deadlines and histories are relative to (YYYY-MM-DD); defaults to today')
+        parser.add_argument('--clear', action='store_true', help='Delete a previously generated dataset first')
+
+    def handle(self, *args, **options):
+        if options['clear']:
+            synthetic.clear()
+            self.stdout.write('Removed the previous synthetic dataset.')
+        elif synthetic.exists():
+            raise CommandError('A synthetic dataset already exists; pass --clear to replace it.')
+
+        counts = synthetic.generate(
+            scale=options['scale'], seed=options['seed'], base_date=options['base_date'], stdout=self.stdout,
+        )
+        self.stdout.write(self.style.SUCCESS(f'Created {sum(counts.values())} rows.'))
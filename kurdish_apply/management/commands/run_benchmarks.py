@@ -0,0 +1,35 @@
+import argparse
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from kurdish_apply import benchmark
+
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f'must be at least 1, got {number}')
+    return number
+
+
+class Command(BaseCommand):
+    help = 'Time every page against the current database and write a JSON report'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=positive_int, default=5, help='Timed requests per URL and language')
+        parser.add_argument('--language', action='append', dest='languages',
+                            choices=[code for code, name in settings.LANGUAGES],
+                            help='Language to request (repeatable); defaults to all')
+        parser.add_argument('--username', help='Sign in as this user instead of the busiest synthetic student')
+        parser.add_argument('--output', default='benchmark.json')
+
+    def handle(self, *args, **options):
+        report = benchmark.run(
+            repeat=options['repeat'],
+            languages=options['languages'],
+            username=options['username'],
+            stdout=self.stdout,
+        )
+        benchmark.write_report(report, options['output'])
+        self.stdout.write(self.style.SUCCESS(f"Wrote {len(report['results'])} results to {options['output']}"))
@@ -0,0 +1,237 @@
+"""
+Keyset (cursor) pagination for list views.
+
+Offset pagination makes the database walk past every skipped row and count
+the whole result set on each page. A cursor instead records the ordering
+key values of the last row shown, and the next page is fetched with a
+``WHERE (keys) > (cursor)`` range condition that an index can answer
+directly, however deep the page.
+"""
+import datetime
+import json
+
+from django.core import signing
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import F, Q
+from django.http import Http404
+from django.utils.translation import gettext_lazy as _
+
+
+CURSOR_SALT = 'kurdish_apply.pagination.cursor'
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+class _CursorEncoder(DjangoJSONEncoder):
+    def default(self, o):
+        # Keep microseconds, which DjangoJSONEncoder rounds away, so equality holds
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+class _CursorSerializer(signing.JSONSerializer):
+    def dumps(self, obj):
+        return json.dumps(obj, separators=(',', ':'), cls=_CursorEncoder).encode('latin-1')
+
+
+def _ordering(queryset):
+    """
+    Return ``[(field, descending)]`` for ``queryset``, made unique with a pk tiebreaker
+    """
+    names = list(queryset.query.order_by)
+    if not names and queryset.query.default_ordering:
+        names = list(queryset.model._meta.ordering)
+    ordering = []
+    for name in names:
+        if not isinstance(name, str):
+            raise ValueError('Cursor pagination only supports field name orderings.')
+        descending = name.startswith('-')
+        ordering.append((name.lstrip('-'), descending))
+    if not any(field in ('pk', queryset.model._meta.pk.name) for field, _ in ordering):
+        ordering.append(('pk', False))
+    return ordering
+
+
+def _key_value(obj, field):
+    for attr in field.split('__'):
+        if obj is None:
+            return None
+        obj = getattr(obj, attr)
+    return obj
+
+
+def _position(field, descending, value, after):
+    """
+    Rows strictly after (or before) ``value`` in ``field`` alone, with NULLs sorted last
+    """
+    if value is None:
+        # Nothing sorts after NULL; everything non-NULL sorts before it
+        return Q(pk__in=[]) if after else Q(**{f'{field}__isnull': False})
+    lookup = 'lt' if descending == after else 'gt'
+    condition = Q(**{f'{field}__{lookup}': value})
+    if after:
+        condition |= Q(**{f'{field}__isnull': True})
+    return condition
+
+
+def _equal(field, value):
+    if value is None:
+        return Q(**{f'{field}__isnull': True})
+    return Q(**{field: value})
+
+
+def keyset_filter(ordering, values, after=True):
+    """
+    Build ``(k1, k2, ...) > (v1, v2, ...)`` as nested ORs honouring each key's direction
+    """
+    condition = Q(pk__in=[])
+    prefix = Q()
+    for (field, descending), value in zip(ordering, values):
+        condition |= prefix & _position(field, descending, value, after)
+        prefix &= _equal(field, value)
+    return condition
+
+
+def estimate_count(queryset, cap=1000):
+    """
+    Cheap total for display: the planner's row estimate on PostgreSQL,
+    otherwise an exact count that stops after ``cap`` rows
+
+    Returns ``(total, is_estimate)``.
+    """
+    if connections[queryset.db].vendor == 'postgresql':
+        plan = queryset.order_by().explain(format='json')
+        return int(json.loads(plan)[0]['Plan']['Plan Rows']), True
+    total = queryset.order_by()[:cap + 1].count()
+    return min(total, cap), total > cap
+
+
+class CursorPage:
+    """
+    One page of a ``CursorPaginator``, mirroring the parts of Django's ``Page`` templates use
+    """
+    def __init__(self, object_list, paginator, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """
+    Paginate ``queryset`` by its ordering keys instead of by offset
+
+    Cursors are signed, so clients cannot forge them, and only ever carry
+    the key values of a page boundary row.
+    """
+    def __init__(self, queryset, per_page, with_total=False):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.ordering = _ordering(queryset)
+        self.with_total = with_total
+        self._total = None
+
+    def encode_cursor(self, obj, after):
+        values = [_key_value(obj, field) for field, _ in self.ordering]
+        return signing.dumps(
+            {'after': after, 'values': values},
+            salt=CURSOR_SALT,
+            serializer=_CursorSerializer,
+            compress=True,
+        )
+
+    def decode_cursor(self, cursor):
+        try:
+            data = signing.loads(cursor, salt=CURSOR_SALT, serializer=_CursorSerializer)
+        except signing.BadSignature:
+            raise InvalidCursor(cursor)
+        if len(data.get('values', ())) != len(self.ordering):
+            raise InvalidCursor(cursor)
+        return bool(data.get('after', True)), data['values']
+
+    def _ordered(self, reverse):
+        expressions = []
+        for field, descending in self.ordering:
+            # NULLs sort last going forward, so they come first when walking back
+            nulls = {'nulls_first': True} if reverse else {'nulls_last': True}
+            if descending != reverse:
+                expressions.append(F(field).desc(**nulls))
+            else:
+                expressions.append(F(field).asc(**nulls))
+        return self.queryset.order_by(*expressions)
+
+    def page(self, cursor=None):
+        after, values = self.decode_cursor(cursor) if cursor else (True, None)
+        queryset = self._ordered(reverse=not after)
+        if values is not None:
+            queryset = queryset.filter(keyset_filter(self.ordering, values, after=after))
+
+        rows = list(queryset[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if not after:
+            rows.reverse()
+
+        next_cursor = previous_cursor = None
+        if rows:
+            if has_more or not after:
+                next_cursor = self.encode_cursor(rows[-1], after=True)
+            if (has_more and not after) or (after and values is not None):
+                previous_cursor = self.encode_cursor(rows[0], after=False)
+        return CursorPage(rows, self, next_cursor, previous_cursor)
+
+    @property
+    def total(self):
+        """
+        ``(count, is_estimate)`` when ``with_total`` is set, else None
+        """
+        if self.with_total and self._total is None:
+            self._total = estimate_count(self.queryset)
+        return self._total
+
+
+class CursorPaginationMixin:
+    """
+    ListView mixin switching ``paginate_by`` to cursor pagination
+
+    The page is selected with ``?cursor=``; ``page_obj.next_cursor`` and
+    ``page_obj.previous_cursor`` link to its neighbours. Requests that still
+    carry ``?page=`` keep the offset paginator, so old links keep working.
+    Set ``cursor_total`` to expose an approximate result count as
+    ``paginator.total``.
+    """
+    cursor_kwarg = 'cursor'
+    cursor_total = False
+
+    def paginate_queryset(self, queryset, page_size):
+        if self.page_kwarg in self.request.GET and self.cursor_kwarg not in self.request.GET:
+            return super().paginate_queryset(queryset, page_size)
+
+        paginator = CursorPaginator(queryset, page_size, with_total=self.cursor_total)
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        except InvalidCursor:
+            raise Http404(_('Invalid page cursor.'))
+        return paginator, page, page.object_list, page.has_other_pages()
@@ -0,0 +1,314 @@
+"""
+Reading and updating gettext ``.po`` catalogs.
+
+``Catalog.load`` reads a catalog in one pass into entries that keep their
+original lines, indexed by ``(msgctxt, msgid)``. ``Catalog.update`` applies
+any number of translations through that index, and only the ``msgstr`` lines
+of the entries it changes are rewritten, so comments, references, flags
+(including ``fuzzy``), obsolete entries and the file's own line wrapping
+survive untouched. ``Catalog.save`` writes to a temporary file next to the
+catalog and renames it into place, so a crash never leaves a half-written
+catalog for ``compilemessages`` to pick up.
+
+Multi-line strings, plural forms and message contexts are supported.
+``Catalog.messages`` and ``mo_data`` produce the binary ``.mo`` form that
+``gettext`` loads, without needing GNU msgfmt.
+"""
+import os
+import re
+import struct
+import tempfile
+from dataclasses import dataclass, field
+
+
+KEYWORD = re.compile(r'^(msgctxt|msgid_plural|msgid|msgstr(?:\[(\d+)\])?)\s+(".*")\s*$')
+
+ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', '"': '"', '\\': '\\', 'a': '\a', 'b': '\b', 'f': '\f', 'v': '\v'}
+UNESCAPE = re.compile(r'\\(.)')
+QUOTE = str.maketrans({'\\': '\\\\', '"': '\\"', '\n': '\\n', '\t': '\\t', '\r': '\\r'})
+
+
+class POError(ValueError):
+    pass
+
+
+def unquote(text):
+    """
+    The value of one quoted, C-escaped PO string
+    """
+    if len(text) < 2 or text[0] != '"' or text[-1] != '"':
+        raise POError(f'Expected a quoted string, got {text!r}')
+    return UNESCAPE.sub(lambda match: ESCAPES.get(match.group(1), match.group(0)), text[1:-1])
+
+
+def quote(value):
+    return '"' + value.translate(QUOTE) + '"'
+
+
+def format_string(keyword, value):
+    """
+    PO lines for ``keyword value``; multi-line values get one line per line, like msgmerge writes them
+    """
+    lines = value.splitlines(keepends=True)
+    if len(lines) <= 1:
+        return [f'{keyword} {quote(value)}\n']
+    return [f'{keyword} ""\n'] + [quote(line) + '\n' for line in lines]
+
+
+@dataclass(eq=False)
+class Entry:
+    lines: list = field(default_factory=list)
+    msgctxt: str = None
+    msgid: str = None
+    msgid_plural: str = None
+    msgstr: str = ''
+    msgstr_plural: dict = field(default_factory=dict)
+    flags: frozenset = frozenset()
+    obsolete: bool = False
+    # Where the msgstr lines are in ``lines``, so updates can replace just them
+    msgstr_start: int = None
+    msgstr_end: int = None
+
+    @property
+    def key(self):
+        return self.msgctxt, self.msgid
+
+    @property
+    def fuzzy(self):
+        return 'fuzzy' in self.flags
+
+    @property
+    def translated(self):
+        if self.msgid_plural is not None:
+            return bool(self.msgstr_plural) and all(self.msgstr_plural.values())
+        return bool(self.msgstr)
+
+    def set_translation(self, value):
+        """
+        Replace the translation; ``value`` is a string, or a sequence of forms for plural entries
+        """
+        if self.msgid_plural is not None:
+            if isinstance(value, str):
+                raise POError(f'{self.msgid!r} is a plural message; give a sequence of forms')
+            forms = list(value)
+            # The catalog lists one msgstr per form its Plural-Forms header requires
+            if self.msgstr_plural and len(forms) != len(self.msgstr_plural):
+                raise POError(f'{self.msgid!r} needs {len(self.msgstr_plural)} plural forms, got {len(forms)}')
+            self.msgstr_plural = dict(enumerate(forms))
+            new_lines = [line for index, form in enumerate(forms) for line in format_string(f'msgstr[{index}]', form)]
+        else:
+            if not isinstance(value, str):
+                raise POError(f'{self.msgid!r} has no plural forms')
+            self.msgstr = value
+            new_lines = format_string('msgstr', value)
+        self.lines[self.msgstr_start:self.msgstr_end] = new_lines
+        self.msgstr_end = self.msgstr_start + len(new_lines)
+
+
+class _Parser:
+    def __init__(self):
+        self.entries = []
+        self.entry = Entry()
+        # The field continuation lines ("...") belong to
+        self.current = None
+        self.separated = False
+
+    def finish(self):
+        entry = self.entry
+        if entry.lines:
+            if entry.msgstr_start is not None and entry.msgstr_end is None:
+                entry.msgstr_end = len(entry.lines)
+            self.entries.append(entry)
+        self.entry = Entry()
+        self.current = None
+        self.separated = False
+
+    def feed(self, number, line):
+        entry = self.entry
+        stripped = line.strip()
+        if not stripped:
+            if entry.msgstr_start is not None and entry.msgstr_end is None:
+                entry.msgstr_end = len(entry.lines)
+            entry.lines.append(line)
+            self.current = None
+            self.separated = True
+            return
+        starts_entry = stripped.startswith('#') or stripped.startswith('msgctxt') or stripped.startswith('msgid ')
+        # Entries are separated by blank lines, or follow a msgstr directly
+        if self.separated or (entry.msgstr_start is not None and starts_entry):
+            self.finish()
+            entry = self.entry
+        entry.lines.append(line)
+        if stripped.startswith('#~'):
+            entry.obsolete = True
+            return
+        if stripped.startswith('#,'):
+            entry.flags = entry.flags | {flag.strip() for flag in stripped[2:].split(',') if flag.strip()}
+            return
+        if stripped.startswith('#'):
+            return
+        if stripped.startswith('"'):
+            if self.current is None:
+                raise POError(f'Line {number}: string without a keyword')
+            self._append(self.current, unquote(stripped))
+            return
+
+        match = KEYWORD.match(stripped)
+        if not match:
+            raise POError(f'Line {number}: cannot parse {stripped!r}')
+        keyword, index, value = match.groups()
+        if keyword.startswith('msgstr'):
+            if entry.msgstr_start is None:
+                entry.msgstr_start = len(entry.lines) - 1
+            self.current = ('msgstr', int(index)) if index is not None else ('msgstr', None)
+        else:
+            self.current = (keyword, None)
+        self._set(self.current, '')
+        self._append(self.current, unquote(value))
+
+    def _set(self, current, value):
+        name, index = current
+        if index is not None:
+            self.entry.msgstr_plural[index] = value
+        else:
+            setattr(self.entry, name, value)
+
+    def _append(self, current, value):
+        name, index = current
+        if index is not None:
+            self.entry.msgstr_plural[index] += value
+        else:
+            setattr(self.entry, name, getattr(self.entry, name) + value)
+
+
+class Catalog:
+    def __init__(self, entries, path=None):
+        self.entries = entries
+        self.path = path
+        self.index = {entry.key: entry for entry in entries if entry.msgid is not None and not entry.obsolete}
+
+    @classmethod
+    def parse(cls, lines, path=None):
+        parser = _Parser()
+        for number, line in enumerate(lines, 1):
+            parser.feed(number, line)
+        parser.finish()
+        return cls(parser.entries, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding='utf-8') as handle:
+            return cls.parse(handle, path)
+
+    @property
+    def header(self):
+        return self.index.get((None, ''))
+
+    def __iter__(self):
+        """
+        The catalog's messages, without the header and obsolete entries
+        """
+        return (entry for key, entry in self.index.items() if key != (None, ''))
+
+    def __len__(self):
+        return len(self.index) - (1 if (None, '') in self.index else 0)
+
+    def get(self, msgid, context=None):
+        return self.index.get((context, msgid))
+
+    def update(self, translations, overwrite=False):
+        """
+        Apply ``translations`` and return the entries that changed
+
+        Keys are msgids or ``(msgctxt, msgid)`` pairs; values are strings, or
+        sequences of forms for plural messages. Entries that already have a
+        translation, including fuzzy ones, are left alone unless
+        ``overwrite`` is set. Flags are never changed.
+        """
+        updated = []
+        for key, value in translations.items():
+            entry = self.index.get(key if isinstance(key, tuple) else (None, key))
+            if entry is None or not value or (entry.translated and not overwrite):
+                continue
+            entry.set_translation(value)
+            updated.append(entry)
+        return updated
+
+    def lines(self):
+        for entry in self.entries:
+            yield from entry.lines
+
+    def messages(self):
+        """
+        The ``.mo`` keys and values of the header and every translated, non-fuzzy message
+        """
+        messages = {}
+        for key, entry in self.index.items():
+            if key != (None, '') and (entry.fuzzy or not entry.translated):
+                continue
+            msgid = entry.msgid if entry.msgctxt is None else f'{entry.msgctxt}\x04{entry.msgid}'
+            if entry.msgid_plural is not None:
+                forms = [entry.msgstr_plural[index] for index in sorted(entry.msgstr_plural)]
+                messages[f'{msgid}\x00{entry.msgid_plural}'] = '\x00'.join(forms)
+            else:
+                messages[msgid] = entry.msgstr
+        return messages
+
+    def save(self, path=None):
+        """
+        Write the catalog atomically to ``path`` (default: where it was loaded from)
+        """
+        write_atomic(path or self.path, ''.join(self.lines()).encode('utf-8'))
+
+
+def update_file(path, translations, overwrite=False):
+    """
+    Apply ``translations`` to the catalog at ``path``, saving it when something changed; returns the changed entries
+    """
+    catalog = Catalog.load(path)
+    updated = catalog.update(translations, overwrite=overwrite)
+    if updated:
+        catalog.save()
+    return updated
+
+
+def mo_data(messages):
+    """
+    A little-endian GNU ``.mo`` file holding ``messages`` (key to value, as from ``Catalog.messages``)
+    """
+    keys = sorted(messages)
+    ids = b''
+    strs = b''
+    offsets = []
+    for key in keys:
+        encoded_id, encoded_str = key.encode('utf-8'), messages[key].encode('utf-8')
+        offsets.append((len(ids), len(encoded_id), len(strs), len(encoded_str)))
+        ids += encoded_id + b'\0'
+        strs += encoded_str + b'\0'
+    # Header, then the original and translated string tables, then the strings themselves
+    key_start = 7 * 4 + 16 * len(keys)
+    value_start = key_start + len(ids)
+    key_table = []
+    value_table = []
+    for id_offset, id_length, str_offset, str_length in offsets:
+        key_table += [id_length, id_offset + key_start]
+        value_table += [str_length, str_offset + value_start]
+    header = struct.pack('<7I', 0x950412de, 0, len(keys), 7 * 4, 7 * 4 + len(keys) * 8, 0, 0)
+    return header + struct.pack(f'<{len(key_table) * 2}I', *key_table, *value_table) + ids + strs
+
+
+def write_atomic(path, data):
+    """
+    Replace the file at ``path`` with ``data`` (bytes) without ever exposing a partial file
+    """
+    path = os.fspath(path)
+    handle, temporary = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix='.', suffix='.tmp')
+    try:
+        with os.fdopen(handle, 'wb') as output:
+            output.write(data)
+        if os.path.exists(path):
+            os.chmod(temporary, os.stat(path).st_mode & 0o777)
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
@@ -12,6 +12,10 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 
+from decouple import config
+
+from kurdish_apply import database
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -45,6 +49,7 @@ INSTALLED_APPS = [
     "crispy_bootstrap5",
     
     # Local apps
+    "kurdish_apply",  # Project-wide management commands
     "accounts",
     "destinations",
     "resume_builder",
@@ -53,8 +58,11 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "kurdish_apply.instrumentation.QueryBudgetMiddleware",  # First, to count every query
     "django.middleware.security.SecurityMiddleware",
+    "kurdish_apply.database.ReplicaMiddleware",  # Read-only destination and resource pages read the replica
     "django.contrib.sessions.middleware.SessionMiddleware",
+    "kurdish_apply.i18n.TranslationReloadMiddleware",  # Before LocaleMiddleware activates a catalog
     "django.middleware.locale.LocaleMiddleware",  # For i18n support
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -86,15 +94,83 @@ WSGI_APPLICATION = "kurdish_apply.wsgi.application"
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
+# db.sqlite3 unless DATABASE_ENGINE=postgresql; see kurdish_apply.database for
+# the DATABASE_* variables (persistent connections, PgBouncer, read replica).
+
+DATABASES = database.databases(config, BASE_DIR)
+DATABASE_ROUTERS = ["kurdish_apply.database.ReplicaRouter"]
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Per-process memory by default; use django.core.cache.backends.redis.RedisCache
+# (LOCATION "redis://host:6379/1") when running several workers.
 
-DATABASES = {
+CACHES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "kurdish-apply",
     }
 }
 
 
+# Query instrumentation (kurdish_apply.instrumentation)
+# Budgets by view name, overriding a view's ``query_budget`` attribute
+QUERY_BUDGETS = {}
+# Raise instead of logging when a request exceeds its budget
+QUERY_BUDGET_RAISE = False
+
+# Seconds between batched writes of buffered counters (kurdish_apply.counters)
+COUNTER_FLUSH_INTERVAL = 10
+
+
+# Background jobs (kurdish_apply.celery)
+# Leave the broker empty to run jobs on a thread pool inside the web process;
+# set it (e.g. "redis://localhost:6379/0") and start `celery -A kurdish_apply worker`
+# in production.
+CELERY_BROKER_URL = ""
+CELERY_TASK_ALWAYS_EAGER = False
+# Safety net for the email outbox: picks up retries and rows left by a crashed worker
+CELERY_BEAT_SCHEDULE = {
+    "process-outbox": {"task": "communications.tasks.process_outbox", "schedule": 300.0},
+    "deadline-reminders": {"task": "communications.tasks.send_deadline_reminders", "schedule": 3600.0},
+}
+
+
+# Email
+# Development writes outgoing mail to files instead of an SMTP server; set
+# EMAIL_BACKEND=django.core.mail.backends.smtp.EmailBackend and EMAIL_HOST etc.
+# in the environment for production.
+EMAIL_BACKEND = config("EMAIL_BACKEND", default="django.core.mail.backends.filebased.EmailBackend")
+EMAIL_FILE_PATH = config("EMAIL_FILE_PATH", default=str(BASE_DIR / "sent_emails"))
+EMAIL_HOST = config("EMAIL_HOST", default="localhost")
+EMAIL_PORT = config("EMAIL_PORT", default=25, cast=int)
+EMAIL_HOST_USER = config("EMAIL_HOST_USER", default="")
+EMAIL_HOST_PASSWORD = config("EMAIL_HOST_PASSWORD", default="")
+EMAIL_USE_TLS = config("EMAIL_USE_TLS", default=False, cast=bool)
+DEFAULT_FROM_EMAIL = config("DEFAULT_FROM_EMAIL", default="ApplyHelp <noreply@applyhelp.org>")
+
+# Outbound email queue (communications.outbox)
+OUTBOX_BATCH_SIZE = 50
+OUTBOX_MAX_ATTEMPTS = 5
+# Seconds before the first retry, doubled for each further attempt
+OUTBOX_RETRY_DELAY = 60
+# Messages per minute per recipient domain
+OUTBOX_RATE_LIMITS = {
+    "default": 300,
+    "gmail.com": 60,
+}
+
+# Days before a deadline that students get a reminder digest (communications.reminders)
+REMINDER_LEAD_DAYS = (14, 3, 1)
+
+# TrueType fonts with Arabic-script glyphs for generated resume PDFs. Unset,
+# an installed Noto Arabic or DejaVu Sans is used (resume_builder.pdf); PDFs
+# with Sorani text fail with ImproperlyConfigured when there is none.
+RESUME_PDF_FONT = config("RESUME_PDF_FONT", default=None)
+RESUME_PDF_BOLD_FONT = config("RESUME_PDF_BOLD_FONT", default=None)
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -132,6 +208,9 @@ USE_I18N = True
 USE_L10N = True
 USE_TZ = True
 
+# Load and precompile every language's catalog when the server starts (kurdish_apply.i18n)
+PRELOAD_TRANSLATIONS = True
+
 # Locale paths
 LOCALE_PATHS = [
     BASE_DIR / "locale",
@@ -0,0 +1,523 @@
+"""
+Deterministic synthetic datasets for local profiling and benchmarks.
+
+``generate()`` fills the database with a realistic catalogue (countries,
+universities, programs, scholarships with eligible programs), students with
+resumes, application trackers and email logs, and guides in all three
+languages. The same ``seed``, ``scale`` and ``base_date`` always produce the
+same rows, so benchmark reports from different commits are comparable.
+
+Rows are written with ``bulk_create``, which bypasses model signals; the
+search index, similar-program index, user statistics and caches are rebuilt
+once at the end. Everything generated carries the ``SYNTHETIC`` marker
+(usernames, slugs, names) or a code from ``COUNTRIES`` so ``clear()`` can
+remove it again.
+"""
+import datetime
+import random
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from accounts import stats
+from accounts.models import KurdishUser
+from communications.models import (
+    EmailTemplate, ApplicationTracker, ApplicationDocument, EmailLog, CommunicationTip,
+)
+from destinations import caching, recommendations, search, similarity
+from destinations.models import Country, University, StudyProgram, Scholarship
+from resources.models import ResourceCategory, Guide
+from resume_builder.models import CVTemplate, Resume, Education, Experience, Skill, Publication, Award
+
+
+SYNTHETIC = 'synthetic'
+
+BATCH_SIZE = 1000
+
+SCALES = {
+    'small': {'universities': 40, 'programs': 400, 'scholarships': 60, 'users': 25, 'guides': 30},
+    'medium': {'universities': 400, 'programs': 5000, 'scholarships': 600, 'users': 250, 'guides': 300},
+    'large': {'universities': 2500, 'programs': 50000, 'scholarships': 4000, 'users': 2000, 'guides': 1500},
+}
+
+# (code, English, Sorani, Kurmanji, currency, official language); codes come
+# from the user-assigned X.. range of ISO 3166 so they never clash with real rows
+COUNTRIES = (
+    ('XDE', 'Germany', 'ئەڵمانیا', 'Almanya', 'EUR', 'German'),
+    ('XGB', 'United Kingdom', 'بەریتانیا', 'Brîtanya', 'GBP', 'English'),
+    ('XFR', 'France', 'فەرەنسا', 'Fransa', 'EUR', 'French'),
+    ('XSE', 'Sweden', 'سوید', 'Swêd', 'SEK', 'Swedish'),
+    ('XNL', 'Netherlands', 'هۆڵەندا', 'Holenda', 'EUR', 'Dutch'),
+    ('XNO', 'Norway', 'نەرویج', 'Norwêc', 'NOK', 'Norwegian'),
+    ('XFI', 'Finland', 'فینلاند', 'Fînlenda', 'EUR', 'Finnish'),
+    ('XAT', 'Austria', 'نەمسا', 'Awistirya', 'EUR', 'German'),
+    ('XCH', 'Switzerland', 'سویسرا', 'Swîsre', 'CHF', 'German'),
+    ('XIT', 'Italy', 'ئیتاڵیا', 'Îtalya', 'EUR', 'Italian'),
+    ('XUS', 'United States', 'ئەمریکا', 'Amerîka', 'USD', 'English'),
+    ('XCA', 'Canada', 'کەنەدا', 'Kanada', 'CAD', 'English'),
+    ('XAU', 'Australia', 'ئوسترالیا', 'Awistralya', 'AUD', 'English'),
+    ('XJP', 'Japan', 'ژاپۆن', 'Japon', 'JPY', 'Japanese'),
+    ('XTR', 'Turkey', 'تورکیا', 'Tirkiye', 'TRY', 'Turkish'),
+)
+
+CITIES = ('Capital', 'Northport', 'Riverside', 'Lakeview', 'Hillcrest', 'Oldtown', 'Harbour', 'Westfield')
+
+FIELDS = (
+    'Computer Science', 'Civil Engineering', 'Petroleum Engineering', 'Medicine', 'Public Health',
+    'Law', 'Economics', 'Political Science', 'International Relations', 'Linguistics', 'History',
+    'Physics', 'Chemistry', 'Biology', 'Mathematics', 'Architecture', 'Education', 'Agriculture',
+    'Sociology', 'Psychology',
+)
+
+LEVEL_PREFIXES = {
+    'bachelor': 'BSc in',
+    'master': 'MSc in',
+    'phd': 'PhD in',
+    'postdoc': 'Postdoctoral Fellowship in',
+    'professional': 'Professional Certificate in',
+}
+
+SPECIALISATIONS = ('', 'Applied', 'Advanced', 'Comparative', 'Computational', 'Environmental', 'International')
+
+WORDS = (
+    'research students international program faculty language courses thesis seminar laboratory '
+    'funding supervisor admission deadline scholarship community support career industry '
+    'methods analysis policy data systems theory practice culture society health energy'
+).split()
+
+SORANI_WORDS = 'خوێندن زانکۆ بەرنامە توێژینەوە قوتابی کۆمەڵگا زمان بورس پسپۆڕی مامۆستا'.split()
+KURMANJI_WORDS = 'xwendin zanîngeh bername lêkolîn xwendekar civak ziman bûrs pisporî mamoste'.split()
+
+
+def _sentence(rng, words, length):
+    return ' '.join(rng.choice(words) for _ in range(length)).capitalize() + '.'
+
+
+def _paragraph(rng, words=WORDS, sentences=4):
+    return ' '.join(_sentence(rng, words, rng.randint(6, 14)) for _ in range(sentences))
+
+
+def _trilingual(rng, field, english, sentences=None):
+    """
+    Per-language column values for a translated ``field``
+    """
+    if sentences is None:
+        return {f'{field}_en': english, f'{field}_ckb': english, f'{field}_kmr': english}
+    return {
+        f'{field}_en': english or _paragraph(rng, WORDS, sentences),
+        f'{field}_ckb': _paragraph(rng, SORANI_WORDS, sentences),
+        f'{field}_kmr': _paragraph(rng, KURMANJI_WORDS, sentences),
+    }
+
+
+def _date(rng, base_date, start, end):
+    return base_date + datetime.timedelta(days=rng.randint(start, end))
+
+
+def _moment(rng, base_date, start, end):
+    day = _date(rng, base_date, start, end)
+    return timezone.make_aware(datetime.datetime.combine(day, datetime.time(rng.randint(7, 22), rng.randint(0, 59))))
+
+
+class Generator:
+    def __init__(self, scale='small', seed=0, base_date=None, stdout=None):
+        self.sizes = SCALES[scale]
+        self.rng = random.Random(seed)
+        self.base_date = base_date or timezone.localdate()
+        self.stdout = stdout
+        self.counts = {}
+
+    def log(self, message):
+        if self.stdout is not None:
+            self.stdout.write(message)
+
+    def create(self, model, objects):
+        created = model.objects.bulk_create(objects, batch_size=BATCH_SIZE)
+        label = model._meta.label
+        self.counts[label] = self.counts.get(label, 0) + len(created)
+        self.log(f'{len(created):>7} {label}')
+        return created
+
+    def run(self):
+        with transaction.atomic():
+            countries = self.countries()
+            universities = self.universities(countries)
+            programs = self.programs(universities)
+            self.scholarships(countries, universities, programs)
+            templates = self.email_templates()
+            users = self.users()
+            self.resumes(users)
+            trackers = self.trackers(users, programs)
+            self.email_logs(users, trackers, templates)
+            self.guides(users, countries, universities)
+            self.tips()
+
+        for model in search.SEARCH_FIELDS:
+            search.rebuild(model)
+        similarity.rebuild()
+        stats.refresh(user.pk for user in users)
+        caching.bump(caching.OVERVIEW, *(caching.country_scope(code) for code, *_ in COUNTRIES))
+        recommendations.invalidate()
+        return self.counts
+
+    def countries(self):
+        rng = self.rng
+        objects = []
+        for code, english, sorani, kurmanji, currency, language in COUNTRIES:
+            objects.append(Country(
+                code=code,
+                name_sorani=sorani,
+                name_kurmanji=kurmanji,
+                official_language=language,
+                currency=currency,
+                academic_year_start=rng.choice(['September', 'October', 'February']),
+                avg_tuition_usd=rng.choice([0, 1500, 8000, 15000, 28000]),
+                avg_living_cost_usd=rng.randrange(6000, 20000, 500),
+                student_visa_type=rng.choice(['D', 'Tier 4', 'F-1', 'Type C']),
+                visa_processing_time=f'{rng.randint(2, 12)} weeks',
+                work_permit_allowed=rng.random() < 0.7,
+                post_study_work_visa=rng.random() < 0.5,
+                application_difficulty=rng.randint(1, 5),
+                living_quality=rng.randint(2, 5),
+                study_quality=rng.randint(2, 5),
+                **{'name_en': english, 'name_ckb': sorani, 'name_kmr': kurmanji},
+                **_trilingual(rng, 'description', '', 3),
+                **_trilingual(rng, 'kurdish_population', '', 1),
+                **_trilingual(rng, 'kurdish_organizations', '', 1),
+            ))
+        return self.create(Country, objects)
+
+    def universities(self, countries):
+        rng = self.rng
+        objects = []
+        for index in range(self.sizes['universities']):
+            country = countries[index % len(countries)]
+            city = rng.choice(CITIES)
+            objects.append(University(
+                country=country,
+                name=f'{city} University of {rng.choice(FIELDS)} {index:05d}',
+                city=city,
+                university_type=rng.choice(['public', 'private', 'research', 'applied']),
+                established_year=rng.randint(1400, 2010),
+                world_ranking=rng.choice([None, rng.randint(1, 1500)]),
+                student_population=rng.randrange(2000, 60000, 100),
+                international_students=rng.randrange(100, 12000, 50),
+                instruction_languages=rng.choice(['English', f'English, {country.official_language}']),
+                academic_reputation=rng.randint(1, 5),
+                research_opportunities=rng.randint(1, 5),
+                international_support=rng.randint(1, 5),
+                **_trilingual(rng, 'kurdish_students_info', '', 1),
+                **_trilingual(rng, 'kurdish_friendly_supervisors', '', 1),
+            ))
+        return self.create(University, objects)
+
+    def programs(self, universities):
+        rng = self.rng
+        objects = []
+        for index in range(self.sizes['programs']):
+            university = universities[index % len(universities)]
+            level = rng.choices(list(LEVEL_PREFIXES), weights=[3, 5, 3, 1, 1])[0]
+            field = rng.choice(FIELDS)
+            name = ' '.join(filter(None, [LEVEL_PREFIXES[level], rng.choice(SPECIALISATIONS), field]))
+            objects.append(StudyProgram(
+                university=university,
+                name=name,
+                level=level,
+                field_of_study=field,
+                duration_months=rng.choice([12, 18, 24, 36, 48]),
+                credits=rng.choice([None, 60, 90, 120, 180]),
+                language_of_instruction=rng.choice(['English', 'English', university.country.official_language]),
+                min_gpa=rng.choice([None, 2.5, 3.0, 3.3]),
+                application_deadline=rng.choice([None, _date(rng, self.base_date, -60, 300)]),
+                start_date=_date(rng, self.base_date, 120, 420),
+                tuition_fee=rng.choice([None, 0, rng.randrange(500, 45000, 250)]),
+                currency=university.country.currency,
+                scholarships_available=rng.random() < 0.35,
+                is_active=rng.random() < 0.95,
+                **_trilingual(rng, 'description', '', 4),
+                **_trilingual(rng, 'career_prospects', '', 2),
+                **_trilingual(rng, 'language_requirements', '', 1),
+                **_trilingual(rng, 'other_requirements', '', 1),
+            ))
+        return self.create(StudyProgram, objects)
+
+    def scholarships(self, countries, universities, programs):
+        rng = self.rng
+        objects = []
+        for index in range(self.sizes['scholarships']):
+            university = rng.choice(universities) if rng.random() < 0.5 else None
+            objects.append(Scholarship(
+                name=f'{rng.choice(FIELDS)} Excellence Scholarship {index:05d}',
+                provider=rng.choice(['Government', 'Foundation', 'University', 'Kurdish Diaspora Fund']),
+                country=university.country if university else rng.choice(countries),
+                university=university,
+                scholarship_type=rng.choice(['full', 'partial', 'tuition', 'living', 'research']),
+                amount=rng.randrange(1000, 30000, 500),
+                kurdish_specific=rng.random() < 0.15,
+                application_deadline=rng.choice([None, _date(rng, self.base_date, -30, 270)]),
+                website='https://example.org/scholarships',
+                **_trilingual(rng, 'description', '', 3),
+                **_trilingual(rng, 'eligibility_criteria', '', 2),
+                **_trilingual(rng, 'application_process', '', 2),
+                **_trilingual(rng, 'required_documents', '', 1),
+            ))
+        scholarships = self.create(Scholarship, objects)
+
+        through = Scholarship.eligible_programs.through
+        links = []
+        for scholarship in scholarships:
+            pool = [p for p in programs[:2000] if p.university_id == scholarship.university_id] or programs
+            for program in rng.sample(pool, min(len(pool), rng.randint(1, 12))):
+                links.append(through(scholarship_id=scholarship.pk, studyprogram_id=program.pk))
+        self.create(through, links)
+
+    def email_templates(self):
+        rng = self.rng
+        objects = []
+        for template_type, label in EmailTemplate.TEMPLATE_TYPES:
+            objects.append(EmailTemplate(
+                name=f'{SYNTHETIC} {template_type}',
+                template_type=template_type,
+                formality_level=rng.choice(['very_formal', 'formal', 'semi_formal']),
+                variables=['name', 'university', 'program', 'sender'],
+                **_trilingual(rng, 'subject_line', 'Inquiry about {program} at {university}'),
+                **_trilingual(rng, 'greeting', 'Dear {name},'),
+                **_trilingual(rng, 'body', '', 4),
+                **_trilingual(rng, 'closing', 'Kind regards,'),
+                **_trilingual(rng, 'signature', '{sender}'),
+                **_trilingual(rng, 'description', '', 1),
+                **_trilingual(rng, 'cultural_notes', '', 1),
+            ))
+        self.create(CVTemplate, [
+            CVTemplate(
+                name=f'{SYNTHETIC} {template_type} {style}',
+                template_type=template_type,
+                country_style=style,
+                description=_paragraph(rng, sentences=2),
+                sections_order=['education', 'experience', 'publications', 'skills', 'awards'],
+            )
+            for template_type, style in [('academic', 'eu'), ('academic', 'us'), ('research', 'uk'),
+                                         ('professional', 'international')]
+        ])
+        return self.create(EmailTemplate, objects)
+
+    def users(self):
+        rng = self.rng
+        # Hashing once keeps generation fast; every synthetic account shares the password
+        password = make_password(SYNTHETIC)
+        regions = [region for region, label in KurdishUser.REGION_CHOICES]
+        levels = [level for level, label in KurdishUser.EDUCATION_LEVEL_CHOICES]
+        objects = []
+        for index in range(self.sizes['users']):
+            objects.append(KurdishUser(
+                username=f'{SYNTHETIC}_{index:05d}',
+                password=password,
+                email=f'{SYNTHETIC}_{index:05d}@example.org',
+                first_name=rng.choice(['Aram', 'Shilan', 'Rojin', 'Karwan', 'Dilan', 'Hemin', 'Berfin', 'Soran']),
+                last_name=rng.choice(['Ahmed', 'Mahmoud', 'Karim', 'Aziz', 'Hassan', 'Bakir']),
+                region=rng.choice(regions),
+                current_education_level=rng.choice(levels),
+                field_of_study=rng.choice(FIELDS),
+                preferred_study_level=rng.choice(levels),
+                graduation_year=rng.randint(2010, 2026),
+                research_interests=_sentence(rng, WORDS, 8),
+                profile_completed=rng.random() < 0.6,
+            ))
+        return self.create(KurdishUser, objects)
+
+    def resumes(self, users):
+        rng = self.rng
+        templates = list(CVTemplate.objects.filter(name__startswith=SYNTHETIC))
+        resumes = []
+        for user in users:
+            for number in range(rng.randint(1, 2)):
+                resumes.append(Resume(
+                    user=user,
+                    template=rng.choice(templates),
+                    title=f'{user.field_of_study} CV {number + 1}',
+                    target_country=rng.choice(COUNTRIES)[1],
+                    target_field=user.field_of_study,
+                    full_name=f'{user.first_name} {user.last_name}',
+                    email=user.email,
+                    professional_summary=_paragraph(rng, sentences=3),
+                    is_primary=number == 0,
+                ))
+        resumes = self.create(Resume, resumes)
+
+        education, experience, skills, publications, awards = [], [], [], [], []
+        for resume in resumes:
+            for order in range(2):
+                start = _date(rng, self.base_date, -4000, -800)
+                education.append(Education(
+                    resume=resume, degree_level=rng.choice(['bachelor', 'master']),
+                    degree_title=f'{rng.choice(["BSc", "MSc"])} {resume.target_field}',
+                    field_of_study=resume.target_field,
+                    institution_name=rng.choice(['University of Sulaimani', 'Salahaddin University', 'Koya University']),
+                    start_date=start, end_date=start + datetime.timedelta(days=1400), order=order,
+                ))
+                experience.append(Experience(
+                    resume=resume, experience_type=rng.choice(['work', 'research', 'teaching']),
+                    job_title=rng.choice(['Research Assistant', 'Teaching Assistant', 'Engineer', 'Analyst']),
+                    company_name=rng.choice(['Kurdistan Regional Government', 'Local NGO', 'Tech Startup']),
+                    start_date=start, description=_paragraph(rng, sentences=2), order=order,
+                ))
+            for order in range(5):
+                skills.append(Skill(
+                    resume=resume, category=rng.choice(['technical', 'language', 'software', 'research']),
+                    name=rng.choice(['Python', 'English', 'Arabic', 'Statistics', 'GIS', 'LaTeX', 'Kurdish']),
+                    proficiency=rng.choice(['intermediate', 'advanced', 'expert', 'native']), order=order,
+                ))
+            for order in range(rng.randint(0, 3)):
+                publications.append(Publication(
+                    resume=resume, publication_type=rng.choice(['journal', 'conference']),
+                    title=_sentence(rng, WORDS, 8), authors=resume.full_name,
+                    publication_date=_date(rng, self.base_date, -2000, -30), order=order,
+                ))
+            for order in range(rng.randint(0, 2)):
+                awards.append(Award(
+                    resume=resume, award_type=rng.choice(['academic', 'scholarship', 'honor']),
+                    title=_sentence(rng, WORDS, 3), issuing_organization='Ministry of Higher Education',
+                    date_received=_date(rng, self.base_date, -2000, -30), order=order,
+                ))
+        for model, objects in ((Education, education), (Experience, experience), (Skill, skills),
+                               (Publication, publications), (Award, awards)):
+            self.create(model, objects)
+
+    def trackers(self, users, programs):
+        rng = self.rng
+        statuses = [status for status, label in ApplicationTracker.APPLICATION_STATUS]
+        priorities = [priority for priority, label in ApplicationTracker.PRIORITY_LEVELS]
+        trackers = []
+        for user in users:
+            for program in rng.sample(programs, min(len(programs), rng.randint(0, 8))):
+                trackers.append(ApplicationTracker(
+                    user=user,
+                    university_id=program.university_id,
+                    program=program,
+                    application_title=program.name,
+                    status=rng.choice(statuses),
+                    priority=rng.choice(priorities),
+                    application_deadline=rng.choice([None, _date(rng, self.base_date, -60, 240)]),
+                    supervisor_name=rng.choice(['', 'Prof. Example']),
+                    supervisor_email=rng.choice(['', 'supervisor@example.org']),
+                    research_area=program.field_of_study,
+                    application_fee=rng.choice([None, 50, 75, 120]),
+                ))
+        trackers = self.create(ApplicationTracker, trackers)
+
+        documents = []
+        types = [document_type for document_type, label in ApplicationDocument.DOCUMENT_TYPES]
+        for tracker in trackers:
+            for document_type in rng.sample(types, rng.randint(2, 4)):
+                documents.append(ApplicationDocument(
+                    application=tracker, document_type=document_type, title=document_type.replace('_', ' ').title(),
+                    status=rng.choice(['draft', 'ready', 'submitted', 'needs_update']),
+                    deadline=tracker.application_deadline,
+                ))
+        self.create(ApplicationDocument, documents)
+        return trackers
+
+    def email_logs(self, users, trackers, templates):
+        rng = self.rng
+        by_user = {}
+        for tracker in trackers:
+            by_user.setdefault(tracker.user_id, []).append(tracker)
+        email_types = [email_type for email_type, label in EmailLog.EMAIL_TYPES]
+        logs = []
+        for user in users:
+            for _ in range(rng.randint(0, 15)):
+                tracker = rng.choice(by_user.get(user.pk, [None]))
+                responded = rng.random() < 0.4
+                logs.append(EmailLog(
+                    user=user,
+                    application=tracker,
+                    email_type=rng.choice(email_types),
+                    template_used=rng.choice(templates),
+                    recipient_email='admissions@example.org',
+                    recipient_name=rng.choice(['', 'Admissions Office']),
+                    subject=_sentence(rng, WORDS, 6),
+                    body=_paragraph(rng, sentences=3),
+                    response_received=responded,
+                    response_date=_moment(rng, self.base_date, -20, 0) if responded else None,
+                ))
+        logs = self.create(EmailLog, logs)
+        # sent_date is auto_now_add; spread it over the past months like real traffic
+        for log in logs:
+            log.sent_date = _moment(rng, self.base_date, -180, 0)
+        EmailLog.objects.bulk_update(logs, ['sent_date'], batch_size=BATCH_SIZE)
+
+    def guides(self, users, countries, universities):
+        rng = self.rng
+        categories = self.create(ResourceCategory, [
+            ResourceCategory(name=f'{SYNTHETIC} {label}', order=order, **_trilingual(rng, 'description', '', 1))
+            for order, label in enumerate(['Applications', 'Visas', 'Funding', 'Living Abroad', 'Careers'])
+        ])
+        guide_types = [guide_type for guide_type, label in Guide.GUIDE_TYPES]
+        objects = []
+        for index in range(self.sizes['guides']):
+            guide_type = rng.choice(guide_types)
+            title = f'{guide_type.title()} guide {index:05d}'
+            objects.append(Guide(
+                guide_type=guide_type,
+                category=rng.choice(categories),
+                country=rng.choice(countries) if guide_type == 'country' or rng.random() < 0.3 else None,
+                university=rng.choice(universities) if guide_type == 'university' else None,
+                difficulty_level=rng.choice(['beginner', 'intermediate', 'advanced']),
+                steps=[_sentence(rng, WORDS, 6) for _ in range(rng.randint(0, 6))],
+                author=rng.choice(users) if users else None,
+                estimated_reading_time=rng.randint(3, 25),
+                views=rng.randint(0, 20000),
+                helpful_votes=rng.randint(0, 500),
+                slug=f'{SYNTHETIC}-{index:05d}',
+                is_featured=rng.random() < 0.1,
+                **_trilingual(rng, 'title', title),
+                **_trilingual(rng, 'summary', '', 2),
+                **_trilingual(rng, 'content', '', 12),
+                **_trilingual(rng, 'meta_description', title),
+                **_trilingual(rng, 'keywords', ', '.join(rng.sample(WORDS, 4))),
+            ))
+        self.create(Guide, objects)
+
+    def tips(self):
+        rng = self.rng
+        self.create(CommunicationTip, [
+            CommunicationTip(
+                context=context,
+                country=rng.choice(COUNTRIES)[1],
+                priority=rng.randint(1, 5),
+                **_trilingual(rng, 'title', f'{SYNTHETIC} {context} tip {number}'),
+                **_trilingual(rng, 'content', '', 3),
+                **_trilingual(rng, 'example', '', 1),
+                **_trilingual(rng, 'kurdish_context', '', 1),
+                **_trilingual(rng, 'common_mistakes', '', 1),
+            )
+            for context, label in CommunicationTip.COMMUNICATION_CONTEXTS
+            for number in range(2)
+        ])
+
+
+def generate(scale='small', seed=0, base_date=None, stdout=None):
+    """
+    Create a synthetic dataset; returns row counts by model label
+    """
+    return Generator(scale, seed, base_date, stdout).run()
+
+
+def exists():
+    return KurdishUser.objects.filter(username__startswith=f'{SYNTHETIC}_').exists() or \
+        Country.objects.filter(code__in=[code for code, *_ in COUNTRIES]).exists()
+
+
+@transaction.atomic
+def clear():
+    """
+    Delete every row ``generate()`` creates
+    """
+    KurdishUser.objects.filter(username__startswith=f'{SYNTHETIC}_').delete()
+    Guide.objects.filter(slug__startswith=f'{SYNTHETIC}-').delete()
+    Country.objects.filter(code__in=[code for code, *_ in COUNTRIES]).delete()
+    for model, field in ((EmailTemplate, 'name'), (CVTemplate, 'name'), (ResourceCategory, 'name'),
+                         (CommunicationTip, 'title')):
+        model.objects.filter(Q(**{f'{field}__startswith': SYNTHETIC})).delete()
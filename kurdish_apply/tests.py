@@ -0,0 +1,385 @@
+import datetime
+import gettext
+import os
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from django.utils import timezone, translation
+from django.utils.translation import trans_real
+
+from accounts.models import KurdishUser
+from communications.models import ApplicationTracker, EmailLog
+from destinations.models import Country, University
+from resources.views import GuideListView
+
+from . import database, glossary, i18n, pagination, pofile
+
+
+CATALOG = '''# Translation header comment
+msgid ""
+msgstr ""
+"Language: ckb\\n"
+"Plural-Forms: nplurals=2; plural=(n != 1);\\n"
+#: accounts/forms.py:12
+msgid "Email"
+msgstr ""
+
+#. Shown on the dashboard
+#, fuzzy, python-format
+msgid "Hello %(name)s"
+msgstr "Old greeting %(name)s"
+
+msgctxt "month"
+msgid "May"
+msgstr ""
+
+msgid ""
+"A long message that "
+"spans two lines"
+msgstr ""
+
+msgid "%(count)d upcoming deadline"
+msgid_plural "%(count)d upcoming deadlines"
+msgstr[0] ""
+msgstr[1] ""
+
+#~ msgid "Removed"
+#~ msgstr "Gone"
+'''
+
+
+class POFileTests(SimpleTestCase):
+    def setUp(self):
+        self.catalog = pofile.Catalog.parse(CATALOG.splitlines(keepends=True))
+
+    def test_round_trip_is_lossless(self):
+        self.assertEqual(''.join(self.catalog.lines()), CATALOG)
+        self.assertEqual(len(self.catalog), 5)
+        self.assertIn('Language: ckb', self.catalog.header.msgstr)
+        self.assertTrue(self.catalog.get('Hello %(name)s').fuzzy)
+        self.assertEqual(self.catalog.get('A long message that spans two lines').msgstr, '')
+        self.assertIsNone(self.catalog.get('Removed'))
+
+    def test_update_rewrites_only_changed_entries(self):
+        updated = self.catalog.update({
+            'Email': 'ئیمەیل',
+            'Hello %(name)s': 'سڵاو %(name)s',
+            ('month', 'May'): 'مایس',
+            'A long message that spans two lines': 'یەکەم\nدووەم "ناو"',
+            '%(count)d upcoming deadline': ['%(count)d وادە', '%(count)d وادە'],
+            'Not in the catalog': 'هیچ',
+        })
+        # The fuzzy entry already has a translation
+        self.assertEqual(len(updated), 4)
+
+        text = ''.join(self.catalog.lines())
+        self.assertIn('#: accounts/forms.py:12\nmsgid "Email"\nmsgstr "ئیمەیل"\n\n', text)
+        self.assertIn('#, fuzzy, python-format\nmsgid "Hello %(name)s"\nmsgstr "Old greeting %(name)s"\n', text)
+        self.assertIn('msgstr ""\n"یەکەم\\n"\n"دووەم \\"ناو\\""\n', text)
+        self.assertIn('msgstr[0] "%(count)d وادە"\nmsgstr[1] "%(count)d وادە"\n', text)
+
+        reparsed = pofile.Catalog.parse(text.splitlines(keepends=True))
+        self.assertEqual(reparsed.get('May', context='month').msgstr, 'مایس')
+        self.assertEqual(reparsed.get('A long message that spans two lines').msgstr, 'یەکەم\nدووەم "ناو"')
+        self.assertEqual(reparsed.get('%(count)d upcoming deadline').msgstr_plural, {0: '%(count)d وادە', 1: '%(count)d وادە'})
+
+        self.catalog.update({'Hello %(name)s': 'سڵاو %(name)s'}, overwrite=True)
+        entry = self.catalog.get('Hello %(name)s')
+        self.assertEqual((entry.msgstr, entry.fuzzy), ('سڵاو %(name)s', True))
+
+    def test_plural_entries_need_every_form(self):
+        for value in ('%(count)d وادە', ['%(count)d وادە']):
+            with self.assertRaises(pofile.POError):
+                self.catalog.update({'%(count)d upcoming deadline': value})
+        self.assertEqual(self.catalog.get('%(count)d upcoming deadline').msgstr_plural, {0: '', 1: ''})
+
+    def test_update_file_replaces_the_catalog_atomically(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'django.po')
+            entries = ''.join(f'msgid "Message {index}"\nmsgstr ""\n\n' for index in range(5000))
+            with open(path, 'w', encoding='utf-8') as handle:
+                handle.write(CATALOG + '\n' + entries)
+
+            updated = pofile.update_file(path, {f'Message {index}': f'پەیام {index}' for index in range(5000)})
+            self.assertEqual(len(updated), 5000)
+            self.assertEqual(os.listdir(directory), ['django.po'])
+            self.assertEqual(pofile.Catalog.load(path).get('Message 4999').msgstr, 'پەیام 4999')
+
+    def test_malformed_catalog(self):
+        with self.assertRaises(pofile.POError):
+            pofile.Catalog.parse(['msgid "Email"\n', 'msgstr "unterminated\n'])
+
+
+LOCALE_CATALOG = '''msgid ""
+msgstr ""
+"Language: {language}\\n"
+"Content-Type: text/plain; charset=UTF-8\\n"
+"Plural-Forms: nplurals=2; plural=(n != 1);\\n"
+
+#, python-format
+msgid "Hello %(name)s"
+msgstr "{greeting}"
+
+#, python-format
+msgid "%(count)d deadline"
+msgid_plural "%(count)d deadlines"
+msgstr[0] "%(count)d وادە"
+msgstr[1] "%(count)d وادە"
+'''
+
+
+class CompileTranslationsTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.locale_path = Path(self.directory.name)
+        for language in ('ckb', 'kmr'):
+            self.write(language, 'سڵاو %(name)s')
+
+    def write(self, language, greeting):
+        path = self.locale_path / language / 'LC_MESSAGES' / 'django.po'
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(LOCALE_CATALOG.format(language=language, greeting=greeting), encoding='utf-8')
+
+    def compile(self, **kwargs):
+        return i18n.compile_catalogs(locale_paths=[self.locale_path], **kwargs)
+
+    def load(self, language):
+        with open(self.locale_path / language / 'LC_MESSAGES' / 'django.mo', 'rb') as handle:
+            return gettext.GNUTranslations(handle)
+
+    def test_only_changed_catalogs_are_compiled(self):
+        results = self.compile()
+        self.assertEqual([result.compiled for result in results], [True, True])
+        catalog = self.load('ckb')
+        self.assertEqual(catalog.gettext('Hello %(name)s'), 'سڵاو %(name)s')
+        self.assertEqual(catalog.ngettext('%(count)d deadline', '%(count)d deadlines', 3), '%(count)d وادە')
+
+        self.assertEqual(self.compile(), [])
+        self.write('kmr', 'Silav %(name)s')
+        results = self.compile(workers=1)
+        self.assertEqual([Path(result.po_path).parts[-3] for result in results], ['kmr'])
+        self.assertEqual(self.load('kmr').gettext('Hello %(name)s'), 'Silav %(name)s')
+
+    def test_bad_placeholders_keep_the_previous_catalog(self):
+        self.compile()
+        self.write('ckb', 'سڵاو %(username)s')
+        result, = self.compile()
+        self.assertFalse(result.compiled)
+        self.assertIn('username', result.errors[0])
+        self.assertEqual(self.load('ckb').gettext('Hello %(name)s'), 'سڵاو %(name)s')
+
+    def test_running_processes_reload_announced_catalogs(self):
+        cache.delete(i18n.VERSION_KEY)
+        state = i18n._ReloadState()
+        self.assertFalse(state.check(now=100))
+        translation.gettext('Email')
+        i18n.announce_reload()
+        # Not checked again until the interval has passed
+        self.assertFalse(state.check(now=101))
+        self.assertTrue(state.check(now=100 + i18n.RELOAD_CHECK_INTERVAL))
+        self.assertEqual(trans_real._translations, {})
+
+
+class GlossaryTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = Path(self.directory.name) / 'glossary.json'
+        self.po_path = Path(self.directory.name) / 'django.po'
+        self.po_path.write_text(CATALOG, encoding='utf-8')
+
+    def test_export_and_import_po(self):
+        memory = glossary.Glossary(path=self.path)
+        memory.update('ckb', {
+            'Email': 'ئیمەیل',
+            'month\x04May': 'مایس',
+            '%(count)d upcoming deadline': ['%(count)d وادە', '%(count)d وادە'],
+        })
+        self.assertEqual(len(memory.export_po(self.po_path, 'ckb')), 3)
+        catalog = pofile.Catalog.load(self.po_path)
+        self.assertEqual(catalog.get('May', context='month').msgstr, 'مایس')
+
+        imported = glossary.Glossary(path=self.path)
+        # The fuzzy greeting is not taken over
+        self.assertEqual(imported.import_po(self.po_path, 'ckb'), 3)
+        self.assertEqual(imported.translations('ckb'), memory.translations('ckb'))
+
+    def test_save_and_read(self):
+        self.assertNotIn('kmr', glossary.Glossary.read(self.path))
+        memory = glossary.Glossary({'kmr': {'Email': 'E-name'}}, self.path)
+        memory.save()
+        self.assertEqual(glossary.Glossary.read(self.path).get('kmr', 'Email'), 'E-name')
+
+        memory.update('kmr', {'Email': 'E-peyam'})
+        self.assertEqual(memory.update('kmr', {'Email': 'E-name'}, overwrite=False), 0)
+        memory.save()
+        self.assertEqual(glossary.Glossary.read(self.path).get('kmr', 'Email'), 'E-peyam')
+
+
+class PreloadedCatalogTests(SimpleTestCase):
+    def setUp(self):
+        i18n.catalog_stats.reset()
+        self.addCleanup(self.unload)
+
+    def unload(self):
+        i18n._preloaded = ()
+        i18n.reset_translations()
+
+    def test_preloaded_catalogs_resolve_like_django(self):
+        lazy = translation.gettext_lazy('Email')
+        with translation.override('kmr'):
+            expected = (str(lazy), translation.gettext('Not a catalog message'))
+
+        i18n.preload()
+        with translation.override('kmr'):
+            self.assertEqual((str(lazy), translation.gettext('Not a catalog message')), expected)
+            translation.gettext('Not a catalog message')
+
+        report = i18n.catalog_stats.report()['languages']['kmr']
+        self.assertEqual((report['hits'], report['misses'], report['untranslated']), (2, 1, 1))
+
+    def test_reload_keeps_catalogs_precompiled(self):
+        i18n.preload(['ckb'])
+        i18n.reset_translations()
+        self.assertIsInstance(trans_real.translation('ckb').gettext.__self__, i18n.PrecompiledCatalog)
+
+
+class DatabaseSettingsTests(SimpleTestCase):
+    def settings_for(self, **environment):
+        def config(name, default=None, cast=str):
+            value = environment.get(name, default)
+            return cast(value) if name in environment else value
+
+        return database.databases(config, Path('/srv/app'))
+
+    def test_sqlite_by_default(self):
+        self.assertEqual(self.settings_for(), {
+            'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': '/srv/app/db.sqlite3'},
+        })
+
+    def test_postgres_with_pgbouncer_and_replica(self):
+        databases = self.settings_for(
+            DATABASE_ENGINE='postgresql', DATABASE_NAME='apply', DATABASE_PASSWORD='secret',
+            DATABASE_POOLER='pgbouncer', DATABASE_STATEMENT_TIMEOUT='5000', DATABASE_REPLICA_HOST='replica.internal',
+        )
+        default, replica = databases['default'], databases['replica']
+        self.assertEqual(default['ENGINE'], 'django.db.backends.postgresql')
+        self.assertEqual((default['CONN_MAX_AGE'], default['CONN_HEALTH_CHECKS']), (600, True))
+        self.assertTrue(default['DISABLE_SERVER_SIDE_CURSORS'])
+        self.assertNotIn('options', default['OPTIONS'])
+        self.assertEqual((replica['HOST'], replica['NAME'], replica['PASSWORD']), ('replica.internal', 'apply', 'secret'))
+        self.assertEqual(replica['TEST'], {'MIRROR': 'default'})
+
+
+class ReplicaRoutingTests(SimpleTestCase):
+    def route(self, request):
+        seen = []
+
+        def handler(request):
+            # What the handler does between the middleware's __call__ and the view
+            middleware.process_view(request, GuideListView.as_view(), (), {})
+            seen.append(database._replica_reads.get())
+            return HttpResponse()
+
+        middleware = database.ReplicaMiddleware(handler)
+        response = middleware(request)
+        return seen[0], response
+
+    def test_only_safe_unpinned_requests_read_the_replica(self):
+        factory = RequestFactory()
+        self.assertEqual(self.route(factory.get('/resources/guides/'))[0], True)
+        self.assertFalse(database._replica_reads.get())
+
+        # Without a replica there is nothing to pin a browser away from
+        self.assertNotIn(database.PIN_COOKIE, self.route(factory.post('/resources/guides/'))[1].cookies)
+        with mock.patch.object(database, 'has_replica', return_value=True):
+            replica, response = self.route(factory.post('/resources/guides/'))
+        self.assertFalse(replica)
+        pinned = factory.get('/resources/guides/')
+        pinned.COOKIES[database.PIN_COOKIE] = response.cookies[database.PIN_COOKIE].value
+        self.assertFalse(self.route(pinned)[0])
+
+    def test_router_needs_a_replica_alias(self):
+        router = database.ReplicaRouter()
+        with database.use_replica():
+            self.assertIsNone(router.db_for_read(Country))
+        self.assertEqual(router.db_for_write(Country), 'default')
+        self.assertFalse(router.allow_migrate('replica', 'destinations'))
+
+    def test_reads_return_to_the_primary_after_a_write(self):
+        router = database.ReplicaRouter()
+        with mock.patch.object(database, 'has_replica', return_value=True):
+            self.assertIsNone(router.db_for_read(Country))
+            with database.use_replica():
+                self.assertEqual(router.db_for_read(Country), 'replica')
+                self.assertIsNone(router.db_for_read(KurdishUser))
+
+                self.assertEqual(router.db_for_write(Country), 'default')
+                # Signal handlers and later queries of the request must see the write
+                self.assertIsNone(router.db_for_read(Country))
+            with database.use_replica():
+                self.assertEqual(router.db_for_read(Country), 'replica')
+
+
+class CursorPaginationTests(TestCase):
+    def setUp(self):
+        self.user = KurdishUser.objects.create_user(username='student', password='secret', region='bashur')
+        sent = timezone.now()
+        for index in range(7):
+            log = EmailLog.objects.create(
+                user=self.user, email_type='inquiry', recipient_email=f'prof{index}@example.com',
+                subject=f'Subject {index}', body='Hello',
+            )
+            # Pairs of identical timestamps exercise the pk tiebreaker
+            EmailLog.objects.filter(pk=log.pk).update(sent_date=sent - datetime.timedelta(minutes=index // 2))
+
+    def walk(self, paginator):
+        pages = [paginator.page()]
+        while pages[-1].has_next():
+            pages.append(paginator.page(pages[-1].next_cursor))
+        return pages
+
+    def test_forward_pages_cover_every_row_once_in_order(self):
+        queryset = EmailLog.objects.filter(user=self.user).order_by('-sent_date')
+        pages = self.walk(pagination.CursorPaginator(queryset, 3))
+
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        self.assertEqual([log.pk for page in pages for log in page], [log.pk for log in queryset.order_by('-sent_date', 'pk')])
+        self.assertFalse(pages[0].has_previous())
+        self.assertTrue(pages[-1].has_previous())
+
+    def test_previous_cursor_returns_the_preceding_page(self):
+        paginator = pagination.CursorPaginator(EmailLog.objects.filter(user=self.user).order_by('-sent_date'), 3)
+        pages = self.walk(paginator)
+
+        previous = paginator.page(pages[2].previous_cursor)
+        self.assertEqual([log.pk for log in previous], [log.pk for log in pages[1]])
+        first = paginator.page(previous.previous_cursor)
+        self.assertEqual([log.pk for log in first], [log.pk for log in pages[0]])
+        self.assertFalse(first.has_previous())
+
+    def test_null_ordering_keys_sort_last(self):
+        country = Country.objects.create(
+            code='DEU', name='Germany', description='Germany', official_language='German', currency='EUR',
+        )
+        university = University.objects.create(
+            country=country, name='University', city='Berlin', university_type='public', instruction_languages='German'
+        )
+        deadlines = [None, datetime.date(2026, 1, 1), None, datetime.date(2025, 6, 1)]
+        for index, deadline in enumerate(deadlines):
+            ApplicationTracker.objects.create(
+                user=self.user, university=university, application_title=f'Application {index}',
+                priority='high', application_deadline=deadline,
+            )
+
+        pages = self.walk(pagination.CursorPaginator(ApplicationTracker.objects.all(), 1))
+
+        self.assertEqual(
+            [page[0].application_deadline for page in pages],
+            [datetime.date(2025, 6, 1), datetime.date(2026, 1, 1), None, None],
+        )
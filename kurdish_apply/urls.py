@@ -9,11 +9,14 @@ from django.conf.urls.i18n import i18n_patterns
 from django.views.generic import TemplateView
 from django.utils.translation import gettext_lazy as _
 
+from kurdish_apply import instrumentation
+
 
 urlpatterns = [
     # Language selection (outside i18n patterns)
     path('i18n/', include('django.conf.urls.i18n')),
     path('rosetta/', include('rosetta.urls')),  # Translation interface
+    path('instrumentation/', instrumentation.report_view, name='instrumentation'),  # Staff only
 ]
 
 urlpatterns += i18n_patterns(
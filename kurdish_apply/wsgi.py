@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "kurdish_apply.settings")
 
 application = get_wsgi_application()
+
+# Load the translation catalogs before a preforking server (gunicorn --preload) starts its workers
+from kurdish_apply import i18n  # noqa: E402
+
+i18n.warm_up()
@@ -1,171 +0,0 @@
-# Kurdish Sorani (ckb) Translations for ApplyHelp
-# This file contains key translations to add to the django.po file
-
-translations_ckb = {
-    # Navigation and Main UI
-    "Home": "ماڵەوە",
-    "Dashboard": "پانێل",
-    "Destinations": "شوێنەکانی خوێندن",
-    "Resume Builder": "درووستکردنی ژیان نامە",
-    "Communications": "پەیوەندیکردن",
-    "Resources": "سەرچاوەکان",
-    "Login": "چوونەژوورەوە",
-    "Register": "خۆتۆمارکردن",
-    "Logout": "چوونەدەرەوە",
-    "Profile": "پرۆفایل",
-    
-    # Regional Names
-    "Rojhelat": "ڕۆژهەڵات",
-    "Başûr": "باشوور", 
-    "Bakûr": "باکوور",
-    "Rojava": "ڕۆژئاوا",
-    "Diaspora": "دەرەوەی وڵات",
-    
-    # Educational Terms
-    "Bachelor's Degree": "بەکالۆریۆس",
-    "Master's Degree": "ماستەر",
-    "PhD": "دکتۆرا",
-    "Postdoctoral": "پاش دکتۆرا",
-    "Certificate": "بڕوانامە",
-    "Diploma": "دیپلۆما",
-    "Professional Degree": "بڕوانامەی پیشەیی",
-    
-    # Countries and Places
-    "Countries": "وڵاتان",
-    "Universities": "زانکۆکان",
-    "Programs": "بەرنامەکان",
-    "Scholarships": "بورسەکان",
-    "City": "شار",
-    "Country": "وڵات",
-    
-    # Application Terms
-    "Apply": "داخوازینامە",
-    "Application": "داخوازینامە",
-    "Applications": "داخوازینامەکان",
-    "Status": "دۆخ",
-    "Deadline": "کاتی کۆتایی",
-    "Requirements": "پێداویستیەکان",
-    
-    # Common Actions
-    "Search": "گەڕان",
-    "Filter": "پاڵاوتن",
-    "View": "بینین",
-    "Edit": "دەستکاریکردن",
-    "Delete": "سڕینەوە",
-    "Save": "پاشەکەوتکردن",
-    "Cancel": "هەڵوەشاندنەوە",
-    "Submit": "ناردن",
-    "Create": "درووستکردن",
-    "Update": "نوێکردنەوە",
-    
-    # Profile and Personal Info
-    "Name": "ناو",
-    "First Name": "ناوی یەکەم",
-    "Last Name": "ناوی کۆتایی",
-    "Phone Number": "ژمارەی تەلەفۆن",
-    "Address": "ناونیشان",
-    "Date of Birth": "ڕێکەوتی لەدایکبوون",
-    "Gender": "ڕەگەز",
-    "Biography": "ژیاننامە",
-    
-    # Academic Information
-    "GPA": "نمرەی گشتی",
-    "Graduation Year": "ساڵی دەرچوون",
-    "University Name": "ناوی زانکۆ",
-    "Research Interests": "بەرژەوەندیەکانی تویژینەوە",
-    "Academic Awards": "خەڵاتەکانی ئەکادیمی",
-    "Publications": "بڵاوکراوەکان",
-    
-    # Experience
-    "Work Experience": "ئەزموونی کار",
-    "Volunteer Experience": "ئەزموونی خۆبەخشانە",
-    "Technical Skills": "لێهاتوویی تەکنیکی",
-    "Language Skills": "لێهاتوویی زمان",
-    
-    # Communication
-    "Email Templates": "قاڵبەکانی ئیمەیل",
-    "Subject": "بابەت",
-    "Message": "پەیام",
-    "Send": "ناردن",
-    "Reply": "وەڵامدانەوە",
-    
-    # Time and Dates
-    "Today": "ئەمڕۆ",
-    "Yesterday": "دوێنێ",
-    "Tomorrow": "سبەینێ",
-    "Week": "هەفتە",
-    "Month": "مانگ",
-    "Year": "ساڵ",
-    "ago": "لەمەوپێش",
-    
-    # Status Messages
-    "Success": "سەرکەوتوو",
-    "Error": "هەڵە",
-    "Warning": "ئاگاداری",
-    "Info": "زانیاری",
-    "Loading": "بارکردن",
-    
-    # Welcome Messages
-    "Welcome": "بەخێربێیت",
-    "Welcome back": "بەخێربگەڕێیتەوە",
-    "Get Started": "دەستپێکردن",
-    
-    # Kurdish Specific Terms
-    "Kurdish Students": "خوێندکارانی کورد",
-    "Kurdish Community": "کۆمەڵگای کوردی",
-    "Kurdish Language": "زمانی کوردی",
-    "Kurdish Sorani": "کوردی سۆرانی",
-    "Kurdish Kurmanji": "کوردی کورمانجی",
-    
-    # Educational Journey
-    "Study Abroad": "خوێندن لە دەرەوەی وڵات",
-    "Higher Education": "خوێندنی بەرز",
-    "Academic Journey": "گەشتی ئەکادیمی",
-    "Education Background": "پاشخانی خوێندن",
-    
-    # Buttons and Links
-    "Learn More": "زیاتر بزانە",
-    "Read More": "زیاتر بخوێنەوە",
-    "View Details": "وردەکاریەکان ببینە",
-    "View All": "هەموو ببینە",
-    "Go Back": "بگەڕێوە",
-    "Continue": "بەردەوامبوون",
-    "Next": "دواتر",
-    "Previous": "پێشتر",
-    
-    # Forms
-    "Required": "پێویست",
-    "Optional": "ئیختیاری",
-    "Choose": "هەڵبژاردن",
-    "Select": "هەڵبژاردن",
-    "Upload": "بارکردن",
-    "Download": "داگرتن",
-    
-    # Help and Support
-    "Help": "یارمەتی",
-    "Support": "پشتگیری",
-    "FAQ": "پرسیارە دووبارەکان",
-    "Contact": "پەیوەندی",
-    "About": "دەربارە",
-    
-    # Long Texts and Descriptions
-    "Your Journey to Higher Education Starts Here": "گەشتەکەت بۆ خوێندنی بەرز لێرەوە دەستپێدەکات",
-    "Supporting Kurdish students from all regions": "پشتگیری خوێندکارانی کورد لە هەموو هەرێمەکان",
-    "Find Your Perfect Study Destination": "شوێنی تەواوی خوێندنەکەت بدۆزەرەوە",
-    "Create Professional CV": "ژیاننامەیەکی پیشەیی درووست بکە",
-    "Track Your Applications": "داخوازینامەکانت بەدوایدا بکە",
-    
-    # Success Stories
-    "Success Stories": "چیرۆکەکانی سەرکەوتن",
-    "Student Success": "سەرکەوتنی خوێندکار",
-    "Achievement": "دەستکەوت",
-    
-    # Regions Description
-    "Eastern Kurdistan": "کوردستانی ڕۆژهەڵات",
-    "Southern Kurdistan": "کوردستانی باشوور", 
-    "Northern Kurdistan": "کوردستانی باکوور",
-    "Western Kurdistan": "کوردستانی ڕۆژئاوا",
-}
-
-print("Kurdish Sorani translations defined successfully!")
-print(f"Total translations: {len(translations_ckb)}")
@@ -1,3 +1,64 @@
-from django.test import TestCase
+from django.core.signals import request_finished
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
 
-# Create your tests here.
+from .models import Guide, ResourceCategory
+from .views import GuideDetailView, guide_views
+
+
+def create_guide(slug, **kwargs):
+    defaults = {
+        'title': slug.replace('-', ' ').title(),
+        'guide_type': 'visa',
+        'content': 'Guide content',
+    }
+    defaults.update(kwargs)
+    return Guide.objects.create(slug=slug, **defaults)
+
+
+class GuideViewCounterTests(TestCase):
+    def setUp(self):
+        category = ResourceCategory.objects.create(name='Visas')
+        self.guide = create_guide('student-visa', category=category)
+        self.related = create_guide('visa-interview', category=category)
+        self.addCleanup(guide_views.discard)
+
+    def view(self, slug):
+        request = RequestFactory().get(reverse('resources:guide_detail', args=[slug]))
+        return GuideDetailView.as_view()(request, slug=slug)
+
+    def test_reads_do_not_write(self):
+        with CaptureQueriesContext(connection) as queries:
+            for _ in range(3):
+                response = self.view('student-visa')
+        self.assertFalse([q for q in queries.captured_queries if not q['sql'].startswith('SELECT')])
+
+        # Visitors see pending views before they reach the database
+        self.assertEqual(response.context_data['guide'].views, 3)
+        self.assertEqual(list(response.context_data['related_guides']), [self.related])
+        self.guide.refresh_from_db()
+        self.assertEqual(self.guide.views, 0)
+
+    def test_flush_batches_increments_with_f_expressions(self):
+        for _ in range(3):
+            self.view('student-visa')
+        self.view('visa-interview')
+        Guide.objects.filter(pk=self.guide.pk).update(views=10)
+
+        # One UPDATE per distinct increment; concurrent writes are preserved
+        with self.assertNumQueries(4):
+            self.assertEqual(guide_views.flush(), 2)
+        self.assertEqual(Guide.objects.get(pk=self.guide.pk).views, 13)
+        self.assertEqual(Guide.objects.get(pk=self.related.pk).views, 1)
+        self.assertEqual(guide_views.flush(), 0)
+
+    @override_settings(COUNTER_FLUSH_INTERVAL=0)
+    def test_due_counters_flush_when_the_request_finishes(self):
+        self.view('student-visa')
+        request_finished.send(sender=self.__class__)
+
+        self.guide.refresh_from_db()
+        self.assertEqual(self.guide.views, 1)
+        self.assertEqual(guide_views.pending(self.guide.pk), 0)
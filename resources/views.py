@@ -3,9 +3,14 @@ from django.views.generic import ListView, DetailView, TemplateView
 from django.db.models import Q
 from django.utils.translation import gettext_lazy as _
 
+from kurdish_apply.counters import BufferedCounter
+
 from .models import Guide, ResourceCategory
 
 
+guide_views = BufferedCounter(Guide, 'views')
+
+
 class ResourcesHomeView(TemplateView):
     template_name = 'resources/home.html'
     
@@ -85,26 +90,26 @@ class GuideDetailView(DetailView):
     def get_object(self, queryset=None):
         guide = super().get_object(queryset)
         
-        # Increment views count
-        guide.views += 1
-        guide.save(update_fields=['views'])
+        # Counted in memory and written in batches by kurdish_apply.counters
+        guide_views.increment(guide.pk)
+        guide.views = guide_views.current(guide)
         
         return guide
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        guide = self.get_object()
+        guide = self.object
         
         # Get related guides
         related_guides = Guide.objects.filter(
             is_published=True,
             guide_type=guide.guide_type
-        ).exclude(pk=guide.pk)[:4]
+        ).exclude(pk=guide.pk)
         
         if guide.category:
             related_guides = related_guides.filter(category=guide.category)
         
-        context['related_guides'] = related_guides
+        context['related_guides'] = related_guides[:4]
         return context
 
 
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ResumeBuilderConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "resume_builder"
+
+    def ready(self):
+        from . import signals  # noqa: F401
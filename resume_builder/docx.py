@@ -0,0 +1,256 @@
+"""
+DOCX (Office Open XML) export of resumes, streamed as it is written.
+
+Everything that does not depend on the resume (the package parts, styles,
+page setup and localized section headings) is compiled once per template
+style and language into a ``Skeleton`` and kept in memory. A download writes
+those parts uncompressed and then deflates ``word/document.xml`` paragraph by
+paragraph straight into the response, so the archive is never held in memory
+as a whole.
+
+Paragraphs containing Arabic-script text (Sorani names, addresses, ...) are
+marked right-to-left on their own, so mixed Latin/Kurdish resumes lay out
+correctly whatever the interface language is.
+"""
+import functools
+import re
+import time
+import zipfile
+from dataclasses import dataclass
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.utils import translation
+
+from .layout import ARABIC_SCRIPT, SECTION_TITLES, contact_line, entries, page_style, sections
+
+
+CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+
+W_NAMESPACE = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+
+# Width and height in twentieths of a point
+PAGE_SIZES = {
+    'a4': (11906, 16838),
+    'letter': (12240, 15840),
+}
+MARGIN = 1020  # 18 mm
+
+FONTS = {
+    'academic': 'Times New Roman',
+    'research': 'Times New Roman',
+}
+DEFAULT_FONT = 'Calibri'
+# Used for Arabic-script runs (w:cs); widely available and covers Sorani letters
+COMPLEX_SCRIPT_FONT = 'Arial'
+
+# Characters XML 1.0 cannot carry at all
+INVALID_XML = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
+
+# Flush the deflated document to the response every this many paragraphs
+PARAGRAPHS_PER_CHUNK = 20
+
+CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '<Override PartName="/word/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/>'
+    '</Types>'
+)
+
+PACKAGE_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/>'
+    '</Relationships>'
+)
+
+DOCUMENT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/>'
+    '</Relationships>'
+)
+
+# (style id, name, run properties, paragraph properties); WordprocessingML
+# requires the properties in schema order (e.g. pBdr before spacing)
+STYLES = (
+    ('Name', 'Name', '<w:b/><w:sz w:val="36"/><w:szCs w:val="36"/>', '<w:spacing w:after="60"/>'),
+    ('Heading1', 'heading 1', '<w:b/><w:sz w:val="24"/><w:szCs w:val="24"/>',
+     '<w:keepNext/><w:pBdr><w:bottom w:val="single" w:sz="4" w:space="1" w:color="808080"/></w:pBdr>'
+     '<w:spacing w:before="240" w:after="60"/>'),
+    ('EntryTitle', 'Entry Title', '<w:b/>', '<w:keepNext/><w:spacing w:before="120"/>'),
+)
+
+
+@dataclass(frozen=True)
+class Skeleton:
+    """
+    The resume-independent parts of a DOCX for one template style and language
+    """
+    parts: tuple
+    document_start: bytes
+    document_end: bytes
+    headings: dict
+
+
+def clean(text):
+    return escape(INVALID_XML.sub('', str(text)))
+
+
+def is_rtl(text):
+    return bool(ARABIC_SCRIPT.search(text))
+
+
+def paragraph(text, style=None, rtl=None):
+    """
+    ``<w:p>`` for ``text``; newlines become line breaks
+    """
+    text = str(text)
+    if rtl is None:
+        rtl = is_rtl(text)
+    properties = f'<w:pStyle w:val="{style}"/>' if style else ''
+    run_properties = ''
+    if rtl:
+        properties += '<w:bidi/>'
+        run_properties = '<w:rPr><w:rtl/></w:rPr>'
+    lines = text.split('\n')
+    content = '<w:br/>'.join(f'<w:t xml:space="preserve">{clean(line)}</w:t>' for line in lines)
+    return f'<w:p><w:pPr>{properties}</w:pPr><w:r>{run_properties}{content}</w:r></w:p>'
+
+
+def _styles(font, rtl):
+    language = '<w:lang w:val="en-GB" w:bidi="ckb-IQ"/>'
+    defaults = (
+        f'<w:docDefaults><w:rPrDefault><w:rPr>'
+        f'<w:rFonts w:ascii="{font}" w:hAnsi="{font}" w:cs="{COMPLEX_SCRIPT_FONT}"/>'
+        f'<w:sz w:val="21"/><w:szCs w:val="21"/>{language}</w:rPr></w:rPrDefault>'
+        f'<w:pPrDefault><w:pPr>{"<w:bidi/>" if rtl else ""}<w:spacing w:after="40"/></w:pPr></w:pPrDefault>'
+        f'</w:docDefaults>'
+    )
+    styles = ''.join(
+        f'<w:style w:type="paragraph" w:styleId="{style_id}"><w:name w:val="{name}"/>'
+        f'<w:basedOn w:val="Normal"/><w:pPr>{paragraph_properties}</w:pPr><w:rPr>{run_properties}</w:rPr></w:style>'
+        for style_id, name, run_properties, paragraph_properties in STYLES
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        f'<w:styles xmlns:w="{W_NAMESPACE}">{defaults}'
+        '<w:style w:type="paragraph" w:default="1" w:styleId="Normal"><w:name w:val="Normal"/></w:style>'
+        f'{styles}</w:styles>'
+    )
+
+
+@functools.lru_cache(maxsize=64)
+def skeleton(template_type, page, language):
+    """
+    Compile the parts shared by every resume using this template style in ``language``
+    """
+    rtl = language.split('-')[0] in settings.LANGUAGES_BIDI
+    width, height = PAGE_SIZES[page]
+    with translation.override(language):
+        headings = {
+            name: paragraph(title, 'Heading1', rtl=rtl).encode('utf-8')
+            for name, title in SECTION_TITLES.items()
+        }
+    return Skeleton(
+        parts=(
+            ('[Content_Types].xml', CONTENT_TYPES.encode('utf-8')),
+            ('_rels/.rels', PACKAGE_RELS.encode('utf-8')),
+            ('word/_rels/document.xml.rels', DOCUMENT_RELS.encode('utf-8')),
+            ('word/styles.xml', _styles(FONTS.get(template_type, DEFAULT_FONT), rtl).encode('utf-8')),
+        ),
+        document_start=(
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            f'<w:document xmlns:w="{W_NAMESPACE}"><w:body>'
+        ).encode('utf-8'),
+        document_end=(
+            f'<w:sectPr><w:pgSz w:w="{width}" w:h="{height}"/>'
+            f'<w:pgMar w:top="{MARGIN}" w:right="{MARGIN}" w:bottom="{MARGIN}" w:left="{MARGIN}" '
+            f'w:header="708" w:footer="708" w:gutter="0"/>{"<w:bidi/>" if rtl else ""}</w:sectPr></w:body></w:document>'
+        ).encode('utf-8'),
+        headings=headings,
+    )
+
+
+def skeleton_for(snapshot, language):
+    template_type = snapshot.template.template_type if snapshot.template else None
+    return skeleton(template_type, page_style(snapshot), language)
+
+
+class _Chunks:
+    """
+    Write-only, unseekable file that collects the archive's bytes until drained
+    """
+    def __init__(self):
+        self._parts = []
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._parts)
+        self._parts.clear()
+        return data
+
+
+def _paragraphs(snapshot, language, headings):
+    yield paragraph(snapshot.full_name, 'Name').encode('utf-8')
+    if snapshot.kurdish_name:
+        yield paragraph(snapshot.kurdish_name).encode('utf-8')
+    contact = contact_line(snapshot)
+    if contact:
+        yield paragraph(contact).encode('utf-8')
+    if snapshot.address:
+        yield paragraph(snapshot.address).encode('utf-8')
+
+    with translation.override(language):
+        for name in sections(snapshot):
+            rows = entries(name, snapshot)
+            if not rows:
+                continue
+            yield headings[name]
+            for title, lines in rows:
+                if title:
+                    yield paragraph(title, 'EntryTitle').encode('utf-8')
+                for line in lines:
+                    if line:
+                        yield paragraph(line).encode('utf-8')
+
+
+def stream(snapshot, language):
+    """
+    Yield the DOCX for a resume snapshot in chunks
+    """
+    compiled = skeleton_for(snapshot, language)
+    output = _Chunks()
+    date_time = time.localtime()[:6]
+    with zipfile.ZipFile(output, 'w') as archive:
+        for name, content in compiled.parts:
+            archive.writestr(zipfile.ZipInfo(name, date_time), content, compress_type=zipfile.ZIP_STORED)
+        yield output.drain()
+
+        document = zipfile.ZipInfo('word/document.xml', date_time)
+        document.compress_type = zipfile.ZIP_DEFLATED
+        with archive.open(document, 'w') as handle:
+            handle.write(compiled.document_start)
+            for count, xml in enumerate(_paragraphs(snapshot, language, compiled.headings), 1):
+                handle.write(xml)
+                if count % PARAGRAPHS_PER_CHUNK == 0:
+                    chunk = output.drain()
+                    if chunk:
+                        yield chunk
+            handle.write(compiled.document_end)
+    yield output.drain()
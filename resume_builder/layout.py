@@ -0,0 +1,99 @@
+"""
+Format-independent resume layout shared by the PDF and DOCX renderers.
+
+Both work from a ``ResumeSnapshot``: ``sections`` gives the section order of
+the resume's template and ``entries`` the heading and detail lines of each
+entry in a section.
+"""
+import re
+
+from django.utils.translation import gettext as _, gettext_lazy
+
+
+SECTIONS = ('summary', 'objective', 'education', 'experience', 'publications', 'awards', 'skills')
+
+SECTION_TITLES = {
+    'summary': gettext_lazy('Professional Summary'),
+    'objective': gettext_lazy('Career Objective'),
+    'education': gettext_lazy('Education'),
+    'experience': gettext_lazy('Experience'),
+    'publications': gettext_lazy('Publications'),
+    'awards': gettext_lazy('Awards'),
+    'skills': gettext_lazy('Skills'),
+}
+
+# Template country styles printed on US Letter rather than A4
+LETTER_STYLES = ('us', 'canada')
+
+# Arabic, its supplement and extended-A blocks and the presentation forms (not U+FEFF, the BOM)
+ARABIC_SCRIPT = re.compile('[\u0600-\u06ff\u0750-\u077f\u08a0-\u08ff\ufb50-\ufdff\ufe70-\ufefe]')
+
+
+def sections(snapshot):
+    """
+    Section names in the order the resume's template asks for
+    """
+    order = (snapshot.template.sections_order if snapshot.template else None) or SECTIONS
+    seen = []
+    for name in order:
+        if name in SECTIONS and name not in seen:
+            seen.append(name)
+    return seen
+
+
+def page_style(snapshot):
+    return 'letter' if snapshot.template and snapshot.template.country_style in LETTER_STYLES else 'a4'
+
+
+def contact_line(snapshot):
+    return ' · '.join(filter(None, [snapshot.email, snapshot.phone, snapshot.website, snapshot.linkedin]))
+
+
+def _month(value):
+    return f'{value:%Y-%m}' if value else ''
+
+
+def _dates(entry):
+    if entry.is_current:
+        return f'{_month(entry.start_date)} – {_("Present")}'
+    if entry.end_date:
+        return f'{_month(entry.start_date)} – {_month(entry.end_date)}'
+    return _month(entry.start_date)
+
+
+def entries(name, snapshot):
+    """
+    ``(heading, detail lines)`` for each entry of a section; call with the output language active
+    """
+    if name == 'summary':
+        return [('', [snapshot.professional_summary])] if snapshot.professional_summary else []
+    if name == 'objective':
+        return [('', [snapshot.objective])] if snapshot.objective else []
+    if name == 'education':
+        return [
+            (f'{entry.degree_title}, {entry.institution_name}',
+             [_dates(entry), entry.field_of_study, entry.thesis_title, entry.gpa, entry.description,
+              entry.achievements])
+            for entry in snapshot.education
+        ]
+    if name == 'experience':
+        return [
+            (f'{entry.job_title}, {entry.company_name}', [_dates(entry), entry.description, entry.achievements])
+            for entry in snapshot.experience
+        ]
+    if name == 'publications':
+        return [
+            (entry.title,
+             [entry.authors,
+              ', '.join(filter(None, [entry.publication_venue, str(entry.publication_date.year) if entry.publication_date else ''])),
+              entry.doi])
+            for entry in snapshot.publications
+        ]
+    if name == 'awards':
+        return [
+            (entry.title, [f'{entry.issuing_organization}, {_month(entry.date_received)}', entry.description])
+            for entry in snapshot.awards
+        ]
+    if name == 'skills':
+        return [(entry.name, [entry.description]) for entry in snapshot.skills]
+    return []
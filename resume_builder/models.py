@@ -1,7 +1,11 @@
 from django.db import models
+from django.db.models import Count, IntegerField, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
 from django.utils.translation import gettext_lazy as _
 from accounts.models import KurdishUser
 
+from .snapshots import ENTRY_TYPES, ResumeSnapshot
+
 
 class CVTemplate(models.Model):
     """
@@ -47,6 +51,41 @@ class CVTemplate(models.Model):
         verbose_name_plural = _('CV Templates')
 
 
+def _entry_count(relation):
+    model = Resume._meta.get_field(relation).related_model
+    counts = (
+        model.objects.filter(resume=OuterRef('pk'))
+        .order_by()
+        .values('resume')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+class ResumeQuerySet(models.QuerySet):
+    def with_content(self):
+        """
+        Load the template and every entry set: one query for the resumes plus one per set
+        """
+        prefetches = []
+        for relation in ENTRY_TYPES:
+            model = self.model._meta.get_field(relation).related_model
+            # Display order first, then each model's own chronological ordering
+            ordering = dict.fromkeys(['order', *model._meta.ordering, 'pk'])
+            prefetches.append(Prefetch(relation, queryset=model.objects.order_by(*ordering)))
+        return self.select_related('template').prefetch_related(*prefetches)
+    
+    def with_counts(self):
+        """
+        Annotate ``<set>_count`` for every entry set in the listing query
+        """
+        return self.annotate(**{f'{relation}_count': _entry_count(relation) for relation in ENTRY_TYPES})
+    
+    def snapshots(self):
+        return [resume.snapshot() for resume in self.with_content()]
+
+
 class Resume(models.Model):
     """
     Model for user's resume/CV
@@ -79,9 +118,17 @@ class Resume(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = ResumeQuerySet.as_manager()
+    
     def __str__(self):
         return f"{self.title} - {self.user.username}"
     
+    def snapshot(self):
+        """
+        Immutable copy of the resume and its entries; load with ``with_content()`` to avoid per-set queries
+        """
+        return ResumeSnapshot.from_resume(self)
+    
     class Meta:
         verbose_name = _('Resume')
         verbose_name_plural = _('Resumes')
@@ -0,0 +1,327 @@
+"""
+PDF rendering of resumes.
+
+A ``ResumeSnapshot`` is both hashed and rendered, so the hash covers exactly
+what ends up on the page. Generated
+files are named after that hash: when ``Resume.pdf_file`` already points at
+the file for the current hash, it is served as-is and nothing is rendered.
+Rendering runs in the background (``tasks.render_resume_pdf``).
+
+Sorani text needs a TrueType font with Arabic-script glyphs
+(``RESUME_PDF_FONT``, otherwise the first installed of ``FONT_CANDIDATES``)
+and HarfBuzz (``uharfbuzz``) to join its letters; rendering such text
+without them raises ``ImproperlyConfigured`` rather than printing empty
+boxes. ReportLab shapes each word in its own direction, and the words of
+every line are put in visual order here (``visual_order``), so right-to-left
+lines read correctly with Latin names and numbers embedded in them.
+"""
+import hashlib
+import io
+import json
+import os
+import re
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.base import ContentFile
+from django.utils import translation
+
+from .layout import ARABIC_SCRIPT, SECTION_TITLES, contact_line, entries, page_style, sections
+from .models import Resume
+
+
+# Bump when the layout changes so stored PDFs are regenerated
+RENDERER_VERSION = 2
+
+FONT_NAME = 'ResumeFont'
+
+# Regular and bold fonts with Arabic-script glyphs, used when RESUME_PDF_FONT is not set
+FONT_CANDIDATES = (
+    ('/usr/share/fonts/truetype/noto/NotoNaskhArabic-Regular.ttf',
+     '/usr/share/fonts/truetype/noto/NotoNaskhArabic-Bold.ttf'),
+    ('/usr/share/fonts/truetype/noto/NotoSansArabic-Regular.ttf',
+     '/usr/share/fonts/truetype/noto/NotoSansArabic-Bold.ttf'),
+    ('/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf', '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf'),
+)
+
+RTL_LETTER = re.compile('[\u0590-\u05ff\u0620-\u064a\u066e-\u06d5\u06e5-\u06ef\u06fa-\u06ff\u0750-\u08ff\ufb1d-\ufdff\ufe70-\ufefe]')
+LETTER = re.compile(r'[^\W\d_]')
+DIGIT = re.compile(r'\d')
+
+# Seconds a queued render blocks another request from queueing the same content
+QUEUE_TIMEOUT = 300
+
+
+def content_hash(snapshot, language):
+    """
+    Hash of everything that ends up in the PDF
+    """
+    data = {'renderer': RENDERER_VERSION, 'language': language, 'resume': snapshot.as_dict()}
+    encoded = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def file_name(resume, digest):
+    return f"{Resume._meta.get_field('pdf_file').upload_to}resume-{resume.pk}-{digest[:16]}.pdf"
+
+
+def is_current(resume, digest):
+    """
+    Whether the stored PDF was rendered from content with this hash
+    """
+    name = resume.pdf_file.name
+    return bool(name) and name == file_name(resume, digest) and resume.pdf_file.storage.exists(name)
+
+
+def _queue_key(resume_id, digest):
+    return f'resume_pdf:{resume_id}:{digest}'
+
+
+def queue(resume, digest, language):
+    """
+    Start rendering in the background unless the same content is already queued
+    """
+    from kurdish_apply.celery import run_in_background
+    from .tasks import render_resume_pdf
+
+    if not cache.add(_queue_key(resume.pk, digest), True, QUEUE_TIMEOUT):
+        return False
+    run_in_background(render_resume_pdf, resume.pk, language)
+    return True
+
+
+def font_paths():
+    """
+    The regular and bold font files for resume PDFs, or ``(None, None)`` when there is none
+    """
+    regular = getattr(settings, 'RESUME_PDF_FONT', None)
+    if regular:
+        return os.fspath(regular), os.fspath(getattr(settings, 'RESUME_PDF_BOLD_FONT', None) or regular)
+    for regular, bold in FONT_CANDIDATES:
+        if os.path.exists(regular):
+            return regular, bold if os.path.exists(bold) else regular
+    return None, None
+
+
+def _register(path):
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+
+    name = f'{FONT_NAME}-{hashlib.md5(path.encode()).hexdigest()[:8]}'
+    if name not in pdfmetrics.getRegisteredFontNames():
+        pdfmetrics.registerFont(TTFont(name, path))
+    return name
+
+
+def _fonts(texts):
+    """
+    Regular and bold font names able to draw ``texts``
+    """
+    from reportlab.pdfbase import pdfmetrics
+
+    needed = {character for text in texts for character in ARABIC_SCRIPT.findall(text)}
+    regular_path, bold_path = font_paths()
+    if regular_path is None:
+        if needed:
+            raise ImproperlyConfigured(
+                'Resume PDFs with Arabic-script text need a TrueType font with Arabic glyphs; '
+                'set RESUME_PDF_FONT (e.g. to Noto Naskh Arabic or DejaVu Sans).'
+            )
+        return 'Helvetica', 'Helvetica-Bold'
+
+    names = _register(regular_path), _register(bold_path)
+    if needed:
+        for name, path in zip(names, (regular_path, bold_path)):
+            font = pdfmetrics.getFont(name)
+            missing = ''.join(sorted(character for character in needed if ord(character) not in font.face.charToGlyph))
+            if missing:
+                raise ImproperlyConfigured(f'The resume PDF font {path} has no glyphs for {missing!r}.')
+            if not font.shapable:
+                raise ImproperlyConfigured('Arabic-script text in resume PDFs needs uharfbuzz (reportlab[shaping]).')
+    return names
+
+
+def _direction(word):
+    if RTL_LETTER.search(word):
+        return 'R'
+    if LETTER.search(word):
+        return 'L'
+    return 'N' if DIGIT.search(word) else None
+
+
+def visual_order(words, rtl):
+    """
+    ``words`` of one line, in logical order, rearranged left to right for display
+
+    A word-level form of the Unicode bidi algorithm: numbers follow the
+    strong text before them, neutral words the text around them, and runs
+    are reversed by embedding level. The letters inside a word are ordered
+    when the word is shaped.
+    """
+    base = 'R' if rtl else 'L'
+    kinds = []
+    previous = base
+    for word in words:
+        kind = _direction(word)
+        if kind == 'N':
+            kind = previous
+        elif kind is not None:
+            previous = kind
+        kinds.append(kind)
+    for index, kind in enumerate(kinds):
+        if kind is None:
+            before = next((kinds[i] for i in range(index - 1, -1, -1) if kinds[i]), base)
+            after = next((kinds[i] for i in range(index + 1, len(kinds)) if kinds[i]), base)
+            kinds[index] = before if before == after else base
+    levels = [1 if kind == 'R' else (2 if rtl else 0) for kind in kinds]
+
+    order = list(range(len(words)))
+    for level in range(max(levels, default=0), 0, -1):
+        index = 0
+        while index < len(order):
+            if levels[order[index]] < level:
+                index += 1
+                continue
+            end = index
+            while end < len(order) and levels[order[end]] >= level:
+                end += 1
+            order[index:end] = reversed(order[index:end])
+            index = end
+    return [words[index] for index in order]
+
+
+def _text_width(text, font_name, font_size):
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import ShapedStr, shapeStr
+
+    if getattr(pdfmetrics.getFont(font_name), 'shapable', False):
+        shaped = shapeStr(text, font_name, font_size)
+        if isinstance(shaped, ShapedStr):
+            return sum(data.x_advance for data in shaped.__shapeData__) * font_size / 1000
+    return pdfmetrics.stringWidth(text, font_name, font_size)
+
+
+def _paragraphs(text, style, width, rtl):
+    """
+    Flowables for one paragraph of plain text
+
+    Text with right-to-left words is broken into lines here, so that each
+    line's words can be put in visual order.
+    """
+    from reportlab.platypus import Paragraph
+    from xml.sax.saxutils import escape
+
+    if not RTL_LETTER.search(text):
+        return [Paragraph(escape(text), style)]
+
+    first = next((kind for kind in map(_direction, text.split()) if kind in ('R', 'L')), None)
+    base_rtl = first == 'R' or (first is None and rtl)
+    space = _text_width(' ', style.fontName, style.fontSize)
+    lines = []
+    for source_line in text.splitlines() or ['']:
+        line, line_width = [], 0
+        for word in source_line.split():
+            word_width = _text_width(word, style.fontName, style.fontSize)
+            if line and line_width + space + word_width > width:
+                lines.append(line)
+                line, line_width = [], 0
+            line_width += (space if line else 0) + word_width
+            line.append(word)
+        if line:
+            lines.append(line)
+
+    flowables = []
+    for index, line in enumerate(lines):
+        line_style = style.clone(
+            f'{style.name}-{index}',
+            spaceBefore=style.spaceBefore if index == 0 else 0,
+            spaceAfter=style.spaceAfter if index == len(lines) - 1 else 0,
+        )
+        flowables.append(Paragraph(escape(' '.join(visual_order(line, base_rtl))), line_style))
+    return flowables
+
+
+def render(snapshot, language):
+    """
+    Lay out a resume snapshot as a PDF; returns the file content
+    """
+    from reportlab.lib.enums import TA_RIGHT
+    from reportlab.lib.pagesizes import A4, LETTER
+    from reportlab.lib.styles import ParagraphStyle
+    from reportlab.lib.units import mm
+    from reportlab.platypus import SimpleDocTemplate, Spacer
+
+    rtl = language.split('-')[0] in settings.LANGUAGES_BIDI
+    with translation.override(language):
+        blocks = [(name, str(SECTION_TITLES[name]), entries(name, snapshot)) for name in sections(snapshot)]
+    texts = [snapshot.full_name, snapshot.kurdish_name or '', contact_line(snapshot)]
+    for name, section_title, rows in blocks:
+        if rows:
+            texts += [section_title] + [text for title, lines in rows for text in [title, *lines] if text]
+    regular, bold = _fonts(texts)
+
+    alignment = {'alignment': TA_RIGHT} if rtl else {}
+    body = ParagraphStyle('body', fontName=regular, fontSize=10, leading=13, shaping=1, **alignment)
+    entry = ParagraphStyle('entry', parent=body, fontName=bold, spaceBefore=4)
+    heading = ParagraphStyle('heading', parent=body, fontName=bold, fontSize=12, leading=15, spaceBefore=10, spaceAfter=3)
+    name_style = ParagraphStyle('name', parent=body, fontName=bold, fontSize=18, leading=22)
+
+    pagesize = LETTER if page_style(snapshot) == 'letter' else A4
+    margin = 18 * mm
+    # A point to spare, so ReportLab never wraps a line that was measured to fit
+    width = pagesize[0] - 2 * margin - 1
+
+    def paragraphs(text, style):
+        return _paragraphs(text, style, width, rtl)
+
+    story = paragraphs(snapshot.full_name, name_style)
+    if snapshot.kurdish_name:
+        story += paragraphs(snapshot.kurdish_name, body)
+    story += paragraphs(contact_line(snapshot), body) + [Spacer(1, 4 * mm)]
+
+    for name, section_title, rows in blocks:
+        if not rows:
+            continue
+        story += paragraphs(section_title, heading)
+        for title, lines in rows:
+            if title:
+                story += paragraphs(title, entry)
+            for line in lines:
+                if line:
+                    story += paragraphs(line, body)
+
+    output = io.BytesIO()
+    document = SimpleDocTemplate(
+        output, pagesize=pagesize,
+        leftMargin=margin, rightMargin=margin, topMargin=16 * mm, bottomMargin=16 * mm,
+        title=snapshot.title, author=snapshot.full_name,
+    )
+    document.build(story)
+    return output.getvalue()
+
+
+def build(resume_id, language=None):
+    """
+    Render the resume unless its current PDF is already stored; returns the file name
+    """
+    resume = Resume.objects.with_content().get(pk=resume_id)
+    snapshot = resume.snapshot()
+    language = language or settings.LANGUAGE_CODE
+    digest = content_hash(snapshot, language)
+    try:
+        if is_current(resume, digest):
+            return resume.pdf_file.name
+        name = file_name(resume, digest)
+        storage = resume.pdf_file.storage
+        if not storage.exists(name):
+            name = storage.save(name, ContentFile(render(snapshot, language)))
+
+        previous = resume.pdf_file.name
+        # A queryset update leaves updated_at alone: the resume itself did not change
+        Resume.objects.filter(pk=resume.pk).update(pdf_file=name)
+        if previous and previous != name:
+            storage.delete(previous)
+        return name
+    finally:
+        cache.delete(_queue_key(resume.pk, digest))
@@ -0,0 +1,13 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from accounts import stats
+
+from .models import Resume
+
+
+@receiver(post_save, sender=Resume)
+@receiver(post_delete, sender=Resume)
+def update_resume_stats(sender, instance, raw=False, **kwargs):
+    if not raw:
+        stats.refresh_on_commit([instance.user_id], 'resumes', 'activity')
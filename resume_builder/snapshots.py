@@ -0,0 +1,120 @@
+"""
+Immutable copies of a resume and everything it contains.
+
+``Resume.objects.with_content()`` loads resumes with their template and all
+five entry sets in a fixed number of queries (one for the resumes and
+templates, one per entry set), however many resumes are fetched;
+``.snapshots()`` turns them into ``ResumeSnapshot`` objects. Snapshots hold
+plain values only, so they can be pickled into the cache, passed to
+background jobs, hashed or rendered without touching the database again.
+"""
+from collections import namedtuple
+from dataclasses import dataclass, fields
+
+
+ENTRY_FIELDS = {
+    'education': ('degree_level', 'degree_title', 'field_of_study', 'institution_name', 'institution_city',
+                  'institution_country', 'start_date', 'end_date', 'is_current', 'gpa', 'thesis_title',
+                  'supervisor', 'description', 'achievements', 'order'),
+    'experience': ('experience_type', 'job_title', 'company_name', 'company_city', 'company_country',
+                   'start_date', 'end_date', 'is_current', 'description', 'achievements', 'skills_used',
+                   'order'),
+    'skills': ('category', 'name', 'proficiency', 'description', 'years_of_experience', 'order'),
+    'publications': ('publication_type', 'title', 'authors', 'publication_venue', 'publication_date', 'volume',
+                     'issue', 'pages', 'doi', 'url', 'abstract', 'keywords', 'order'),
+    'awards': ('award_type', 'title', 'issuing_organization', 'date_received', 'description', 'order'),
+}
+
+# Module-level so that entries pickle
+EducationEntry = namedtuple('EducationEntry', ('pk',) + ENTRY_FIELDS['education'])
+ExperienceEntry = namedtuple('ExperienceEntry', ('pk',) + ENTRY_FIELDS['experience'])
+SkillEntry = namedtuple('SkillEntry', ('pk',) + ENTRY_FIELDS['skills'])
+PublicationEntry = namedtuple('PublicationEntry', ('pk',) + ENTRY_FIELDS['publications'])
+AwardEntry = namedtuple('AwardEntry', ('pk',) + ENTRY_FIELDS['awards'])
+
+ENTRY_TYPES = {
+    'education': EducationEntry,
+    'experience': ExperienceEntry,
+    'skills': SkillEntry,
+    'publications': PublicationEntry,
+    'awards': AwardEntry,
+}
+
+
+def _plain(value):
+    return value.isoformat() if hasattr(value, 'isoformat') else value
+
+
+@dataclass(frozen=True)
+class TemplateSnapshot:
+    pk: int
+    name: str
+    template_type: str
+    country_style: str
+    sections_order: tuple
+
+    @classmethod
+    def from_template(cls, template):
+        return cls(
+            pk=template.pk,
+            name=template.name,
+            template_type=template.template_type,
+            country_style=template.country_style,
+            sections_order=tuple(template.sections_order or ()),
+        )
+
+
+@dataclass(frozen=True)
+class ResumeSnapshot:
+    pk: int
+    user_id: int
+    template: TemplateSnapshot
+    title: str
+    target_country: str
+    target_field: str
+    full_name: str
+    kurdish_name: str
+    email: str
+    phone: str
+    address: str
+    website: str
+    linkedin: str
+    professional_summary: str
+    objective: str
+    is_primary: bool
+    education: tuple = ()
+    experience: tuple = ()
+    skills: tuple = ()
+    publications: tuple = ()
+    awards: tuple = ()
+
+    @classmethod
+    def from_resume(cls, resume):
+        """
+        Snapshot a resume, reading entries from its prefetch cache when it has one
+        """
+        values = {
+            field.name: getattr(resume, field.name)
+            for field in fields(cls) if field.name not in ENTRY_TYPES and field.name != 'template'
+        }
+        values['template'] = TemplateSnapshot.from_template(resume.template) if resume.template else None
+        for relation, entry_type in ENTRY_TYPES.items():
+            values[relation] = tuple(
+                entry_type(row.pk, *(getattr(row, name) for name in ENTRY_FIELDS[relation]))
+                for row in getattr(resume, relation).all()
+            )
+        return cls(**values)
+
+    def as_dict(self):
+        """
+        JSON-serializable form; dates become ISO strings
+        """
+        data = {}
+        for field in fields(self):
+            value = getattr(self, field.name)
+            if field.name in ENTRY_TYPES:
+                value = [{key: _plain(item) for key, item in entry._asdict().items()} for entry in value]
+            elif isinstance(value, TemplateSnapshot):
+                value = {key: list(item) if isinstance(item, tuple) else item for key, item in vars(value).items()}
+            data[field.name] = value
+        return data
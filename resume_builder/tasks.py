@@ -0,0 +1,19 @@
+import logging
+
+from celery import shared_task
+
+from . import pdf
+from .models import Resume
+
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(ignore_result=True)
+def render_resume_pdf(resume_id, language=None):
+    try:
+        name = pdf.build(resume_id, language)
+    except Resume.DoesNotExist:
+        # Deleted while queued
+        return
+    logger.info('Resume %s PDF stored as %s', resume_id, name)
@@ -1,3 +1,236 @@
-from django.test import TestCase
+import dataclasses
+import datetime
+import io
+import json
+import pickle
+import shutil
+import tempfile
+import zipfile
+from unittest import mock, skipUnless
+from xml.etree import ElementTree
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.pdfbase.ttfonts import ShapedStr, uharfbuzz
+
+from accounts.models import KurdishUser
+
+from . import docx, layout, pdf
+from .models import Award, CVTemplate, Education, Resume, Skill
+
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def create_resume():
+    user = KurdishUser.objects.create_user(username='student', password='secret', region='bashur')
+    template = CVTemplate.objects.create(
+        name='Academic', template_type='academic', country_style='eu', description='',
+        sections_order=['education', 'summary'],
+    )
+    resume = Resume.objects.create(
+        user=user, template=template, title='PhD applications', full_name='Hana Aziz',
+        kurdish_name='هانا عەزیز', email='hana@example.com', professional_summary='Hydrology researcher',
+    )
+    Education.objects.create(
+        resume=resume, degree_level='master', degree_title='MSc Hydrology',
+        institution_name='University of Sulaimani', start_date=datetime.date(2020, 9, 1),
+    )
+    return user, resume
+
+
+@override_settings(CELERY_TASK_ALWAYS_EAGER=True, MEDIA_ROOT=MEDIA_ROOT)
+class ResumePDFTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        self.user, self.resume = create_resume()
+        self.url = reverse('resume_builder:download_pdf', args=[self.resume.pk])
+        self.client.force_login(self.user)
+
+    def download(self):
+        response = self.client.get(self.url)
+        self.resume.refresh_from_db()
+        return response
+
+    def test_renders_once_per_content(self):
+        response = self.download()
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(b''.join(response.streaming_content).startswith(b'%PDF'))
+        first = self.resume.pdf_file.name
+
+        with mock.patch.object(pdf, 'render') as render:
+            self.assertEqual(self.download().status_code, 200)
+        render.assert_not_called()
+        self.assertEqual(self.resume.pdf_file.name, first)
+
+    def test_content_change_replaces_file(self):
+        self.download()
+        first = self.resume.pdf_file.name
+        updated_at = self.resume.updated_at
+
+        self.resume.education.update(gpa='3.9')
+        self.download()
+        self.assertNotEqual(self.resume.pdf_file.name, first)
+        self.assertFalse(self.resume.pdf_file.storage.exists(first))
+        # Storing the file is not an edit of the resume
+        self.assertEqual(self.resume.updated_at, updated_at)
+
+    def test_sections_follow_template_order(self):
+        self.assertEqual(layout.sections(self.resume.snapshot()), ['education', 'summary'])
+        self.resume.template = None
+        self.assertEqual(layout.sections(self.resume.snapshot()), list(layout.SECTIONS))
+
+    def test_pending_render_redirects(self):
+        with override_settings(CELERY_TASK_ALWAYS_EAGER=False, CELERY_BROKER_URL=''):
+            # Already queued by another request: nothing new is started
+            digest = pdf.content_hash(self.resume.snapshot(), 'ckb')
+            cache.add(pdf._queue_key(self.resume.pk, digest), True)
+            with mock.patch('kurdish_apply.celery.run_in_background') as run_in_background:
+                response = self.client.get(self.url)
+        run_in_background.assert_not_called()
+        self.assertRedirects(response, reverse('resume_builder:detail', args=[self.resume.pk]), fetch_redirect_response=False)
+        self.resume.refresh_from_db()
+        self.assertFalse(self.resume.pdf_file)
+
+    def test_other_users_resume(self):
+        other = KurdishUser.objects.create_user(username='other', password='secret', region='rojava')
+        self.client.force_login(other)
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+
+class ResumePDFTextTests(TestCase):
+    def test_words_are_put_in_visual_order(self):
+        self.assertEqual(pdf.visual_order(['2020-09', '–', 'ئێستا'], rtl=True), ['ئێستا', '–', '2020-09'])
+        self.assertEqual(
+            pdf.visual_order(['زانکۆی', 'سلێمانی', 'MSc', 'Hydrology'], rtl=True),
+            ['MSc', 'Hydrology', 'سلێمانی', 'زانکۆی'],
+        )
+        self.assertEqual(pdf.visual_order(['Dear', 'هانا', 'عەزیز', 'hello'], rtl=False),
+                         ['Dear', 'عەزیز', 'هانا', 'hello'])
+
+    @override_settings(RESUME_PDF_FONT=None)
+    def test_arabic_script_needs_a_font(self):
+        user, resume = create_resume()
+        with mock.patch.object(pdf, 'FONT_CANDIDATES', ()):
+            with self.assertRaisesMessage(ImproperlyConfigured, 'RESUME_PDF_FONT'):
+                pdf.render(resume.snapshot(), 'ckb')
+            resume.kurdish_name = ''
+            # Latin-only resumes still render with the built-in fonts
+            self.assertTrue(pdf.render(resume.snapshot(), 'en').startswith(b'%PDF'))
+
+    @skipUnless(pdf.font_paths()[0] and uharfbuzz, 'needs a font with Arabic glyphs and uharfbuzz')
+    def test_sorani_lines_are_shaped_right_to_left(self):
+        regular, bold = pdf._fonts(['خوێندن'])
+        style = ParagraphStyle('body', fontName=regular, fontSize=10, shaping=1)
+        width = pdf._text_width('خوێندن لە زانکۆی', regular, 10) + 1
+
+        lines = pdf._paragraphs('خوێندن لە زانکۆی سلێمانی', style, width, rtl=True)
+
+        self.assertEqual([line.text for line in lines], ['زانکۆی لە خوێندن', 'سلێمانی'])
+        # HarfBuzz replaced the letters with their joined forms
+        lines[0].wrap(width, 100)
+        drawn = lines[0].blPara.lines[0].words[0].text
+        self.assertIsInstance(drawn, ShapedStr)
+        self.assertNotIn('خ', drawn)
+
+
+class ResumeDocxTests(TestCase):
+    def setUp(self):
+        self.user, self.resume = create_resume()
+        self.client.force_login(self.user)
+
+    def download(self):
+        response = self.client.get(reverse('resume_builder:download_doc', args=[self.resume.pk]))
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], docx.CONTENT_TYPE)
+        return zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+
+    def test_document(self):
+        archive = self.download()
+        self.assertIsNone(archive.testzip())
+        for name in archive.namelist():
+            ElementTree.fromstring(archive.read(name))
+        document = archive.read('word/document.xml').decode('utf-8')
+
+        # Sections follow the template, and Sorani text is laid out right to left
+        self.assertLess(document.index('MSc Hydrology'), document.index('Hydrology researcher'))
+        self.assertNotIn('<w:bidi/>', document.split('هانا عەزیز')[0].rsplit('<w:p>', 1)[0])
+        self.assertIn('<w:bidi/>', document.split('هانا عەزیز')[0].rsplit('<w:p>', 1)[1])
+
+    def test_properties_follow_schema_order(self):
+        # Sequences of the WordprocessingML schema, limited to the elements the renderer writes
+        order = {
+            'pPr': ['pStyle', 'keepNext', 'pBdr', 'bidi', 'spacing', 'jc'],
+            'sectPr': ['pgSz', 'pgMar', 'bidi'],
+            'rPr': ['rFonts', 'b', 'sz', 'szCs', 'rtl', 'lang'],
+        }
+        archive = self.download()
+        namespace = f'{{{docx.W_NAMESPACE}}}'
+        for name in ('word/document.xml', 'word/styles.xml'):
+            for element in ElementTree.fromstring(archive.read(name)).iter():
+                sequence = order.get(element.tag.replace(namespace, ''))
+                if sequence is None:
+                    continue
+                children = [child.tag.replace(namespace, '') for child in element]
+                self.assertEqual(children, sorted(children, key=sequence.index), f'{name}: {element.tag}')
+
+    def test_skeleton_is_shared(self):
+        snapshot = self.resume.snapshot()
+        self.assertIs(docx.skeleton_for(snapshot, 'en'), docx.skeleton_for(self.resume.snapshot(), 'en'))
+        self.assertIsNot(docx.skeleton_for(snapshot, 'en'), docx.skeleton_for(snapshot, 'ckb'))
+
+    def test_escapes_content(self):
+        xml = docx.paragraph('A & B <C>\x01\nD')
+        self.assertIn('A &amp; B &lt;C&gt;</w:t><w:br/><w:t xml:space="preserve">D</w:t>', xml)
+        self.assertIn('>EF</w:t>', docx.paragraph('E\ufffeF\uffff'))
+
+    def test_byte_order_mark_is_not_arabic(self):
+        self.assertTrue(docx.is_rtl('\ufefe'))
+        self.assertFalse(docx.is_rtl('\ufeffHana'))
+
+
+class ResumeSnapshotTests(TestCase):
+    def setUp(self):
+        self.user, self.resume = create_resume()
+        Education.objects.create(
+            resume=self.resume, degree_level='bachelor', degree_title='BSc Geology', order=-1,
+            institution_name='University of Koya', start_date=datetime.date(2016, 9, 1),
+            end_date=datetime.date(2020, 6, 1),
+        )
+        Skill.objects.create(resume=self.resume, category='language', name='English', proficiency='advanced')
+        other = Resume.objects.create(user=self.user, title='Jobs', full_name='Hana Aziz', email='hana@example.com')
+        Award.objects.create(
+            resume=other, award_type='academic', title='Best thesis', issuing_organization='University of Koya',
+            date_received=datetime.date(2020, 7, 1),
+        )
+
+    def test_fixed_query_count(self):
+        # Resumes with their templates, then one query per entry set
+        with self.assertNumQueries(6):
+            snapshots = Resume.objects.filter(user=self.user).order_by('pk').snapshots()
+        first, second = snapshots
+        self.assertEqual([entry.degree_title for entry in first.education], ['BSc Geology', 'MSc Hydrology'])
+        self.assertEqual(first.template.sections_order, ('education', 'summary'))
+        self.assertEqual([award.title for award in second.awards], ['Best thesis'])
+        self.assertIsNone(second.template)
+
+    def test_immutable_and_serializable(self):
+        snapshot = Resume.objects.with_content().get(pk=self.resume.pk).snapshot()
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            snapshot.title = 'Changed'
+        self.assertEqual(pickle.loads(pickle.dumps(snapshot)), snapshot)
+        data = json.loads(json.dumps(snapshot.as_dict()))
+        self.assertEqual(data['education'][1]['start_date'], '2020-09-01')
+
+    def test_list_counts(self):
+        resume = Resume.objects.with_counts().get(pk=self.resume.pk)
+        self.assertEqual((resume.education_count, resume.skills_count, resume.awards_count), (2, 1, 0))
@@ -3,9 +3,12 @@ from django.views.generic import ListView, DetailView, CreateView, UpdateView, D
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib import messages
 from django.urls import reverse_lazy
-from django.utils.translation import gettext_lazy as _
-from django.http import JsonResponse, HttpResponse
+from django.utils.text import slugify
+from django.utils.translation import get_language, gettext_lazy as _
+from django.http import FileResponse, JsonResponse, HttpResponse, StreamingHttpResponse
+from django.utils.http import content_disposition_header
 
+from . import docx, pdf
 from .models import Resume, CVTemplate, Education, Experience, Skill, Publication, Award
 
 
@@ -15,7 +18,12 @@ class ResumeListView(LoginRequiredMixin, ListView):
     context_object_name = 'resumes'
     
     def get_queryset(self):
-        return Resume.objects.filter(user=self.request.user).order_by('-updated_at')
+        return (
+            Resume.objects.filter(user=self.request.user)
+            .select_related('template')
+            .with_counts()
+            .order_by('-updated_at')
+        )
 
 
 class ResumeDetailView(LoginRequiredMixin, DetailView):
@@ -24,7 +32,7 @@ class ResumeDetailView(LoginRequiredMixin, DetailView):
     context_object_name = 'resume'
     
     def get_queryset(self):
-        return Resume.objects.filter(user=self.request.user)
+        return Resume.objects.filter(user=self.request.user).with_content()
 
 
 class ResumeCreateView(LoginRequiredMixin, CreateView):
@@ -82,7 +90,7 @@ class ResumeBuilderView(LoginRequiredMixin, TemplateView):
         resume_id = self.request.GET.get('resume')
         if resume_id:
             try:
-                resume = Resume.objects.get(id=resume_id, user=self.request.user)
+                resume = Resume.objects.with_content().get(id=resume_id, user=self.request.user)
                 context['resume'] = resume
             except Resume.DoesNotExist:
                 pass
@@ -101,18 +109,38 @@ class TemplateListView(ListView):
 
 
 class ResumeDownloadPDFView(LoginRequiredMixin, View):
+    """
+    Serve the stored PDF when it matches the resume's content, otherwise queue a render
+    """
     def get(self, request, pk):
-        resume = get_object_or_404(Resume, pk=pk, user=request.user)
+        resume = get_object_or_404(Resume.objects.with_content(), pk=pk, user=request.user)
+        language = get_language()
+        digest = pdf.content_hash(resume.snapshot(), language)
+        
+        if not pdf.is_current(resume, digest):
+            pdf.queue(resume, digest, language)
+            # Eager and fast local workers may already have stored it
+            resume.refresh_from_db(fields=['pdf_file'])
+        ready = pdf.is_current(resume, digest)
+        
+        if request.GET.get('format') == 'json':
+            return JsonResponse({'status': 'ready' if ready else 'pending'})
+        if ready:
+            filename = f"{slugify(resume.title, allow_unicode=True) or 'resume'}.pdf"
+            return FileResponse(resume.pdf_file.open('rb'), as_attachment=True, filename=filename)
         
-        # TODO: Implement PDF generation
-        messages.info(request, _('PDF generation feature coming soon!'))
+        messages.info(request, _('Your PDF is being prepared. Try the download again in a moment.'))
         return redirect('resume_builder:detail', pk=pk)
 
 
 class ResumeDownloadDocView(LoginRequiredMixin, View):
+    """
+    Stream the resume as a Word document, written while it is sent
+    """
     def get(self, request, pk):
-        resume = get_object_or_404(Resume, pk=pk, user=request.user)
+        resume = get_object_or_404(Resume.objects.with_content(), pk=pk, user=request.user)
         
-        # TODO: Implement DOC generation
-        messages.info(request, _('DOC generation feature coming soon!'))
-        return redirect('resume_builder:detail', pk=pk)
\ No newline at end of file
+        response = StreamingHttpResponse(docx.stream(resume.snapshot(), get_language()), content_type=docx.CONTENT_TYPE)
+        filename = f"{slugify(resume.title, allow_unicode=True) or 'resume'}.docx"
+        response['Content-Disposition'] = content_disposition_header(True, filename)
+        return response
\ No newline at end of file